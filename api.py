@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Read-only JSON API over the published debates
+Queries are answered from an in-memory index of the manifest (see manifest.py),
+rebuilt only when the manifest changes, so listing and filtering never touch
+the debate files; only turn slices read a debate's JSON
+"""
+
+import base64
+import binascii
+import json
+import math
+import os
+import threading
+import urllib.parse
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from gallery import entry_model
+from manifest import MANIFEST_FILE, Manifest
+
+API_PREFIX = "/api/"
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+MAX_TURNS = 200
+# Parsed debates kept for turn queries
+DEBATE_CACHE_SIZE = 32
+
+
+class ApiError(Exception):
+    """A request the API cannot answer; carries the HTTP status to send"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def debate_id(entry: Dict[str, Any]) -> str:
+    """The id of a debate in the API: its page name without .html"""
+    return Path(entry["file"]).stem
+
+
+def debate_time(entry: Dict[str, Any]) -> float:
+    """When a debate took place, falling back to when it was published"""
+    return entry.get("start_time") or entry.get("published") or 0
+
+
+def parse_time(value: str, end: bool = False) -> float:
+    """Parse a unix timestamp or YYYY-MM-DD date (UTC); with end, return the first instant after it"""
+    try:
+        timestamp = float(value)
+    except ValueError:
+        try:
+            day = datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        except ValueError:
+            raise ApiError(400, f"Invalid date: {value!r} (use YYYY-MM-DD or a unix timestamp)")
+        return (day + timedelta(days=1) if end else day).timestamp()
+    return math.nextafter(timestamp, math.inf) if end else timestamp
+
+
+def encode_cursor(key: Tuple[float, str]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str]:
+    try:
+        time, file = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return float(time), str(file)
+    except (binascii.Error, ValueError, TypeError):
+        raise ApiError(400, "Invalid cursor")
+
+
+def summarize(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """The public fields of a manifest entry"""
+    return {
+        "id": debate_id(entry),
+        "title": entry.get("title"),
+        "model": entry.get("model"),
+        "turns": entry.get("turns"),
+        "start_time": entry.get("start_time"),
+        "end_time": entry.get("end_time"),
+        "published": entry.get("published"),
+        "html": entry.get("file"),
+        "json": entry.get("json"),
+    }
+
+
+class _Listing:
+    """Entries sorted oldest first by (debate_time, file), with parallel key arrays for bisection"""
+
+    def __init__(self, entries: List[Dict[str, Any]]):
+        self.entries = sorted(entries, key=lambda e: (debate_time(e), e["file"]))
+        self.keys = [(debate_time(e), e["file"]) for e in self.entries]
+        self.times = [key[0] for key in self.keys]
+        self.titles = [(e.get("title") or "").lower() for e in self.entries]
+
+
+class DebateIndex:
+    """Query index over published_dir/manifest.jsonl.
+
+    Listing queries cost O(log n + page size): entries are kept sorted by
+    date, both overall and per model, so date bounds and cursors are binary
+    searches. Topic search scans titles within those bounds.
+    """
+
+    def __init__(self, published_dir):
+        self.published_dir = Path(published_dir)
+        self.manifest_path = self.published_dir / MANIFEST_FILE
+        self._validator = None
+        self._all = _Listing([])
+        self._by_model: Dict[str, _Listing] = {}
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._debates: "OrderedDict[Tuple[str, Tuple[int, int]], List[Any]]" = OrderedDict()
+
+    def refresh(self) -> None:
+        """Rebuild the index if the manifest has changed since it was last read"""
+        try:
+            stat = os.stat(self.manifest_path)
+            validator = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            validator = None
+        if validator == self._validator:
+            return
+        with self._lock:
+            if validator == self._validator:
+                return
+            entries = list(Manifest.load(self.manifest_path).entries.values())
+            by_model: Dict[str, List[Dict[str, Any]]] = {}
+            for entry in entries:
+                by_model.setdefault(entry_model(entry).lower(), []).append(entry)
+            # Swap in complete structures so concurrent readers never see a partial index
+            self._all = _Listing(entries)
+            self._by_model = {model: _Listing(group) for model, group in by_model.items()}
+            self._by_id = {debate_id(entry): entry for entry in entries}
+            self._validator = validator
+
+    def query(self, model: Optional[str] = None, since: Optional[float] = None, until: Optional[float] = None,
+              q: Optional[str] = None, limit: int = DEFAULT_LIMIT, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """Debates newest first, filtered by model, [since, until) and a title substring"""
+        self.refresh()
+        listing = self._all if model is None else self._by_model.get(model.lower())
+        if listing is None:
+            return {"debates": [], "next_cursor": None}
+
+        lo = bisect_left(listing.times, since) if since is not None else 0
+        hi = bisect_left(listing.times, until) if until is not None else len(listing.entries)
+        if cursor:
+            hi = min(hi, bisect_left(listing.keys, decode_cursor(cursor)))
+        needle = q.lower() if q else None
+
+        debates = []
+        i = hi - 1
+        while i >= lo and len(debates) < limit:
+            if needle is None or needle in listing.titles[i]:
+                debates.append(listing.entries[i])
+            i -= 1
+        more = len(debates) == limit and i >= lo
+        return {
+            "debates": [summarize(entry) for entry in debates],
+            "next_cursor": encode_cursor(listing.keys[i + 1]) if more else None,
+        }
+
+    def get(self, id: str) -> Dict[str, Any]:
+        """Metadata for one debate"""
+        self.refresh()
+        entry = self._by_id.get(id)
+        if entry is None:
+            raise ApiError(404, f"No debate {id!r}")
+        return summarize(entry)
+
+    def turns(self, id: str, start: int = 0, end: Optional[int] = None) -> Dict[str, Any]:
+        """Messages start..end (0-based, end exclusive) of one debate"""
+        self.refresh()
+        entry = self._by_id.get(id)
+        if entry is None:
+            raise ApiError(404, f"No debate {id!r}")
+        conversation = self._conversation(self.published_dir / entry["json"])
+        end = len(conversation) if end is None else end
+        if start < 0 or end < start:
+            raise ApiError(400, "Invalid turn range")
+        end = min(end, start + MAX_TURNS)
+        return {
+            "id": id,
+            "total_turns": len(conversation),
+            "start": start,
+            "end": min(end, len(conversation)),
+            "turns": conversation[start:end],
+        }
+
+    def _conversation(self, json_path: Path) -> List[Any]:
+        try:
+            stat = os.stat(json_path)
+        except FileNotFoundError:
+            raise ApiError(404, "Debate JSON is not published")
+        key = (str(json_path), (stat.st_mtime_ns, stat.st_size))
+        with self._lock:
+            if key in self._debates:
+                self._debates.move_to_end(key)
+                return self._debates[key]
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                conversation = json.load(f).get("conversation", [])
+        except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+            raise ApiError(500, "Debate JSON could not be parsed")
+        with self._lock:
+            self._debates[key] = conversation
+            while len(self._debates) > DEBATE_CACHE_SIZE:
+                self._debates.popitem(last=False)
+        return conversation
+
+
+def _int_param(params: Dict[str, List[str]], name: str, default: Optional[int]) -> Optional[int]:
+    values = params.get(name)
+    if not values:
+        return default
+    try:
+        return int(values[-1])
+    except ValueError:
+        raise ApiError(400, f"{name} must be an integer")
+
+
+def handle_request(index: DebateIndex, url: str) -> Tuple[int, Dict[str, Any]]:
+    """Answer a GET for an /api/ URL; returns (status, JSON payload)"""
+    parts = urllib.parse.urlsplit(url)
+    params = urllib.parse.parse_qs(parts.query)
+    segments = [urllib.parse.unquote(s) for s in parts.path[len(API_PREFIX):].strip("/").split("/")]
+
+    def param(name):
+        values = params.get(name)
+        return values[-1] if values else None
+
+    try:
+        if segments == ["debates"]:
+            since, until = param("since"), param("until")
+            limit = _int_param(params, "limit", DEFAULT_LIMIT)
+            if not 1 <= limit <= MAX_LIMIT:
+                raise ApiError(400, f"limit must be between 1 and {MAX_LIMIT}")
+            return 200, index.query(
+                model=param("model"),
+                since=parse_time(since) if since else None,
+                until=parse_time(until, end=True) if until else None,
+                q=param("q"),
+                limit=limit,
+                cursor=param("cursor"),
+            )
+        if len(segments) == 2 and segments[0] == "debates":
+            return 200, index.get(segments[1])
+        if len(segments) == 3 and segments[0] == "debates" and segments[2] == "turns":
+            return 200, index.turns(segments[1], _int_param(params, "start", 0), _int_param(params, "end", None))
+        raise ApiError(404, "Unknown API endpoint")
+    except ApiError as e:
+        return e.status, {"error": str(e)}
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Site asset pipeline for published debates
+Builds a single content-hashed, minified stylesheet shared by every page,
+and optionally minifies the HTML that references it
+"""
+
+import gzip
+import hashlib
+import os
+import re
+from pathlib import Path
+from typing import Iterable, Tuple
+
+from fsutil import atomic_write_bytes, atomic_write_text
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ASSETS_DIR = "assets"
+
+# Content codings in order of preference, with the suffix of their precompressed sibling files
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+COMPRESSIBLE_SUFFIXES = (".html", ".css", ".js", ".json", ".svg", ".txt")
+MIN_COMPRESS_SIZE = 256
+
+# Elements whose whitespace is significant and must survive HTML minification
+_PRESERVE_PATTERN = re.compile(r'(<(pre|textarea|script|style)\b.*?</\2\s*>)', re.DOTALL | re.IGNORECASE)
+
+
+# Strings are kept verbatim and comments dropped; both may contain anything
+_CSS_STRINGS_AND_COMMENTS = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|/\*.*?\*/)', re.DOTALL)
+# At-rules whose blocks hold rules rather than declarations
+_NESTING_AT_RULES = ("@media", "@supports", "@container", "@layer", "@document")
+
+
+def minify_css(css: str) -> str:
+    """Strip comments and redundant whitespace from a stylesheet
+
+    Whitespace before a ':' is only dropped inside declaration blocks: in a
+    selector, `.a :hover` (a descendant) and `.a:hover` differ.
+    """
+    out = []
+    blocks = []  # one per open brace: True if it holds declarations
+    prelude = ""  # the selector or at-rule before the next brace
+    skip_space = True
+    for i, part in enumerate(_CSS_STRINGS_AND_COMMENTS.split(css)):
+        if i % 2:
+            if not part.startswith("/*"):
+                out.append(part)
+                prelude += part
+                skip_space = False
+            continue
+        for char in re.sub(r'\s+', ' ', part):
+            if char == ' ':
+                if not skip_space and out and out[-1] != ' ':
+                    out.append(' ')
+                continue
+            in_declarations = bool(blocks) and blocks[-1]
+            if char in '{};,>' or (char == ':' and in_declarations):
+                if out and out[-1] == ' ':
+                    out.pop()
+                if char == '}' and out and out[-1] == ';':
+                    out.pop()
+                skip_space = True
+            else:
+                skip_space = char == ':'
+            out.append(char)
+
+            if char == '{':
+                blocks.append(not prelude.strip().lower().startswith(_NESTING_AT_RULES))
+            elif char == '}' and blocks:
+                blocks.pop()
+            if char in '{};':
+                prelude = ""
+            else:
+                prelude += char
+    return ''.join(out).strip()
+
+
+def _collapse_whitespace(html: str) -> str:
+    return re.sub(r'\s+', lambda m: '\n' if '\n' in m.group(0) else ' ', html)
+
+
+def minify_html(html: str) -> str:
+    """Collapse whitespace runs outside of <pre>, <textarea>, <script> and <style>.
+
+    Runs are collapsed rather than removed, so inline spacing renders exactly
+    as before.
+    """
+    parts = _PRESERVE_PATTERN.split(html)
+    minified = []
+    # re.split yields [text, preserved, tag name, text, preserved, tag name, ...]
+    for i in range(0, len(parts), 3):
+        minified.append(_collapse_whitespace(parts[i]))
+        if i + 1 < len(parts):
+            minified.append(parts[i + 1])
+    return ''.join(minified).strip()
+
+
+def build_stylesheet(output_dir, sources: Iterable[str], name: str = "site") -> str:
+    """Write the minified, content-hashed bundle of sources into output_dir/assets.
+
+    Returns the href of the bundle relative to output_dir. The file name changes
+    whenever the content does, so it can be served with immutable caching.
+    """
+    css = minify_css("\n".join(sources))
+    digest = hashlib.sha256(css.encode('utf-8')).hexdigest()[:12]
+    filename = f"{name}.{digest}.css"
+
+    assets_dir = Path(output_dir) / ASSETS_DIR
+    target = assets_dir / filename
+    if not target.exists():
+        assets_dir.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(target, css)
+
+    return f"{ASSETS_DIR}/{filename}"
+
+
+def stylesheet_link(href: str) -> str:
+    """Return the <link> tag referencing a bundled stylesheet"""
+    return f'<link rel="stylesheet" href="{href}">'
+
+
+def externalize_stylesheet(html: str, inline_css: str, href: str) -> Tuple[str, bool]:
+    """Replace an inline <style> block whose CSS matches inline_css with a link to href.
+
+    Pages carrying a different inline stylesheet (e.g. rendered by an older
+    template) are returned unchanged, since the bundle would not match them.
+    """
+    expected = minify_css(inline_css)
+    for match in re.finditer(r'<style[^>]*>(.*?)</style>', html, flags=re.DOTALL | re.IGNORECASE):
+        if minify_css(match.group(1)) == expected:
+            return html[:match.start()] + stylesheet_link(href) + html[match.end():], True
+    return html, False
+
+
+def format_bytes(size: int) -> str:
+    """Format a byte count for reports"""
+    if size < 1024:
+        return f"{size} B"
+    return f"{size / 1024:.1f} KB"
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    """Content codings compress() can produce; br needs the optional brotli module"""
+    return tuple(encoding for encoding, _ in ENCODINGS if encoding != "br" or brotli is not None)
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compress data with a content coding from supported_encodings()"""
+    if encoding == "gzip":
+        # mtime=0 keeps the output identical for identical input
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(data)
+    raise ValueError(f"Unsupported content coding: {encoding}")
+
+
+def sibling_is_fresh(sibling_stat: os.stat_result, source_stat: os.stat_result) -> bool:
+    """Whether a precompressed sibling still matches its source
+
+    Siblings are stamped with their source's exact mtime. Any other mtime,
+    older or newer, means the source was replaced since; copies that
+    preserve mtime can put an older file in place.
+    """
+    return sibling_stat.st_mtime_ns == source_stat.st_mtime_ns
+
+
+def precompress_tree(directory) -> int:
+    """Write .gz (and .br, with brotli) siblings for text files under directory.
+
+    Siblings carry their source's mtime, so a sibling whose mtime differs from
+    its source's is stale; only missing or stale siblings are rewritten.
+    Returns the number written.
+    """
+    written = 0
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if not name.endswith(COMPRESSIBLE_SUFFIXES) or name.startswith("."):
+                continue
+            source = os.path.join(root, name)
+            source_stat = os.stat(source)
+            if source_stat.st_size < MIN_COMPRESS_SIZE:
+                continue
+            data = None
+            for encoding in supported_encodings():
+                target = source + dict(ENCODINGS)[encoding]
+                try:
+                    if sibling_is_fresh(os.stat(target), source_stat):
+                        continue
+                except FileNotFoundError:
+                    pass
+                if data is None:
+                    with open(source, "rb") as f:
+                        data = f.read()
+                atomic_write_bytes(target, compress(data, encoding), copystat_from=source)
+                written += 1
+    return written
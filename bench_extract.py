@@ -0,0 +1,101 @@
+#!/usr/bin/env uv run
+"""
+Extraction benchmark for fetched pages
+Compares extract.extract_main_text with the regex tag stripping fetch_url used
+before, on synthetic pages whose article text is known: extraction time, how
+much of the article survives the character budget, and how much of what the
+debaters read is article rather than boilerplate
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from extract import MAX_CHARS, extract_main_text, strip_tags
+from synthetic import make_page
+
+METHODS: Dict[str, Callable[[str, int], str]] = {
+    "regex": strip_tags,
+    "extract": extract_main_text,
+}
+
+# Rough English average, as used for budgeting prompts
+CHARS_PER_TOKEN = 4
+
+
+def score(output: str, sentences: List[str]) -> Dict[str, float]:
+    """Share of the article kept (recall) and of the output that is article (precision)"""
+    found = [sentence for sentence in sentences if sentence in output]
+    useful = sum(len(sentence) for sentence in found)
+    tokens = max(1, len(output) / CHARS_PER_TOKEN)
+    return {
+        "recall": len(found) / len(sentences) if sentences else 0.0,
+        "precision": useful / len(output) if output else 0.0,
+        "useful_chars_per_token": useful / tokens,
+        "tokens": tokens,
+    }
+
+
+def run_benchmark(pages: List[Tuple[str, List[str]]], max_chars: int = MAX_CHARS, repeat: int = 3) -> Dict[str, Dict]:
+    """Time and score every method on pages of (html, article sentences); timings are the fastest run"""
+    results = {}
+    for name, method in METHODS.items():
+        elapsed = min(_time(method, pages, max_chars) for _ in range(repeat))
+        scores = [score(method(html, max_chars), sentences) for html, sentences in pages]
+        results[name] = {
+            "ms_per_page": elapsed / len(pages) * 1000,
+            **{key: sum(s[key] for s in scores) / len(scores) for key in scores[0]},
+        }
+    return results
+
+
+def _time(method: Callable[[str, int], str], pages: List[Tuple[str, List[str]]], max_chars: int) -> float:
+    start = time.perf_counter()
+    for html, _ in pages:
+        method(html, max_chars)
+    return time.perf_counter() - start
+
+
+def print_results(results: Dict[str, Dict], pages: int) -> None:
+    print(f"📰 {pages} synthetic pages")
+    print(f"   {'method':<8} {'ms/page':>8} {'tokens':>7} {'recall':>7} {'precision':>10} {'useful chars/token':>19}")
+    for name, result in results.items():
+        print(f"   {name:<8} {result['ms_per_page']:8.2f} {result['tokens']:7.0f} {result['recall']:7.0%} "
+              f"{result['precision']:10.0%} {result['useful_chars_per_token']:19.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark main-content extraction against regex tag stripping")
+    parser.add_argument("--pages", type=int, default=50, help="Synthetic pages (default: 50)")
+    parser.add_argument("--paragraphs", type=int, default=8, help="Article paragraphs per page (default: 8)")
+    parser.add_argument("--links", type=int, default=30, help="Navigation links per page (default: 30)")
+    parser.add_argument("--max-chars", type=int, default=MAX_CHARS, help=f"Character budget per page (default: {MAX_CHARS})")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs; the fastest is reported (default: 3)")
+    parser.add_argument("--html", nargs="+", metavar="FILE",
+                        help="Also time saved real pages (no article text is known, so only speed and size are shown)")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    pages = [make_page(seed, args.paragraphs, args.links) for seed in range(args.pages)]
+    results = run_benchmark(pages, args.max_chars, args.repeat)
+    print_results(results, len(pages))
+
+    if args.html:
+        real = [(Path(path).read_text(encoding="utf-8", errors="replace"), []) for path in args.html]
+        print(f"🌐 {len(real)} saved page(s)")
+        for name, method in METHODS.items():
+            elapsed = min(_time(method, real, args.max_chars) for _ in range(args.repeat))
+            chars = sum(len(method(html, args.max_chars)) for html, _ in real) / len(real)
+            print(f"   {name:<8} {elapsed / len(real) * 1000:8.2f} ms/page, {chars / CHARS_PER_TOKEN:6.0f} tokens/page")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env uv run
+"""
+Rendering benchmark for json_to_html.py
+Times DebateHTMLGenerator.generate_html and process_message_content on
+synthetic debates, measures peak memory, and can fail when render time per KB
+of content regresses against a saved baseline
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict
+from typing import Any, Dict, List
+
+from json_to_html import DebateHTMLGenerator
+from synthetic import DebateShape, make_debate
+
+# Metrics compared in regression mode; lower is better
+REGRESSION_METRICS = ("generate_us_per_kb", "process_us_per_kb")
+
+
+def content_kb(debates: List[Dict[str, Any]]) -> float:
+    return sum(len(msg["content"].encode("utf-8")) for debate in debates for msg in debate["conversation"]) / 1024
+
+
+def time_generate(debates: List[Dict[str, Any]]) -> float:
+    # Fresh generator without a fragment cache, so every message is rendered
+    generator = DebateHTMLGenerator()
+    start = time.perf_counter()
+    for debate in debates:
+        generator.generate_html(debate)
+    return time.perf_counter() - start
+
+
+def time_process(debates: List[Dict[str, Any]]) -> float:
+    generator = DebateHTMLGenerator()
+    messages = [msg["content"] for debate in debates for msg in debate["conversation"]]
+    start = time.perf_counter()
+    for content in messages:
+        generator.process_message_content(content)
+    return time.perf_counter() - start
+
+
+def peak_memory_kb(debate: Dict[str, Any]) -> float:
+    """Peak Python heap allocated while rendering one debate"""
+    generator = DebateHTMLGenerator()
+    tracemalloc.start()
+    try:
+        generator.generate_html(debate)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def run_benchmark(shape: DebateShape, debates: int = 20, repeat: int = 5, seed: int = 0) -> Dict[str, Any]:
+    """Render debates synthetic debates repeat times; timings are the fastest run, the least noisy estimate"""
+    corpus = [make_debate(seed + n, shape) for n in range(debates)]
+    kb = content_kb(corpus)
+
+    # Warm up imports, regex caches and the markdown engine
+    time_generate(corpus)
+    generate = min(time_generate(corpus) for _ in range(repeat))
+    process = min(time_process(corpus) for _ in range(repeat))
+
+    return {
+        "shape": asdict(shape),
+        "debates": debates,
+        "content_kb": kb,
+        "generate_ms_per_debate": generate / debates * 1000,
+        "generate_us_per_kb": generate / kb * 1e6,
+        "process_us_per_kb": process / kb * 1e6,
+        "debates_per_second": debates / generate,
+        "peak_memory_kb": max(peak_memory_kb(debate) for debate in corpus[:3]),
+    }
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Return a message for each metric that is more than tolerance slower than baseline"""
+    regressions = []
+    for metric in REGRESSION_METRICS:
+        before, after = baseline[metric], result[metric]
+        if after > before * (1 + tolerance):
+            regressions.append(f"{metric}: {after:.1f} vs baseline {before:.1f} (+{after / before - 1:.0%})")
+    return regressions
+
+
+def print_result(result: Dict[str, Any]) -> None:
+    print(f"📏 {result['debates']} debates, {result['content_kb']:.0f} KB of message content")
+    print(f"   generate_html:           {result['generate_ms_per_debate']:.2f} ms/debate, "
+          f"{result['generate_us_per_kb']:.1f} µs/KB ({result['debates_per_second']:.0f} debates/s)")
+    print(f"   process_message_content: {result['process_us_per_kb']:.1f} µs/KB")
+    print(f"   Peak memory per debate:  {result['peak_memory_kb']:.0f} KB")
+
+
+def main():
+    defaults = DebateShape()
+    parser = argparse.ArgumentParser(description="Benchmark debate rendering on synthetic debates")
+    parser.add_argument("--debates", type=int, default=20, help="Debates per run (default: 20)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs; the fastest is reported (default: 5)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic debates")
+    parser.add_argument("--turns", type=int, default=defaults.turns, help="Turns per debate")
+    parser.add_argument("--message-words", type=int, default=defaults.message_words, help="Words of prose per message")
+    parser.add_argument("--markdown-density", type=float, default=defaults.markdown_density,
+                        help="Share of paragraphs using markdown formatting (0-1)")
+    parser.add_argument("--code-density", type=float, default=defaults.code_density,
+                        help="Chance a message contains a code block (0-1)")
+    parser.add_argument("--searches", type=int, default=defaults.searches, help="Search result blocks per message")
+    parser.add_argument("--fetches", type=int, default=defaults.fetches, help="Fetched-content blocks per message")
+    parser.add_argument("--fetch-words", type=int, default=defaults.fetch_words, help="Words per fetched-content block")
+    parser.add_argument("--save-baseline", metavar="FILE", help="Write the result to FILE for later comparison")
+    parser.add_argument("--baseline", metavar="FILE", help="Fail if slower than the baseline in FILE")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="Allowed slowdown against the baseline (default: 0.15 = 15%%)")
+    args = parser.parse_args()
+
+    shape = DebateShape(
+        turns=args.turns, message_words=args.message_words, markdown_density=args.markdown_density,
+        code_density=args.code_density, searches=args.searches, fetches=args.fetches, fetch_words=args.fetch_words,
+    )
+    result = run_benchmark(shape, debates=args.debates, repeat=args.repeat, seed=args.seed)
+    print_result(result)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"💾 Baseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("shape") != result["shape"]:
+            print("⚠️  Baseline was recorded with a different debate shape; comparison may be meaningless")
+        regressions = compare(result, baseline, args.tolerance)
+        if regressions:
+            print(f"❌ Rendering regressed beyond {args.tolerance:.0%}:")
+            for message in regressions:
+                print(f"   {message}")
+            return 1
+        print(f"✅ Within {args.tolerance:.0%} of baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+#!/usr/bin/env uv run
+"""
+Load test for serve.py
+Publishes a synthetic gallery, starts the server in a subprocess and drives it
+with keep-alive clients, then reports throughput, latency, errors and the
+server's memory use
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+DEFAULT_MIX = "index=2,page=5,json=1,api=2"
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """Parse a request mix like "index=2,page=5,json=1,api=2" into weights"""
+    mix = {}
+    for item in spec.split(","):
+        kind, _, weight = item.partition("=")
+        kind = kind.strip()
+        if kind not in ("index", "page", "json", "api"):
+            raise argparse.ArgumentTypeError(f"unknown request kind {kind!r}")
+        mix[kind] = float(weight or 1)
+    return mix
+
+
+def build_gallery(root: Path, debates: int, turns: int) -> Path:
+    """Render and publish debates synthetic debates under root; returns the published directory"""
+    from json_to_html import render_many
+    from publish import publish_many
+    from synthetic import DebateShape, write_corpus
+
+    conversations = root / "conversations"
+    published = root / "published"
+    json_files = write_corpus(conversations, debates, DebateShape(turns=turns))
+    render_many([str(p) for p in json_files], str(conversations), jobs=os.cpu_count() or 1,
+                cache_dir=str(root / ".render_cache"))
+    publish_many(sorted(conversations.glob("*.html")), published, verbose=False)
+    return published
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(published: Path, port: int, server_args: List[str]) -> subprocess.Popen:
+    serve = Path(__file__).resolve().parent / "serve.py"
+    process = subprocess.Popen(
+        [sys.executable, str(serve), "--directory", str(published), "--bind", "127.0.0.1",
+         "--port", str(port), "--no-browser", "--quiet", *server_args],
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"serve.py exited with status {process.returncode}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return process
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("serve.py did not start listening")
+
+
+def read_rss(pid: int) -> Dict[str, int]:
+    """Current and peak resident set size of pid in KB (Linux /proc only; empty elsewhere)"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+    except OSError:
+        return {}
+    return {key: int(fields[name].split()[0]) for key, name in (("rss_kb", "VmRSS"), ("peak_rss_kb", "VmHWM"))
+            if name in fields}
+
+
+def request_paths(published: Path) -> Dict[str, List[str]]:
+    pages = sorted(p.name for p in published.glob("*.html") if p.name.startswith("synthetic_"))
+    return {
+        "index": ["/", "/page-1.html"],
+        "page": [f"/{name}" for name in pages],
+        "json": [f"/{name[:-len('.html')]}.json" for name in pages],
+        "api": ["/api/debates?limit=20", "/api/debates?model=opus&limit=20", "/api/debates?q=nuclear"],
+    }
+
+
+def client(port: int, paths: Dict[str, List[str]], mix: Dict[str, float], deadline: float,
+           seed: int, results: List) -> None:
+    """Issue requests over one keep-alive connection until deadline, recording (latency, ok, bytes)"""
+    rng = random.Random(seed)
+    kinds = list(mix)
+    weights = [mix[kind] for kind in kinds]
+    headers = {"Accept-Encoding": "gzip"}
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    local = []
+    while time.monotonic() < deadline:
+        path = rng.choice(paths[rng.choices(kinds, weights)[0]])
+        start = time.perf_counter()
+        try:
+            conn.request("GET", path, headers=headers)
+            response = conn.getresponse()
+            body = response.read()
+            ok = response.status < 400
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+            body, ok = b"", False
+        local.append((time.perf_counter() - start, ok, len(body)))
+    conn.close()
+    results.extend(local)
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def run_load(port: int, paths: Dict[str, List[str]], mix: Dict[str, float], concurrency: int,
+             duration: float, seed: int = 0) -> Dict:
+    """Drive the server with concurrency clients for duration seconds and summarize the results"""
+    results: List = []
+    deadline = time.monotonic() + duration
+    threads = [
+        threading.Thread(target=client, args=(port, paths, mix, deadline, seed + i, results))
+        for i in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for latency, _, _ in results)
+    errors = sum(1 for _, ok, _ in results if not ok)
+    return {
+        "requests": len(results),
+        "rps": len(results) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": (latencies[-1] if latencies else 0.0) * 1000,
+        "error_rate": errors / len(results) if results else 0.0,
+        "mb_received": sum(size for _, _, size in results) / (1024 * 1024),
+    }
+
+
+def print_report(report: Dict) -> None:
+    print(f"📊 {report['requests']} requests in {report['duration']:g}s with {report['concurrency']} clients")
+    print(f"   Throughput: {report['rps']:.0f} req/s, {report['mb_received']:.1f} MB received")
+    print(f"   Latency:    p50 {report['p50_ms']:.2f} ms, p99 {report['p99_ms']:.2f} ms, max {report['max_ms']:.2f} ms")
+    print(f"   Errors:     {report['error_rate']:.2%}")
+    if "rss_kb" in report:
+        print(f"   Server RSS: {report['rss_kb'] / 1024:.1f} MB (peak {report['peak_rss_kb'] / 1024:.1f} MB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load-test serve.py against a synthetic gallery",
+        epilog="Arguments after -- are passed to serve.py, e.g. -- --workers 64 --cache-mb 0",
+    )
+    parser.add_argument("--debates", type=int, default=200, help="Synthetic debates to publish (default: 200)")
+    parser.add_argument("--turns", type=int, default=10, help="Turns per debate (default: 10)")
+    parser.add_argument("-c", "--concurrency", type=int, default=16, help="Concurrent clients (default: 16)")
+    parser.add_argument("-d", "--duration", type=float, default=10.0, help="Seconds of load (default: 10)")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Seconds of untimed load first (default: 1)")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"Request weights by kind: index, page, json, api (default: {DEFAULT_MIX})")
+    parser.add_argument("--gallery", help="Reuse (or create) the synthetic gallery in this directory")
+    parser.add_argument("--json", help="Also write the report to this JSON file")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the request sequence")
+    parser.add_argument("server_args", nargs=argparse.REMAINDER, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    server_args = [a for a in args.server_args if a != "--"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(args.gallery or tmp)
+        published = root / "published"
+        if not (published / "index.html").exists():
+            print(f"🏗️  Publishing {args.debates} synthetic debates to {published}/...")
+            build_gallery(root, args.debates, args.turns)
+
+        port = free_port()
+        process = start_server(published, port, server_args)
+        try:
+            paths = request_paths(published)
+            if args.warmup > 0:
+                run_load(port, paths, args.mix, args.concurrency, args.warmup, seed=args.seed + 10_000)
+            report = run_load(port, paths, args.mix, args.concurrency, args.duration, seed=args.seed)
+            report.update(read_rss(process.pid))
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+    report.update({"duration": args.duration, "concurrency": args.concurrency,
+                   "debates": args.debates, "mix": args.mix, "server_args": server_args})
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if report["error_rate"] > 0 else 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env uv run
+"""
+Cold-start benchmark for main.py
+Runs light commands (mostly --help) in fresh interpreters and reports their
+wall time over that of a bare interpreter. Fails if that overhead exceeds the
+budget or a command imports one of the heavy dependencies that should only
+load when used
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+MAIN = Path(__file__).resolve().parent / "main.py"
+
+# Commands that must start quickly; none of them needs the API or markdown
+LIGHT_COMMANDS = [
+    ["--help"],
+    ["debate", "--help"],
+    ["render", "--help"],
+    ["publish", "--help"],
+    ["stage", "--help"],
+    ["serve", "--help"],
+    ["watch", "--help"],
+]
+HEAVY_MODULES = ("anthropic", "requests", "dotenv", "markdown", "bs4")
+DEFAULT_BUDGET_MS = 100.0
+
+
+def time_command(args: List[str], repeat: int) -> float:
+    """Fastest wall time of repeat fresh runs, in ms"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def imported_modules(args: List[str]) -> Dict[str, float]:
+    """Every module a run imports, with cumulative import time in ms (from -X importtime)
+
+    Nested imports are prefixed with the indentation -X importtime uses, so the
+    outermost ones can be told apart
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=False,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or line.count("|") != 2:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            modules[name[1:].rstrip()] = int(cumulative) / 1000
+    return modules
+
+
+def run_benchmark(commands: List[List[str]], repeat: int = 5) -> Dict:
+    baseline = time_command(["-c", "pass"], repeat)
+    # site, encodings and friends load before main.py runs; leave them out of the listing
+    startup = set(imported_modules(["-c", "pass"]))
+    results = []
+    for command in commands:
+        modules = imported_modules([str(MAIN), *command])
+        outermost = [(name, ms) for name, ms in modules.items() if not name.startswith(" ") and name not in startup]
+        names = {name.strip().split(".")[0] for name in modules}
+        results.append({
+            "command": " ".join(command),
+            "ms": time_command([str(MAIN), *command], repeat),
+            "heavy": sorted(names.intersection(HEAVY_MODULES)),
+            "slowest_imports": sorted(outermost, key=lambda item: -item[1])[:3],
+        })
+    return {"interpreter_ms": baseline, "commands": results}
+
+
+def check(report: Dict, budget_ms: float) -> List[str]:
+    """Return a message for each command over budget or importing a heavy module"""
+    failures = []
+    for result in report["commands"]:
+        overhead = result["ms"] - report["interpreter_ms"]
+        if overhead > budget_ms:
+            failures.append(f"`{result['command']}` took {overhead:.0f} ms over the interpreter (budget {budget_ms:.0f} ms)")
+        if result["heavy"]:
+            failures.append(f"`{result['command']}` imported {', '.join(result['heavy'])}")
+    return failures
+
+
+def print_report(report: Dict) -> None:
+    print(f"🚀 Cold start (bare interpreter: {report['interpreter_ms']:.0f} ms)")
+    for result in report["commands"]:
+        imports = ", ".join(f"{name} {ms:.0f} ms" for name, ms in result["slowest_imports"]) or "none"
+        overhead = result["ms"] - report["interpreter_ms"]
+        print(f"   main.py {result['command']:<16} {result['ms']:6.0f} ms (+{max(overhead, 0):.0f})   slowest imports: {imports}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check main.py cold-start time against a budget")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help=f"Maximum time per light command beyond interpreter startup (default: {DEFAULT_BUDGET_MS:g})")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per command; the fastest is reported (default: 5)")
+    parser.add_argument("--json", help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    report = run_benchmark(LIGHT_COMMANDS, repeat=args.repeat)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    failures = check(report, args.budget_ms)
+    if failures:
+        print("❌ Startup budget exceeded:")
+        for message in failures:
+            print(f"   {message}")
+        return 1
+    print(f"✅ All commands within {args.budget_ms:.0f} ms of interpreter startup")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
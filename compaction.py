@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+In-turn compaction of tool results
+Within one debate turn every search result and fetched page is resent on each
+tool-use iteration. Once the turn's tool results grow past a threshold, older
+ones are replaced by short evidence summaries. Each tool_result block keeps its
+tool_use_id, so the tool_use/tool_result pairing the API checks stays intact
+"""
+
+import re
+from typing import Any, Dict, List
+
+# Roughly 10k tokens of tool results within one turn before older results are compacted
+DEFAULT_COMPACT_CHARS = 40_000
+# The newest tool results are what the model is reading right now; never compact them
+KEEP_RECENT = 1
+SUMMARY_CHARS = 500
+CHARS_PER_TOKEN = 4
+
+COMPACTED_MARKER = "[Compacted earlier result]"
+
+_SENTENCE = re.compile(r"(?<=[.!?])\s+")
+_URL = re.compile(r"https?://\S+")
+_EVIDENCE = re.compile(r"\d")
+_NUMBERING = re.compile(r"^\s*\d+\.\s+")
+# Shorter fragments are titles and labels rather than claims
+MIN_SENTENCE_CHARS = 20
+
+
+def block_chars(block: Any) -> int:
+    """Approximate size of one message content block, SDK object or dict"""
+    if isinstance(block, str):
+        return len(block)
+    if isinstance(block, dict):
+        content = block.get("content", block.get("text", ""))
+        if isinstance(content, list):
+            return sum(block_chars(item) for item in content)
+        return len(str(content)) + len(str(block.get("input", "")))
+    # anthropic content blocks: TextBlock.text, ToolUseBlock.input
+    return len(getattr(block, "text", "") or "") + len(str(getattr(block, "input", "") or ""))
+
+
+def request_chars(messages: List[Dict[str, Any]], system: str = "") -> int:
+    """Approximate size in characters of a messages.create request"""
+    total = len(system)
+    for message in messages:
+        content = message["content"]
+        total += len(content) if isinstance(content, str) else sum(block_chars(block) for block in content)
+    return total
+
+
+def _tool_results(message: Dict[str, Any]) -> List[Dict[str, Any]]:
+    if message["role"] != "user" or not isinstance(message["content"], list):
+        return []
+    return [block for block in message["content"] if isinstance(block, dict) and block.get("type") == "tool_result"]
+
+
+def tool_result_chars(messages: List[Dict[str, Any]]) -> int:
+    """Characters of tool result content in messages, which in a turn's request is what tool use added"""
+    return sum(
+        len(block["content"])
+        for message in messages for block in _tool_results(message)
+        if isinstance(block.get("content"), str)
+    )
+
+
+def summarize_tool_result(content: str, max_chars: int = SUMMARY_CHARS) -> str:
+    """Keep the header line, source URLs and the sentences that carry figures"""
+    header, _, body = content.partition("\n")
+    urls = [url for url in dict.fromkeys(_URL.findall(body)) if url not in header]
+    # Search results are numbered lines; fetched pages are prose
+    lines = (_NUMBERING.sub("", line).strip() for line in _URL.sub("", body).splitlines())
+    sentences = [s for line in lines if line for s in _SENTENCE.split(line) if len(s) >= MIN_SENTENCE_CHARS]
+    evidence = [s for s in sentences if _EVIDENCE.search(s)] or sentences[:2]
+
+    lines = [f"{COMPACTED_MARKER} {header}"]
+    if urls:
+        lines.append("Sources: " + " ".join(urls[:5]))
+    summary = "\n".join(lines)
+    for sentence in evidence:
+        sentence = re.sub(r"\s+", " ", sentence)
+        if len(summary) + len(sentence) + 3 > max_chars:
+            break
+        summary += f"\n- {sentence}"
+    return summary
+
+
+def compact_tool_results(messages: List[Dict[str, Any]], threshold: int,
+                         keep_recent: int = KEEP_RECENT) -> int:
+    """Summarize the oldest tool results until their total is under threshold; returns chars saved
+
+    The threshold applies to tool results only, not to the debate transcript
+    the request also carries, so a long debate does not compact every small
+    result. Only tool_result content changes, in place. The newest
+    keep_recent tool result messages are left alone.
+    """
+    size = tool_result_chars(messages)
+    if threshold <= 0 or size <= threshold:
+        return 0
+
+    result_messages = [message for message in messages if _tool_results(message)]
+    saved = 0
+    for message in result_messages[:max(0, len(result_messages) - keep_recent)]:
+        for block in _tool_results(message):
+            if not isinstance(block.get("content"), str):
+                continue
+            if block["content"].startswith(COMPACTED_MARKER):
+                continue
+            summary = summarize_tool_result(block["content"])
+            if len(summary) < len(block["content"]):
+                saved += len(block["content"]) - len(summary)
+                block["content"] = summary
+            if size - saved <= threshold:
+                return saved
+    return saved
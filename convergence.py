@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Convergence detection for debates
+Each turn is compared with the same participant's earlier turns: MinHash
+signatures of word shingles estimate how much of the text is recycled, and
+search queries the participant already ran count as repeated research. Once
+every participant has produced several low-novelty turns in a row, the debate
+has converged and can stop or move to closing statements
+"""
+
+import hashlib
+import random
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+SHINGLE_WORDS = 3
+NUM_HASHES = 64
+# A turn below this novelty repeats its speaker's earlier turns
+NOVELTY_THRESHOLD = 0.6
+# Low-novelty turns in a row, per participant, before the debate counts as converged
+PATIENCE = 2
+# Share of a turn's novelty that comes from its search queries, when it ran any
+QUERY_WEIGHT = 0.3
+
+_PRIME = (1 << 61) - 1
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+def shingles(text: str, size: int = SHINGLE_WORDS) -> set:
+    """The set of lowercased size-word sequences in text"""
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def normalize_query(query: str) -> str:
+    """Queries with the same words in any order count as the same query"""
+    return " ".join(sorted(set(_WORD.findall(query.lower()))))
+
+
+class MinHash:
+    """Fixed-size signatures whose agreement estimates the Jaccard similarity of two sets"""
+
+    def __init__(self, num_hashes: int = NUM_HASHES, seed: int = 1):
+        rng = random.Random(seed)
+        self.params = [(rng.randrange(1, _PRIME), rng.randrange(_PRIME)) for _ in range(num_hashes)]
+
+    def signature(self, items: Iterable[str]) -> Optional[List[int]]:
+        hashes = [int.from_bytes(hashlib.blake2b(item.encode(), digest_size=8).digest(), "big") for item in items]
+        if not hashes:
+            return None
+        return [min((a * h + b) % _PRIME for h in hashes) for a, b in self.params]
+
+    @staticmethod
+    def similarity(first: Optional[List[int]], second: Optional[List[int]]) -> float:
+        if first is None or second is None:
+            return 0.0
+        return sum(x == y for x, y in zip(first, second)) / len(first)
+
+
+class ConvergenceDetector:
+    """Scores each turn's novelty and notices when every participant has stalled"""
+
+    def __init__(self, participants: Sequence[str], threshold: float = NOVELTY_THRESHOLD,
+                 patience: int = PATIENCE, num_hashes: int = NUM_HASHES):
+        self.participants = list(participants)
+        self.threshold = threshold
+        self.patience = patience
+        self.minhash = MinHash(num_hashes)
+        self._signatures: Dict[str, List[Optional[List[int]]]] = {p: [] for p in self.participants}
+        self._queries: Dict[str, set] = {p: set() for p in self.participants}
+        self._streaks = {p: 0 for p in self.participants}
+        self.turns: List[Dict[str, Any]] = []
+        self.converged_at: Optional[int] = None  # turn number
+
+    def observe(self, participant: str, text: str, queries: Sequence[str] = (),
+                turn: Optional[int] = None) -> Dict[str, Any]:
+        """Score one turn and update the participant's low-novelty streak"""
+        signature = self.minhash.signature(shingles(text))
+        earlier = self._signatures[participant]
+        similarity = max((self.minhash.similarity(signature, old) for old in earlier), default=0.0)
+        self._signatures[participant].append(signature)
+
+        normalized = {normalize_query(query) for query in queries} - {""}
+        repeated = len(normalized & self._queries[participant]) / len(normalized) if normalized else None
+        self._queries[participant] |= normalized
+
+        novelty = 1.0 - similarity
+        if repeated is not None:
+            novelty = (1 - QUERY_WEIGHT) * novelty + QUERY_WEIGHT * (1.0 - repeated)
+        # A first turn has nothing to repeat
+        stalled = bool(earlier) and novelty < self.threshold
+        self._streaks[participant] = self._streaks[participant] + 1 if stalled else 0
+
+        # Callers that skip some turns (failed requests) pass the real turn number
+        scored = {
+            "turn": len(self.turns) + 1 if turn is None else turn,
+            "participant": participant,
+            "novelty": round(novelty, 3),
+            "text_similarity": round(similarity, 3),
+            "repeated_queries": None if repeated is None else round(repeated, 3),
+        }
+        self.turns.append(scored)
+        if self.converged_at is None and all(streak >= self.patience for streak in self._streaks.values()):
+            self.converged_at = scored["turn"]
+        return scored
+
+    @property
+    def converged(self) -> bool:
+        return self.converged_at is not None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "threshold": self.threshold,
+            "patience": self.patience,
+            "converged_at_turn": self.converged_at,
+            "turns": self.turns,
+        }
@@ -5,15 +5,32 @@ Claude Debate Tool - Two Claude instances engage in structured debate
 
 import json
 import os
+import threading
 import time
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass, asdict
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
 import argparse
-import requests
-from anthropic import Anthropic
 
-import dotenv
-dotenv.load_dotenv()
+from host_health import HostHealth, HostUnavailable
+from search_backends import HedgedSearch, LocalIndex, SearchBackend, create_search
+from convergence import NOVELTY_THRESHOLD, PATIENCE, ConvergenceDetector
+from compaction import CHARS_PER_TOKEN, DEFAULT_COMPACT_CHARS, compact_tool_results, request_chars
+from fsutil import atomic_write_text
+from profiling import add_profile_arguments, phase, start_from_args
+
+# anthropic, requests and dotenv are imported where they are used, so that
+# --help and other short invocations don't pay for importing them
+if TYPE_CHECKING:
+    from anthropic import Anthropic
+
+
+def load_environment() -> None:
+    """Load API keys from .env into the environment"""
+    import dotenv
+    dotenv.load_dotenv()
 
 
 @dataclass
@@ -42,117 +59,291 @@ class DebateConfig:
     max_turns: int = 30
     api_key: Optional[str] = None
     model_name: str = "sonnet"
+    participants: int = 2  # more than two makes a panel that rebuts in concurrent rounds
+    compact_threshold: int = DEFAULT_COMPACT_CHARS  # chars of tool results in a turn before older ones are summarized; 0 disables
+    prefetch_k: int = 0  # top search hits fetched in the background; 0 disables
+    search_backends: List[str] = field(default_factory=lambda: ["brave"])  # in hedging order
+    search_index: Optional[str] = None  # directory for the "local" search backend
+    on_convergence: str = "close"  # once every side repeats itself: "close" with closing statements, "stop" or "off"
+    novelty_threshold: float = NOVELTY_THRESHOLD
+    convergence_patience: int = PATIENCE  # low-novelty turns in a row, per participant
+
+
+PREFETCH_WORKERS = 4
+PREFETCH_BUFFER_ENTRIES = 32
 
 
 class WebToolkit:
-    """Web search and fetch functionality for Claude participants"""
+    """Web search and fetch functionality for Claude participants
+    
+    One toolkit is shared by all participants. With prefetch_k set, the top
+    prefetch_k URLs of every search are fetched in the background, and a later
+    fetch_url for one of them is served from that buffer instead of a new
+    round trip.
+    """
     
-    @staticmethod
-    def search_web(query: str, num_results: int = 3) -> str:
+    def __init__(self, prefetch_k: int = 0, prefetch_workers: int = PREFETCH_WORKERS,
+                 buffer_entries: int = PREFETCH_BUFFER_ENTRIES, search: Optional[SearchBackend] = None,
+                 host_health: Optional[HostHealth] = None):
+        self.search = search or create_search(["brave"])
+        self.host_health = host_health or HostHealth()
+        # file:// URLs are only read inside local search indexes, never elsewhere on disk
+        backends = self.search.backends if isinstance(self.search, HedgedSearch) else [self.search]
+        self.local_roots = [backend.directory.resolve() for backend in backends if isinstance(backend, LocalIndex)]
+        self.prefetch_k = prefetch_k
+        self.prefetch_workers = prefetch_workers
+        self.buffer_entries = buffer_entries
+        self._pool = None
+        self._buffer: "OrderedDict[str, Future]" = OrderedDict()
+        # Reentrant: a done-callback added under the lock may run immediately
+        self._lock = threading.RLock()
+        self.stats = {"fetches": 0, "prefetched": 0, "hits": 0, "wasted": 0, "wasted_bytes": 0, "failed": 0}
+    
+    def search_web(self, query: str, num_results: int = 3) -> str:
         """Perform a web search and return formatted results"""
         try:
-            import os
-            
-            # Get API key from environment
-            api_key = os.getenv('BRAVE_SEARCH_API_KEY')
-            if not api_key:
-                return "Error: BRAVE_SEARCH_API_KEY environment variable not set"
-            
-            url = "https://api.search.brave.com/res/v1/web/search"
-            headers = {
-                'Accept': 'application/json',
-                'Accept-Encoding': 'gzip',
-                'X-Subscription-Token': api_key
-            }
-            
-            params = {
-                'q': query,
-                'count': num_results,
-                'search_lang': 'en',
-                'country': 'US',
-                'safesearch': 'moderate',
-                'freshness': 'pw'
-            }
-            
-            response = requests.get(url, headers=headers, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            results = []
-            
-            if data.get('web', {}).get('results'):
-                for i, result in enumerate(data['web']['results'], 1):
-                    title = result.get('title', 'No title')
-                    url = result.get('url', '')
-                    description = result.get('description', 'No description')
-                    results.append(f"{i}. {title}\n   {url}\n   {description}\n")
-            
-            return "\n".join(results) if results else f"No search results found for '{query}'"
-            
+            results = self.search.search(query, num_results)
         except Exception as e:
             return f"Search error: {str(e)}"
+        
+        self.prefetch([result.url for result in results if result.url][:self.prefetch_k])
+        formatted = [
+            f"{i}. {result.title}\n   {result.url}\n   {result.description}\n"
+            for i, result in enumerate(results, 1)
+        ]
+        return "\n".join(formatted) if formatted else f"No search results found for '{query}'"
+    
+    def prefetch(self, urls: List[str]) -> None:
+        """Start fetching urls in the background for a later fetch_url"""
+        if not urls:
+            return
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.prefetch_workers, thread_name_prefix="prefetch")
+            for url in urls:
+                key = _buffer_key(url)
+                if key in self._buffer or not self.host_health.available(url):
+                    continue
+                self._buffer[key] = self._pool.submit(self._download, url, True)
+                self.stats["prefetched"] += 1
+                # Oldest prefetches are the least likely to be asked for
+                while len(self._buffer) > self.buffer_entries:
+                    self._discard(self._buffer.popitem(last=False)[1])
     
-    @staticmethod
-    def fetch_url(url: str) -> str:
+    def fetch_url(self, url: str) -> str:
         """Fetch content from a specific URL"""
+        with self._lock:
+            self.stats["fetches"] += 1
+            future = self._buffer.pop(_buffer_key(url), None)
+        if future is not None:
+            try:
+                # Still in flight is fine: the wait is shorter than a new request
+                content, _ = future.result()
+                with self._lock:
+                    self.stats["hits"] += 1
+                return f"Content from {url}:\n{content}"
+            except Exception:
+                # A failed prefetch gets a normal retry below
+                with self._lock:
+                    self.stats["failed"] += 1
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=15)
-            response.raise_for_status()
-            
-            # Basic content extraction - remove HTML tags
-            content = response.text
-            import re
-            # Remove script and style elements
-            content = re.sub(r'<(script|style)[^>]*>.*?</\1>', '', content, flags=re.DOTALL | re.IGNORECASE)
-            # Remove HTML tags
-            content = re.sub(r'<[^>]+>', '', content)
-            # Clean up whitespace
-            content = re.sub(r'\s+', ' ', content).strip()
-            
-            # Truncate if too long
-            if len(content) > 3000:
-                content = content[:3000] + "... [truncated]"
-            
+            content, _ = self._download(url)
             return f"Content from {url}:\n{content}"
-            
         except Exception as e:
             return f"Error fetching {url}: {str(e)}"
+    
+    def _download(self, url: str, speculative: bool = False) -> tuple[str, int]:
+        """The page's readable text and the number of bytes downloaded
+        
+        A speculative download is a prefetch nobody has asked for yet: it never
+        becomes a recovering host's probe, and its failures are not recorded
+        against the host or URL, so the real fetch still gets its own attempt.
+        """
+        if url.startswith("file://"):
+            return self._read_local(url)
+        
+        import requests
+        
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        }
+        # Fail fast on hosts and URLs that just failed instead of waiting out the timeout again
+        if not speculative:
+            self.host_health.check(url)
+        elif not self.host_health.available(url):
+            raise HostUnavailable(f"skipped prefetch of {url}")
+        succeeded = False
+        try:
+            with self.host_health.slot(url):
+                try:
+                    response = requests.get(url, headers=headers, timeout=15)
+                    response.raise_for_status()
+                except requests.RequestException as e:
+                    if not speculative:
+                        status = e.response.status_code if e.response is not None else None
+                        self.host_health.record_failure(url, status)
+                    raise
+            succeeded = True
+        finally:
+            if not succeeded:
+                # Anything else (a malformed URL, an interrupt) must not leave the host waiting on this probe
+                self.host_health.release_probe(url)
+        self.host_health.record_success(url)
+        
+        # Keep the page's main content, not its navigation and boilerplate
+        from extract import MAX_CHARS, extract_main_text, truncate
+        if "html" in response.headers.get("Content-Type", "text/html"):
+            content = extract_main_text(response.text)
+        else:
+            content = truncate(response.text.strip(), MAX_CHARS)
+        return content, len(response.content)
+    
+    def _read_local(self, url: str) -> tuple[str, int]:
+        from urllib.parse import urlparse
+        from urllib.request import url2pathname
+        from extract import MAX_CHARS, extract_main_text, truncate
+        
+        path = Path(url2pathname(urlparse(url).path)).resolve()
+        if not any(path.is_relative_to(root) for root in self.local_roots):
+            raise ValueError("file URLs outside the local search index are not fetched")
+        raw = path.read_bytes()
+        text = raw.decode("utf-8", errors="replace")
+        if path.suffix.lower() in (".html", ".htm"):
+            return extract_main_text(text), len(raw)
+        return truncate(text.strip(), MAX_CHARS), len(raw)
+    
+    def _discard(self, future: Future) -> None:
+        """Count a prefetch nobody asked for; called with the lock held"""
+        self.stats["wasted"] += 1
+        if future.cancel():
+            return
+        if future.done() and future.exception() is None:
+            self.stats["wasted_bytes"] += future.result()[1]
+        else:
+            future.add_done_callback(self._count_late_waste)
+    
+    def _count_late_waste(self, future: Future) -> None:
+        if not future.cancelled() and future.exception() is None:
+            with self._lock:
+                self.stats["wasted_bytes"] += future.result()[1]
+    
+    def close(self, wait: bool = False) -> None:
+        """Stop prefetching; everything still buffered counts as wasted
+        
+        Downloads already under way finish in the background unless wait is set.
+        """
+        with self._lock:
+            pool, self._pool = self._pool, None
+            while self._buffer:
+                self._discard(self._buffer.popitem(last=False)[1])
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+        if hasattr(self.search, "close"):
+            self.search.close()
+    
+    def telemetry(self) -> Dict[str, Any]:
+        """Prefetch counters, for tuning prefetch_k, per-host breaker state and search backend latencies"""
+        with self._lock:
+            stats = dict(self.stats)
+        stats["prefetch_k"] = self.prefetch_k
+        stats["hit_rate"] = stats["hits"] / stats["prefetched"] if stats["prefetched"] else 0.0
+        telemetry = {"prefetch": stats, "fetch": self.host_health.telemetry()}
+        if hasattr(self.search, "telemetry"):
+            telemetry["search"] = self.search.telemetry()
+        return telemetry
+
+
+def _buffer_key(url: str) -> str:
+    # The same page is often cited with and without a fragment or trailing slash
+    return url.split("#", 1)[0].rstrip("/")
+
+
+# generate_response returns this plus the exception text when the API request fails
+RESPONSE_ERROR_PREFIX = "Error generating response: "
+
+
+def participant_label(participant_id: str) -> str:
+    """Display name for a participant id: claude_3 -> Claude 3"""
+    return f"Claude {participant_id.rsplit('_', 1)[-1]}"
+
+
+def append_message(messages: List[Dict[str, Any]], role: str, content: str) -> None:
+    """Append a text message, merging it into the previous one if that has the same role"""
+    if messages and messages[-1]["role"] == role and isinstance(messages[-1]["content"], str):
+        messages[-1]["content"] += f"\n\n{content}"
+    else:
+        messages.append({"role": role, "content": content})
+
+
+def format_history(conversation_history: List[Message], participant_id: str, topic: str,
+                   attribute: bool = False) -> List[Dict[str, Any]]:
+    """The debate so far as participant_id sees it: its own messages as "assistant", all others as "user"
+    
+    Consecutive messages from other participants merge into one user message,
+    prefixed with the speaker's name when attribute is set, so roles alternate
+    and the conversation starts with a user message as the API expects.
+    """
+    formatted = []
+    for msg in conversation_history:
+        if msg.participant == participant_id:
+            if not formatted:
+                formatted.append({"role": "user", "content": f"Debate topic: {topic}"})
+            append_message(formatted, "assistant", msg.content)
+        else:
+            content = f"{participant_label(msg.participant)}: {msg.content}" if attribute else msg.content
+            append_message(formatted, "user", content)
+    return formatted
 
 
 class ClaudeDebater:
     """Represents one Claude participant in the debate"""
     
-    def __init__(self, client: Anthropic, participant_id: str):
+    def __init__(self, client: "Anthropic", participant_id: str, web_toolkit: Optional[WebToolkit] = None,
+                 panel_size: int = 2):
         self.client = client
         self.participant_id = participant_id
+        self.panel_size = panel_size  # with more than two participants, others' messages are attributed
         self.position = None  # Will be determined dynamically
-        self.web_toolkit = WebToolkit()
+        self.web_toolkit = web_toolkit or WebToolkit()
+        # Request sizes across all turns, for the saved metadata
+        self.requests = 0
+        self.request_chars = 0
+        self.compacted_chars = 0
     
-    def generate_response(self, conversation_history: List[Message], topic: str, model_name: str) -> tuple[str, List[SearchQuery]]:
-        """Generate a response from this Claude instance"""
+    def generate_response(self, conversation_history: List[Message], topic: str, model_name: str,
+                          compact_threshold: int = DEFAULT_COMPACT_CHARS,
+                          closing: bool = False) -> tuple[str, List[SearchQuery]]:
+        """Generate a response from this Claude instance; closing asks for a closing statement"""
         
         # Convert conversation history to the format this Claude sees
-        # Each Claude sees their own messages as "assistant" and opponent's as "user"
-        formatted_history = []
-        
-        for msg in conversation_history:
-            if msg.participant == self.participant_id:
-                # This Claude's previous messages appear as "assistant"
-                formatted_history.append({"role": "assistant", "content": msg.content})
-            else:
-                # Opponent's messages appear as "user"
-                formatted_history.append({"role": "user", "content": msg.content})
+        # Each Claude sees their own messages as "assistant" and everyone else's as "user"
+        formatted_history = format_history(conversation_history, self.participant_id, topic,
+                                           attribute=self.panel_size > 2)
         
         # Get current date for context
         from datetime import datetime
         current_date = datetime.now().strftime("%B %d, %Y")
         
-        # Determine position if this is the first turn
-        if len(conversation_history) == 0:
-            if self.participant_id == "claude_1":
+        # The opening turn is this Claude's first message, wherever it falls in the debate
+        is_opening = not any(msg.participant == self.participant_id for msg in conversation_history)
+        if closing:
+            # The debate has stopped producing new arguments
+            system_prompt = f"""Today's date: {current_date}
+
+You are finishing a debate on: "{topic}"
+
+Your established position: {self.position}
+
+The debate has started repeating itself, so it is ending now and you will give your closing statement.
+
+Instructions:
+1. Summarize the strongest evidence for your position that came up in the debate
+2. Acknowledge the best point made against you and say why your position still holds
+3. Do not introduce new arguments; you do not need to search
+4. Keep your closing statement short (aim for 150-250 words)"""
+            user_prompt = "The debate is ending. Give your closing statement."
+        elif is_opening:
+            if not conversation_history:
                 # First Claude chooses their position
                 system_prompt = f"""Today's date: {current_date}
 
@@ -174,6 +365,35 @@ Instructions:
 
 You must use the web_search tool to gather evidence before presenting your argument."""
                 user_prompt = f"Choose your position and make your opening argument on: {topic}"
+            elif self.panel_size > 2:
+                # Later panelists must each take a position nobody has taken yet
+                taken = "\n".join(
+                    f"- {participant_label(participant)}: {position}"
+                    for participant, position in self._positions_taken(conversation_history)
+                )
+                system_prompt = f"""Today's date: {current_date}
+
+You are joining a panel debate on: "{topic}"
+
+The other panelists have taken these positions:
+{taken}
+
+Your task: Take a position that is clearly DIFFERENT from every position above and present your opening statement. You may not agree with any panelist outright.
+
+You have access to web search tools to research your position:
+- Use the web_search tool to find current information and evidence
+- Use the web_fetch tool to get detailed content from specific URLs
+
+Instructions:
+1. Decide on a distinct position and state it clearly
+2. **IMPORTANT**: Use the web_search tool to research current evidence before making your argument
+3. Search for information that challenges the positions already taken
+4. Present a compelling opening argument incorporating the search results
+5. Your goal is to convince the panel (and any observers) that your position is correct
+6. Keep your response focused but substantive (aim for 200-400 words)
+
+You must use the web_search tool to gather evidence before presenting your argument."""
+                user_prompt = "Choose a distinct position and make your opening argument."
             else:
                 # Second Claude must take the opposite position
                 opponent_position = self._extract_position_from_history(conversation_history)
@@ -225,9 +445,33 @@ Instructions:
 
 You should use the web_search tool to gather supporting evidence for your response."""
             user_prompt = "Respond to your opponent's argument and continue making your case."
+            if self.panel_size > 2:
+                system_prompt = f"""Today's date: {current_date}
+
+You are a panelist in an ongoing debate on: "{topic}"
+
+Your established position: {self.position}
+
+Each other panelist's messages are labelled with their name.
+
+You have access to web search tools to research supporting evidence:
+- Use the web_search tool to find current information and evidence
+- Use the web_fetch tool to get detailed content from specific URLs
+
+Instructions:
+1. Respond directly to the other panelists' latest arguments, naming who you are answering
+2. **IMPORTANT**: Use the web_search tool to find current evidence supporting your position
+3. Search for data that refutes their claims and supports your stance
+4. Address their points while strengthening your own case with search results
+5. Be persuasive and use concrete evidence from your searches
+6. Your goal is to convince the panel that your position is the strongest
+7. Keep responses focused (aim for 200-400 words)
+
+You should use the web_search tool to gather supporting evidence for your response."""
+                user_prompt = "Respond to the other panelists' arguments and continue making your case."
 
         
-        formatted_history.append({"role": "user", "content": user_prompt})
+        append_message(formatted_history, "user", user_prompt)
         
         # Define available tools for Claude
         tools = [
@@ -268,13 +512,23 @@ You should use the web_search tool to gather supporting evidence for your respon
             all_content = []
             
             for iteration in range(max_iterations):
-                response = self.client.messages.create(
-                    model=f"claude-{model_name}-4-20250514",
-                    max_tokens=8_000,
-                    system=system_prompt,
-                    messages=formatted_history,
-                    tools=tools
-                )
+                # Summarize older tool results once this turn has gathered a lot of them
+                saved = compact_tool_results(formatted_history, compact_threshold)
+                size = request_chars(formatted_history, system_prompt)
+                self.requests += 1
+                self.request_chars += size
+                self.compacted_chars += saved
+                note = f", compacted {saved // CHARS_PER_TOKEN:,} tokens of older results" if saved else ""
+                print(f"📦 Request {iteration + 1}: ~{size // CHARS_PER_TOKEN:,} input tokens{note}")
+                
+                with phase("api"):
+                    response = self.client.messages.create(
+                        model=f"claude-{model_name}-4-20250514",
+                        max_tokens=8_000,
+                        system=system_prompt,
+                        messages=formatted_history,
+                        tools=tools
+                    )
                 
                 # Handle the response
                 content_blocks = []
@@ -303,7 +557,8 @@ You should use the web_search tool to gather supporting evidence for your respon
                     for tool_call in tool_calls:
                         if tool_call.name == "web_search":
                             query = tool_call.input["query"]
-                            result = self.web_toolkit.search_web(query)
+                            with phase("search"):
+                                result = self.web_toolkit.search_web(query)
                             search_queries.append(SearchQuery(
                                 query=query,
                                 timestamp=time.time(),
@@ -314,7 +569,8 @@ You should use the web_search tool to gather supporting evidence for your respon
                             
                         elif tool_call.name == "web_fetch":
                             url = tool_call.input["url"]
-                            result = self.web_toolkit.fetch_url(url)
+                            with phase("fetch"):
+                                result = self.web_toolkit.fetch_url(url)
                             search_queries.append(SearchQuery(
                                 query=f"Fetched: {url}",
                                 timestamp=time.time(),
@@ -343,13 +599,13 @@ You should use the web_search tool to gather supporting evidence for your respon
             final_content = "\n\n".join(all_content)
             
             # Extract and store position if this is first turn
-            if len(conversation_history) == 0:
+            if is_opening:
                 self.position = self._extract_position_from_response(final_content, topic)
             
             return final_content, search_queries
             
         except Exception as e:
-            return f"Error generating response: {str(e)}", []
+            return f"{RESPONSE_ERROR_PREFIX}{str(e)}", []
     
     
     def _extract_position_from_response(self, content: str, topic: str) -> str:
@@ -379,74 +635,149 @@ You should use the web_search tool to gather supporting evidence for your respon
             first_message = conversation_history[0]
             return self._extract_position_from_response(first_message.content, "")
         return "Unknown position"
+    
+    def _positions_taken(self, conversation_history: List[Message]) -> List[tuple[str, str]]:
+        """(participant, position) for every other participant, from their opening messages"""
+        openings = {}
+        for msg in conversation_history:
+            if msg.participant != self.participant_id and msg.participant not in openings:
+                openings[msg.participant] = self._extract_position_from_response(msg.content, "")
+        return list(openings.items())
 
 
 class DebateOrchestrator:
-    """Manages the debate between two Claude instances"""
+    """Manages the debate between two or more Claude instances"""
     
     def __init__(self, config: DebateConfig):
+        if config.participants < 2:
+            raise ValueError("a debate needs at least two participants")
         self.config = config
         self.conversation_history: List[Message] = []
         
         # Initialize Anthropic client
+        if not config.api_key:
+            load_environment()
         api_key = config.api_key or os.getenv('ANTHROPIC_API_KEY')
         if not api_key:
             raise ValueError("ANTHROPIC_API_KEY environment variable or api_key parameter required")
         
+        from anthropic import Anthropic
         client = Anthropic(api_key=api_key)
         
-        # Create two Claude debaters (positions will be determined dynamically)
-        self.claude_1 = ClaudeDebater(client, "claude_1")
-        self.claude_2 = ClaudeDebater(client, "claude_2")
-        
-        self.current_speaker = self.claude_1
+        # Create the Claude debaters (positions will be determined dynamically)
+        # They share one toolkit, so any of them can use pages another's searches prefetched
+        self.web_toolkit = WebToolkit(prefetch_k=config.prefetch_k,
+                                      search=create_search(config.search_backends, config.search_index))
+        self.debaters = [
+            ClaudeDebater(client, f"claude_{n}", self.web_toolkit, panel_size=config.participants)
+            for n in range(1, config.participants + 1)
+        ]
         self.turn_count = 0
+        self.convergence = ConvergenceDetector(
+            [debater.participant_id for debater in self.debaters],
+            threshold=config.novelty_threshold,
+            patience=config.convergence_patience,
+        )
+        self.end_reason: Optional[str] = None
     
     def run_debate(self) -> List[Dict[str, Any]]:
         """Run the complete debate and return the conversation history"""
         
+        labels = [participant_label(debater.participant_id) for debater in self.debaters]
         print(f"🎭 Starting debate: {self.config.topic}")
-        print(f"📊 Claude 1 and Claude 2 will choose their own positions")
+        print(f"📊 {', '.join(labels[:-1])} and {labels[-1]} will choose their own positions")
         print(f"🔄 Maximum turns: {self.config.max_turns}")
         print("-" * 60)
         
-        while self.turn_count < self.config.max_turns*2:
-            self.turn_count += 1
-            current_participant = "claude_1" if self.current_speaker == self.claude_1 else "claude_2"
-            position = self.current_speaker.position
-            
-            print(f"\n🗣️  Turn {self.turn_count} - Claude {current_participant[-1]} ({position}):")
-            print("-" * 40)
-            
-            # Generate response
-            response, search_queries = self.current_speaker.generate_response(
-                self.conversation_history, 
-                self.config.topic,
-                self.config.model_name,
-            )
-            
-            # Add to conversation history
-            message = Message(
-                role="assistant",
-                content=response,
-                timestamp=time.time(),
-                participant=current_participant,
-                searches=search_queries
-            )
-            self.conversation_history.append(message)
-            
-            # Print the response
-            print(response)
-            
-            # Switch speakers
-            self.current_speaker = self.claude_2 if self.current_speaker == self.claude_1 else self.claude_1
-            
-            # Brief pause between turns
-            time.sleep(1)
+        # Every participant speaks up to max_turns times
+        limit = self.config.max_turns * len(self.debaters)
         
-        print(f"\n🏁 Debate completed after {self.config.max_turns} turns")
+        # Openings go one at a time: each speaker needs the positions already taken
+        for debater in self.debaters:
+            if self.turn_count >= limit:
+                break
+            self._take_turn(debater)
+        
+        if len(self.debaters) == 2:
+            # Two debaters alternate, each answering the other's latest message
+            while self.turn_count < limit and not self._stalled():
+                self._take_turn(self.debaters[self.turn_count % 2])
+        else:
+            # A panel rebuts in rounds: everyone answers the same state of the debate at once
+            while self.turn_count < limit and not self._stalled():
+                self._panel_round()
+        
+        if self._stalled():
+            self.end_reason = "converged"
+            print(f"\n🧭 Debate converged at turn {self.convergence.converged_at}: "
+                  f"every participant is repeating their earlier turns")
+            if self.config.on_convergence == "close":
+                for debater in self.debaters:
+                    self._take_turn(debater, closing=True)
+        else:
+            self.end_reason = "max_turns"
+        
+        self.web_toolkit.close()
+        if self.config.prefetch_k:
+            stats = self.web_toolkit.telemetry()["prefetch"]
+            print(f"📡 Prefetch: {stats['hits']} of {stats['prefetched']} prefetched pages used, "
+                  f"{stats['wasted_bytes'] / 1024:.0f} KB fetched for nothing")
+        print(f"\n🏁 Debate completed after {self.turn_count} turns")
         return [asdict(msg) for msg in self.conversation_history]
     
+    def _stalled(self) -> bool:
+        return self.config.on_convergence != "off" and self.convergence.converged
+    
+    def _generate(self, debater: ClaudeDebater, history: List[Message],
+                  closing: bool = False) -> tuple[str, List[SearchQuery]]:
+        return debater.generate_response(
+            history,
+            self.config.topic,
+            self.config.model_name,
+            self.config.compact_threshold,
+            closing=closing,
+        )
+    
+    def _record(self, debater: ClaudeDebater, response: str, search_queries: List[SearchQuery],
+                closing: bool = False) -> None:
+        """Add a finished turn to the conversation history and print it"""
+        self.turn_count += 1
+        kind = "Closing statement" if closing else "Turn"
+        print(f"\n🗣️  {kind} {self.turn_count} - {participant_label(debater.participant_id)} ({debater.position}):")
+        print("-" * 40)
+        
+        message = Message(
+            role="assistant",
+            content=response,
+            timestamp=time.time(),
+            participant=debater.participant_id,
+            searches=search_queries
+        )
+        self.conversation_history.append(message)
+        print(response)
+        
+        # A failed request says nothing about whether the debate is repeating itself
+        if not closing and not response.startswith(RESPONSE_ERROR_PREFIX):
+            queries = [search.query for search in search_queries if search.url is None]
+            novelty = self.convergence.observe(debater.participant_id, response, queries, turn=self.turn_count)
+            print(f"🧭 Novelty: {novelty['novelty']:.2f}")
+    
+    def _take_turn(self, debater: ClaudeDebater, closing: bool = False) -> None:
+        response, search_queries = self._generate(debater, self.conversation_history, closing)
+        self._record(debater, response, search_queries, closing)
+        
+        # Brief pause between turns
+        time.sleep(1)
+    
+    def _panel_round(self) -> None:
+        """Generate every panelist's rebuttal concurrently, then record them in panel order"""
+        snapshot = list(self.conversation_history)
+        print(f"\n🔁 {len(self.debaters)} panelists are responding...")
+        with ThreadPoolExecutor(max_workers=len(self.debaters), thread_name_prefix="panelist") as pool:
+            futures = [pool.submit(self._generate, debater, snapshot) for debater in self.debaters]
+            for debater, future in zip(self.debaters, futures):
+                self._record(debater, *future.result())
+    
     def save_conversation(self, filename: str = None) -> str:
         """Save the conversation to a JSON file"""
         # Create conversations directory if it doesn't exist
@@ -467,23 +798,35 @@ class DebateOrchestrator:
             "metadata": {
                 "total_turns": len(self.conversation_history),
                 "start_time": self.conversation_history[0].timestamp if self.conversation_history else None,
-                "end_time": self.conversation_history[-1].timestamp if self.conversation_history else None
+                "end_time": self.conversation_history[-1].timestamp if self.conversation_history else None,
+                "requests": {
+                    debater.participant_id: {
+                        "count": debater.requests,
+                        "input_chars": debater.request_chars,
+                        "compacted_chars": debater.compacted_chars,
+                    }
+                    for debater in self.debaters
+                },
+                "telemetry": self.web_toolkit.telemetry(),
+                "end_reason": self.end_reason,
+                "convergence": self.convergence.to_dict(),
             }
         }
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(debate_data, f, indent=2, ensure_ascii=False)
+        # Written atomically so watch.py never picks up a half-written debate
+        with phase("write"):
+            atomic_write_text(filename, json.dumps(debate_data, indent=2, ensure_ascii=False))
         
         print(f"💾 Conversation saved to: {filename}")
         return filename
 
 
-def debug_search(query: str):
-    """Debug function to test web search directly"""
+def debug_search(query: str, search: Optional[SearchBackend] = None):
+    """Debug function to test web search directly, through the given search backends"""
     print(f"🔍 Testing search for: {query}")
     print("-" * 50)
     
-    toolkit = WebToolkit()
+    toolkit = WebToolkit(search=search)
     
     # Test web search
     print("📝 Web Search Results:")
@@ -496,22 +839,47 @@ def debug_search(query: str):
         print("🌐 Web Fetch Results:")
         fetch_result = toolkit.fetch_url(query)
         print(fetch_result)
+    
+    for name, stats in toolkit.telemetry().get("search", {}).get("backends", {}).items():
+        print(f"📈 {name}: {stats['requests']} request(s), {stats['wins']} win(s), {stats['errors']} error(s)")
+    toolkit.close()
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     parser = argparse.ArgumentParser(description="Claude Debate Tool")
     parser.add_argument("topic", nargs='?', help="The debate topic")
-    parser.add_argument("--turns", type=int, default=30, help="Maximum number of turns (default: 30)")
+    parser.add_argument("--turns", type=int, default=30, help="Maximum number of turns per participant (default: 30)")
+    parser.add_argument("--participants", type=int, default=2,
+                        help="Number of debaters; more than 2 makes a panel whose rebuttals are generated concurrently (default: 2)")
     parser.add_argument("--model", default="sonnet", help="The model to use, either 'sonnet' or 'opus' (default: sonnet)")
     parser.add_argument("--output", help="Output filename (default: auto-generated)")
     parser.add_argument("--api-key", help="Anthropic API key (or set ANTHROPIC_API_KEY env var)")
     parser.add_argument("--debug-search", help="Test web search functionality with a query")
+    parser.add_argument("--prefetch", type=int, default=0, metavar="K",
+                        help="Fetch the top K hits of every search in the background (default: 0, off)")
+    parser.add_argument("--search", default="brave",
+                        help="Comma-separated search backends in hedging order: brave, local (default: brave)")
+    parser.add_argument("--search-index", metavar="DIR",
+                        help="Directory of saved pages and notes for the local search backend")
+    parser.add_argument("--compact-threshold", type=int, default=DEFAULT_COMPACT_CHARS,
+                        help=f"Characters of tool results in a turn above which the older ones are summarized; 0 disables (default: {DEFAULT_COMPACT_CHARS})")
+    parser.add_argument("--on-convergence", choices=["close", "stop", "off"], default="close",
+                        help="What to do once every participant repeats their earlier turns: closing statements, stop, or keep going (default: close)")
+    parser.add_argument("--novelty-threshold", type=float, default=NOVELTY_THRESHOLD,
+                        help=f"Novelty below which a turn counts as repeating the speaker's earlier turns (default: {NOVELTY_THRESHOLD})")
+    parser.add_argument("--convergence-patience", type=int, default=PATIENCE,
+                        help=f"Low-novelty turns in a row, per participant, before the debate has converged (default: {PATIENCE})")
+    add_profile_arguments(parser)
+    
+    args = parser.parse_args(argv)
+    start_from_args(args)
+    load_environment()
     
-    args = parser.parse_args()
+    search_backends = [name.strip() for name in args.search.split(",") if name.strip()]
     
     # Handle debug search mode
     if args.debug_search:
-        debug_search(args.debug_search)
+        debug_search(args.debug_search, create_search(search_backends, args.search_index))
         return 0
     
     # Require topic for normal debate mode
@@ -523,7 +891,15 @@ def main():
         topic=args.topic,
         max_turns=args.turns,
         api_key=args.api_key,
-        model_name=args.model
+        model_name=args.model,
+        participants=args.participants,
+        compact_threshold=args.compact_threshold,
+        prefetch_k=args.prefetch,
+        search_backends=search_backends,
+        search_index=args.search_index,
+        on_convergence=args.on_convergence,
+        novelty_threshold=args.novelty_threshold,
+        convergence_patience=args.convergence_patience
     )
     
     try:
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Main-content extraction for fetched web pages
+A small readability-style extractor built on BeautifulSoup: boilerplate
+(navigation, cookie banners, sidebars, footers) is dropped, paragraphs are
+scored by length and punctuation, and the text of the container that
+collects the most paragraph score is returned with its block structure intact
+"""
+
+import re
+from typing import Dict, List, Optional
+
+from bs4 import BeautifulSoup, Comment, NavigableString, Tag
+
+MAX_CHARS = 3000
+
+# Never content, whatever their attributes say
+DROP_TAGS = (
+    "script", "style", "noscript", "template", "svg", "canvas", "iframe", "form",
+    "button", "select", "input", "nav", "footer", "aside", "dialog", "menu",
+)
+LANDMARKS = ("article", "main")
+
+# id/class hints, as in Mozilla's Readability. "ad" must be a whole token of a
+# class or id: unanchored, it would match inside "lead-", "thread-" or "head-"
+NEGATIVE = re.compile(
+    r"(?:^|[\s_-])ads?(?:[\s_-]|$)|advert|banner|breadcrumb|comment|consent|cookie|footer|gdpr|menu|modal|nav|newsletter"
+    r"|popup|promo|related|share|sidebar|signup|social|sponsor|subscribe|toolbar|widget",
+    re.IGNORECASE,
+)
+POSITIVE = re.compile(r"article|body|content|entry|main|page|post|story|text", re.IGNORECASE)
+
+BLOCK_TAGS = {
+    "p", "pre", "blockquote", "li", "dt", "dd", "td", "th", "figcaption",
+    "h1", "h2", "h3", "h4", "h5", "h6",
+}
+HEADINGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+
+# A paragraph shorter than this is usually a caption, byline or button label
+MIN_PARAGRAPH_CHARS = 25
+# An <article>/<main> with at least this much text is trusted without scoring
+MIN_LANDMARK_CHARS = 250
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _text(node: Tag) -> str:
+    return _WHITESPACE.sub(" ", node.get_text(" ")).strip()
+
+
+def _hints(tag: Tag) -> str:
+    classes = tag.get("class") or []
+    return " ".join([tag.get("id") or "", *classes, tag.get("role") or ""])
+
+
+def _is_boilerplate(tag: Tag) -> bool:
+    if tag.has_attr("hidden") or tag.get("aria-hidden") == "true":
+        return True
+    if tag.get("role") in ("navigation", "banner", "contentinfo", "complementary", "dialog"):
+        return True
+    hints = _hints(tag)
+    return bool(NEGATIVE.search(hints)) and not POSITIVE.search(hints)
+
+
+def _strip_boilerplate(soup: BeautifulSoup) -> None:
+    for comment in soup.find_all(string=lambda s: isinstance(s, Comment)):
+        comment.extract()
+    for tag in soup.find_all(DROP_TAGS):
+        tag.decompose()
+    # A page's <header> is masthead; an article's <header> holds its headline
+    for tag in soup.find_all("header"):
+        if tag.find_parent(LANDMARKS) is None:
+            tag.decompose()
+    # Collect first: decomposing while iterating skips siblings
+    for tag in [t for t in soup.find_all(True) if t.name not in ("html", "body") and _is_boilerplate(t)]:
+        if not tag.decomposed:
+            tag.decompose()
+
+
+def _link_density(node: Tag, text_length: int) -> float:
+    if not text_length:
+        return 1.0
+    link_chars = sum(len(_text(a)) for a in node.find_all("a"))
+    return min(1.0, link_chars / text_length)
+
+
+def _best_candidate(body: Tag) -> Optional[Tag]:
+    """The element collecting the most paragraph score, Readability-style"""
+    scores: Dict[int, float] = {}
+    nodes: Dict[int, Tag] = {}
+    for paragraph in body.find_all(["p", "pre", "td", "blockquote"]):
+        text = _text(paragraph)
+        if len(text) < MIN_PARAGRAPH_CHARS:
+            continue
+        score = 1 + text.count(",") + min(len(text) // 100, 3)
+        parent = paragraph.parent
+        grandparent = parent.parent if parent is not None else None
+        for node, share in ((parent, 1.0), (grandparent, 0.5)):
+            if isinstance(node, Tag):
+                nodes[id(node)] = node
+                scores[id(node)] = scores.get(id(node), 0.0) + score * share
+
+    best, best_score = None, 0.0
+    for key, node in nodes.items():
+        hints = _hints(node)
+        score = scores[key] + (25 if POSITIVE.search(hints) else 0)
+        score *= 1 - _link_density(node, len(_text(node)))
+        if score > best_score:
+            best, best_score = node, score
+    return best
+
+
+def _inside_block(node: Tag, root: Tag) -> bool:
+    for parent in node.parents:
+        if parent is root:
+            return False
+        if parent.name in BLOCK_TAGS:
+            return True
+    return False
+
+
+def _blocks(root: Tag) -> List[str]:
+    """Text of root split at block elements, with headings marked"""
+    blocks = []
+    for node in root.find_all(BLOCK_TAGS):
+        # Nested blocks (a <p> inside an <li>) are emitted by the outermost one
+        if _inside_block(node, root):
+            continue
+        text = node.get_text("\n" if node.name == "pre" else " ")
+        text = text.strip() if node.name == "pre" else _WHITESPACE.sub(" ", text).strip()
+        if not text:
+            continue
+        if node.name in HEADINGS:
+            text = f"## {text}"
+        elif node.name == "li":
+            text = f"- {text}"
+        blocks.append(text)
+
+    if not blocks:
+        text = _text(root)
+        if text:
+            blocks.append(text)
+    else:
+        # Text sitting directly in the container (no <p>) would otherwise be lost
+        loose = " ".join(
+            s.strip() for s in root.find_all(string=True, recursive=False)
+            if isinstance(s, NavigableString) and s.strip()
+        )
+        if len(loose) >= MIN_PARAGRAPH_CHARS:
+            blocks.insert(0, _WHITESPACE.sub(" ", loose))
+    return blocks
+
+
+def truncate(text: str, max_chars: int) -> str:
+    """Cut text at a word boundary, marking that it was cut"""
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind(" ", 0, max_chars)
+    return text[:cut if cut > max_chars // 2 else max_chars].rstrip() + "... [truncated]"
+
+
+def extract_main_text(html: str, max_chars: int = MAX_CHARS) -> str:
+    """The readable main content of an HTML page as plain text, prefixed by its title"""
+    soup = BeautifulSoup(html, "html.parser")
+    title = _text(soup.title) if soup.title else ""
+    _strip_boilerplate(soup)
+    body = soup.body or soup
+
+    landmarks = [
+        (len(_text(tag)), tag)
+        for tag in body.find_all(LANDMARKS) + body.find_all(attrs={"role": "main"})
+    ]
+    landmarks = [item for item in landmarks if item[0] >= MIN_LANDMARK_CHARS]
+    if landmarks:
+        root = max(landmarks, key=lambda item: item[0])[1]
+    else:
+        root = _best_candidate(body) or body
+
+    blocks = _blocks(root)
+    # Titles usually repeat the headline plus the site name
+    if title and not (blocks and blocks[0].lstrip("#- ") in title):
+        blocks.insert(0, f"# {title}")
+    return truncate("\n".join(blocks), max_chars)
+
+
+def strip_tags(html: str, max_chars: int = MAX_CHARS) -> str:
+    """The previous fetch_url extraction: drop scripts and styles, strip every tag, keep the first max_chars"""
+    content = re.sub(r'<(script|style)[^>]*>.*?</\1>', '', html, flags=re.DOTALL | re.IGNORECASE)
+    content = re.sub(r'<[^>]+>', '', content)
+    content = re.sub(r'\s+', ' ', content).strip()
+    if len(content) > max_chars:
+        content = content[:max_chars] + "... [truncated]"
+    return content
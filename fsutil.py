@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Crash- and concurrency-safe file helpers
+Writes go to a temp file in the target directory that is atomically renamed
+into place, so readers (e.g. serve.py) never see a half-written file, and an
+advisory lock serializes read-modify-write updates across processes
+"""
+
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def _temp_path(path: Path) -> str:
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+    return tmp_path
+
+
+def atomic_write_bytes(path, data: bytes, copystat_from=None) -> None:
+    """Atomically replace path with data, optionally copying another file's mtime/permissions"""
+    path = Path(path)
+    tmp_path = _temp_path(path)
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        if copystat_from is not None:
+            shutil.copystat(copystat_from, tmp_path)
+        else:
+            os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def atomic_write_text(path, text: str, copystat_from=None) -> None:
+    """Atomically replace path with UTF-8 text"""
+    atomic_write_bytes(path, text.encode("utf-8"), copystat_from=copystat_from)
+
+
+def atomic_copy(source, target) -> None:
+    """Copy source (with its metadata) to target, exposing target only once complete"""
+    target = Path(target)
+    tmp_path = _temp_path(target)
+    try:
+        shutil.copy2(source, tmp_path)
+        os.replace(tmp_path, target)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+@contextmanager
+def file_lock(path):
+    """Hold an exclusive advisory lock on path (created if missing) for the with block"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after ~10 seconds; keep waiting
+                    continue
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
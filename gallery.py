@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Gallery index pages for published debates
+Renders the manifest into fixed-size, chronologically stable pages plus
+per-model and per-month shards, and a small summary.json for the landing page
+"""
+
+import html
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from assets import stylesheet_link
+from fsutil import atomic_write_text
+
+PAGE_SIZE = 50
+SUMMARY_FILE = "summary.json"
+
+# Gallery styles are scoped under body.gallery because they share one bundle
+# with the debate page styles (DEBATE_CSS), which set global body/* rules
+GALLERY_CSS = """
+        body.gallery {
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
+            line-height: 1.6;
+            max-width: 900px;
+            min-height: 0;
+            margin: 0 auto;
+            padding: 30px;
+            background: #f5f7fa;
+            color: #333;
+        }
+        .gallery h1 {
+            color: #333;
+            text-align: center;
+            margin: 0.67em 0 30px;
+            border-bottom: 2px solid #667eea;
+            padding-bottom: 10px;
+        }
+        .gallery ul {
+            list-style-type: none;
+            padding: 0;
+        }
+        .gallery li {
+            margin: 15px 0;
+            padding: 15px;
+            border: 1px solid #ddd;
+            border-radius: 8px;
+            background-color: white;
+            box-shadow: 0 2px 5px rgba(0,0,0,0.05);
+            transition: transform 0.2s, box-shadow 0.2s;
+        }
+        .gallery li:hover {
+            transform: translateY(-3px);
+            box-shadow: 0 5px 15px rgba(0,0,0,0.1);
+        }
+        .gallery a {
+            color: #667eea;
+            text-decoration: none;
+            font-weight: bold;
+            font-size: 1.1em;
+        }
+        .gallery a:hover {
+            text-decoration: underline;
+        }
+        .gallery .date {
+            color: #666;
+            font-size: 0.9em;
+            display: block;
+            margin-top: 5px;
+        }
+        .gallery .model, .gallery .turns {
+            display: inline-block;
+            font-size: 0.8em;
+            background-color: #e2e8f0;
+            padding: 2px 8px;
+            border-radius: 4px;
+            margin-left: 8px;
+        }
+        .gallery nav {
+            text-align: center;
+            margin: 15px 0;
+        }
+        .gallery nav a {
+            display: inline-block;
+            font-size: 0.9em;
+            margin: 2px 6px;
+        }
+        .gallery .count {
+            color: #666;
+            font-size: 0.8em;
+        }
+        .gallery footer {
+            text-align: center;
+            margin-top: 30px;
+            padding-top: 20px;
+            border-top: 1px solid #ddd;
+            color: #666;
+            font-size: 0.9em;
+        }
+"""
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}</title>
+    {stylesheet}
+</head>
+<body class="gallery">
+    <h1>{heading}</h1>
+    {nav}
+    <ul id="debate-list">
+{entries}
+    </ul>
+    {pager}
+    <footer>
+        Generated with the arguing-opus tool
+    </footer>
+</body>
+</html>"""
+
+# A listing is the main index or one shard: ("all", None), ("model", name) or ("month", "YYYY-MM")
+Listing = Tuple[str, Optional[str]]
+MAIN_LISTING: Listing = ("all", None)
+
+
+def slugify(value: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', value.lower()).strip('-') or "unknown"
+
+
+def entry_model(entry: Dict[str, Any]) -> str:
+    return entry.get("model") or "unknown"
+
+
+def entry_month(entry: Dict[str, Any]) -> str:
+    if not entry.get("published"):
+        return "undated"
+    return datetime.fromtimestamp(entry["published"]).strftime("%Y-%m")
+
+
+def listings_for(entry: Dict[str, Any]) -> List[Listing]:
+    """Return the listings an entry appears in"""
+    return [MAIN_LISTING, ("model", entry_model(entry)), ("month", entry_month(entry))]
+
+
+def listing_prefix(listing: Listing) -> str:
+    kind, value = listing
+    if kind == "all":
+        return "page"
+    return f"{kind}-{slugify(value)}"
+
+
+def listing_head(listing: Listing) -> str:
+    """File name of the page showing a listing's newest debates"""
+    if listing == MAIN_LISTING:
+        return "index.html"
+    return f"{listing_prefix(listing)}.html"
+
+
+def listing_page(listing: Listing, number: int) -> str:
+    """File name of archive page number (1 = oldest) of a listing"""
+    return f"{listing_prefix(listing)}-{number}.html"
+
+
+def listing_heading(listing: Listing) -> str:
+    kind, value = listing
+    if kind == "model":
+        return f"Debates by {html.escape(value)}"
+    if kind == "month":
+        return f"Debates from {html.escape(value)}"
+    return "Published Debates"
+
+
+def chronological(entries: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Oldest first, ties broken by file name; archive pages are fixed slices of this order"""
+    return sorted(entries, key=lambda e: (e.get("published") or 0, e["file"]))
+
+
+def render_entry(entry: Dict[str, Any]) -> str:
+    """Render one <li> of a gallery page"""
+    model_tag = f'<span class="model">{html.escape(entry["model"])}</span>' if entry.get("model") else ""
+    turns_info = f'<span class="turns">{entry["turns"]} turns</span>' if entry.get("turns") is not None else ""
+    date = datetime.fromtimestamp(entry["published"]).strftime("%Y-%m-%d %H:%M") if entry.get("published") else "unknown"
+    return (f'        <li><a href="{entry["file"]}">{html.escape(entry["title"])}</a>{model_tag} {turns_info}'
+            f'<span class="date">Published: {date}</span></li>')
+
+
+def render_page(title: str, heading: str, entries: List[Dict[str, Any]], stylesheet_href: str,
+                nav: str = "", pager: str = "") -> str:
+    """Render a gallery page listing entries in the given order"""
+    return PAGE_TEMPLATE.format(
+        title=title,
+        heading=heading,
+        stylesheet=stylesheet_link(stylesheet_href),
+        nav=nav,
+        entries="\n".join(render_entry(entry) for entry in entries),
+        pager=pager,
+    )
+
+
+def render_shard_nav(summary: Dict[str, Any]) -> str:
+    """Links from the landing page to every model and month shard"""
+    models = "".join(
+        f'<a href="{listing_head(("model", model))}">{html.escape(model)} <span class="count">({count})</span></a>'
+        for model, count in sorted(summary["models"].items())
+    )
+    months = "".join(
+        f'<a href="{listing_head(("month", month))}">{month} <span class="count">({count})</span></a>'
+        for month, count in sorted(summary["months"].items(), reverse=True)
+    )
+    return f'<nav class="shards">{models}</nav>\n    <nav class="shards">{months}</nav>'
+
+
+def render_archive_links(listing: Listing, page_count: int) -> str:
+    """Links from a listing's head page to its archive pages, newest first"""
+    if page_count <= 1:
+        return ""
+    links = "".join(
+        f'<a href="{listing_page(listing, number)}">Page {number}</a>'
+        for number in range(page_count, 0, -1)
+    )
+    return f'<nav class="pager">Archive: {links}</nav>'
+
+
+def render_pager(listing: Listing, number: int, page_count: int) -> str:
+    """Newer/older links on an archive page"""
+    links = [f'<a href="{listing_head(listing)}">Latest</a>']
+    if number < page_count:
+        links.append(f'<a href="{listing_page(listing, number + 1)}">← Newer</a>')
+    if number > 1:
+        links.append(f'<a href="{listing_page(listing, number - 1)}">Older →</a>')
+    if listing != MAIN_LISTING:
+        links.append('<a href="index.html">All debates</a>')
+    return f'<nav class="pager">{"".join(links)}</nav>'
+
+
+def build_summary(entries: List[Dict[str, Any]], page_size: int) -> Dict[str, Any]:
+    """Counts per model and month plus the newest entries, for the landing page and dashboards"""
+    models: Dict[str, int] = {}
+    months: Dict[str, int] = {}
+    for entry in entries:
+        models[entry_model(entry)] = models.get(entry_model(entry), 0) + 1
+        months[entry_month(entry)] = months.get(entry_month(entry), 0) + 1
+    newest = chronological(entries)[-page_size:][::-1]
+    return {
+        "total": len(entries),
+        "page_size": page_size,
+        "pages": -(-len(entries) // page_size),
+        "models": models,
+        "months": months,
+        "latest": [
+            {key: entry.get(key) for key in ("file", "title", "model", "turns", "published")}
+            for entry in newest
+        ],
+    }
+
+
+def write_if_changed(path, content: str) -> bool:
+    """Write content to path unless it already holds exactly that; returns True if written"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            if f.read() == content:
+                return False
+    except FileNotFoundError:
+        pass
+    atomic_write_text(path, content)
+    return True
+
+
+def write_listing(published_dir: Path, listing: Listing, entries: List[Dict[str, Any]], stylesheet_href: str,
+                  summary: Dict[str, Any], page_size: int, changed_files: Optional[Set[str]],
+                  added: int = 0) -> int:
+    """Write a listing's head page and the archive pages affected by changed_files.
+    
+    entries must be in chronological order; added of them are new to the
+    listing. With changed_files=None every archive page is written. Returns
+    the number of files written.
+    """
+    page_count = max(1, -(-len(entries) // page_size))
+    if changed_files is None:
+        first_page = 1
+    else:
+        positions = [i for i, entry in enumerate(entries) if entry["file"] in changed_files]
+        # Pages before the earliest changed entry keep the same slice of debates
+        first_page = positions[0] // page_size + 1 if positions else page_count
+        # ...except the old last page, which gains a "Newer" link when a page is added
+        previous_page_count = max(1, -(-(len(entries) - added) // page_size))
+        first_page = min(first_page, previous_page_count)
+    
+    heading = listing_heading(listing)
+    title = re.sub(r'<[^>]+>', '', heading)
+    written = 0
+    for number in range(first_page, page_count + 1):
+        page_entries = entries[(number - 1) * page_size:number * page_size][::-1]
+        content = render_page(f"{title} (page {number})", f"{heading} <span class=\"count\">page {number}</span>",
+                              page_entries, stylesheet_href, pager=render_pager(listing, number, page_count))
+        written += write_if_changed(published_dir / listing_page(listing, number), content)
+    
+    nav = render_shard_nav(summary) if listing == MAIN_LISTING else '<nav class="pager"><a href="index.html">All debates</a></nav>'
+    head = render_page(title, heading, entries[-page_size:][::-1], stylesheet_href,
+                       nav=nav, pager=render_archive_links(listing, page_count))
+    written += write_if_changed(published_dir / listing_head(listing), head)
+    return written
+
+
+def write_gallery(published_dir, entries: Iterable[Dict[str, Any]], stylesheet_href: str,
+                  changed: Optional[Iterable[Tuple[Optional[Dict[str, Any]], Dict[str, Any]]]] = None,
+                  page_size: int = PAGE_SIZE) -> int:
+    """Write the gallery pages for the manifest entries.
+    
+    changed lists (old_entry, new_entry) pairs for debates added or updated
+    since the last write; only the listings they belong to (before and after
+    the update) are rewritten. Pass changed=None to rebuild every page.
+    Returns the number of files written.
+    """
+    published_dir = Path(published_dir)
+    entries = chronological(entries)
+    summary = build_summary(entries, page_size)
+    
+    # Maps each listing to rewrite to the files that changed in it (None = rewrite every page)
+    touched: Dict[Listing, Optional[Set[str]]] = {}
+    # Entries new to each listing, which can add archive pages to it
+    added: Dict[Listing, int] = {}
+    if changed is None or not (published_dir / SUMMARY_FILE).exists():
+        for entry in entries:
+            for listing in listings_for(entry):
+                touched[listing] = None
+        touched[MAIN_LISTING] = None
+    else:
+        for old_entry, new_entry in changed:
+            new_listings = listings_for(new_entry)
+            old_listings = listings_for(old_entry) if old_entry is not None else []
+            for listing in new_listings:
+                files = touched.setdefault(listing, set())
+                if files is not None:
+                    files.add(new_entry["file"])
+                if listing not in old_listings:
+                    added[listing] = added.get(listing, 0) + 1
+            if old_entry is not None:
+                # Leaving a listing shifts every later page of it
+                for listing in listings_for(old_entry):
+                    if listing not in new_listings:
+                        touched[listing] = None
+        if not touched:
+            return 0
+    
+    by_listing: Dict[Listing, List[Dict[str, Any]]] = {listing: [] for listing in touched}
+    for entry in entries:
+        for listing in listings_for(entry):
+            if listing in by_listing:
+                by_listing[listing].append(entry)
+    
+    written = 0
+    for listing in sorted(touched, key=lambda l: (l[0], l[1] or "")):
+        written += write_listing(published_dir, listing, by_listing[listing], stylesheet_href,
+                                 summary, page_size, touched[listing], added.get(listing, 0))
+    
+    written += write_if_changed(published_dir / SUMMARY_FILE, json.dumps(summary, indent=2, sort_keys=True))
+    return written
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Per-host health tracking for web fetches
+A circuit breaker per host fails fetches fast once a host has failed several
+times in a row, then lets a single probe through after a cool-down. URLs that
+just failed are remembered for a short TTL, and each host gets a limited
+number of concurrent fetches
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlparse
+
+FAILURE_THRESHOLD = 3
+OPEN_SECONDS = 60.0
+NEGATIVE_TTL = 120.0
+MAX_PER_HOST = 2
+
+# These concern the page, not the host: the rest of the site may be fine
+URL_ONLY_STATUSES = {404, 410}
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+
+class HostUnavailable(Exception):
+    """A fetch was refused without a request because the host or URL recently failed"""
+
+
+class _Host:
+    __slots__ = ("state", "failures", "opened_at", "probing", "requests", "errors", "rejected", "semaphore")
+
+    def __init__(self, max_concurrent: int):
+        self.state = CLOSED
+        self.failures = 0  # consecutive
+        self.opened_at = 0.0
+        self.probing = False
+        self.requests = 0
+        self.errors = 0
+        self.rejected = 0
+        self.semaphore = threading.BoundedSemaphore(max_concurrent)
+
+
+def host_of(url: str) -> str:
+    return (urlparse(url).hostname or "").lower()
+
+
+class HostHealth:
+    """Circuit breakers, a negative cache and concurrency limits, keyed by host"""
+
+    def __init__(self, failure_threshold: int = FAILURE_THRESHOLD, open_seconds: float = OPEN_SECONDS,
+                 negative_ttl: float = NEGATIVE_TTL, max_per_host: int = MAX_PER_HOST,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.negative_ttl = negative_ttl
+        self.max_per_host = max_per_host
+        self.clock = clock
+        self._hosts: Dict[str, _Host] = {}
+        self._failed_urls: Dict[str, float] = {}  # url -> expiry
+        self.negative_hits = 0
+        self._lock = threading.Lock()
+
+    def _host(self, host: str) -> _Host:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _Host(self.max_per_host)
+        return state
+
+    def _refusal(self, url: str, host: _Host, now: float) -> Optional[str]:
+        expiry = self._failed_urls.get(url)
+        if expiry is not None:
+            if now < expiry:
+                return f"it failed {self.negative_ttl - (expiry - now):.0f}s ago"
+            del self._failed_urls[url]
+        if host.state == OPEN and now - host.opened_at < self.open_seconds:
+            retry = self.open_seconds - (now - host.opened_at)
+            return f"{host_of(url)} failed {host.failures} times in a row; retrying it in {retry:.0f}s"
+        if host.state == HALF_OPEN and host.probing:
+            return f"{host_of(url)} is being retried by another fetch"
+        return None
+
+    def available(self, url: str) -> bool:
+        """Whether a fetch of url would be let through; changes no state"""
+        with self._lock:
+            return self._refusal(url, self._host(host_of(url)), self.clock()) is None
+
+    def check(self, url: str) -> None:
+        """Raise HostUnavailable unless url may be fetched now
+
+        After the cool-down, the first caller becomes the half-open probe
+        whose result closes or reopens the breaker.
+        """
+        with self._lock:
+            host = self._host(host_of(url))
+            reason = self._refusal(url, host, self.clock())
+            if reason is not None:
+                host.rejected += 1
+                if url in self._failed_urls:
+                    self.negative_hits += 1
+                raise HostUnavailable(f"skipped, {reason}")
+            if host.state == OPEN:
+                host.state = HALF_OPEN
+            if host.state == HALF_OPEN:
+                host.probing = True
+            host.requests += 1
+
+    @contextmanager
+    def slot(self, url: str):
+        """Hold one of the host's concurrent fetch slots"""
+        with self._lock:
+            semaphore = self._host(host_of(url)).semaphore
+        with semaphore:
+            yield
+
+    def release_probe(self, url: str) -> None:
+        """Let another fetch probe the host; for fetches that ended without a recordable result"""
+        with self._lock:
+            self._host(host_of(url)).probing = False
+
+    def record_success(self, url: str) -> None:
+        with self._lock:
+            host = self._host(host_of(url))
+            host.state, host.failures, host.probing = CLOSED, 0, False
+
+    def record_failure(self, url: str, status: Optional[int] = None) -> None:
+        """Note a failed fetch; status is the HTTP status if a response came back"""
+        with self._lock:
+            now = self.clock()
+            host = self._host(host_of(url))
+            host.errors += 1
+            self._failed_urls[url] = now + self.negative_ttl
+            if status in URL_ONLY_STATUSES:
+                host.probing = False
+                return
+            host.failures += 1
+            if host.state == HALF_OPEN or host.failures >= self.failure_threshold:
+                host.state, host.opened_at = OPEN, now
+            host.probing = False
+
+    def telemetry(self) -> Dict[str, Any]:
+        with self._lock:
+            now = self.clock()
+            self._failed_urls = {url: expiry for url, expiry in self._failed_urls.items() if expiry > now}
+            return {
+                "negative_cache": {"entries": len(self._failed_urls), "hits": self.negative_hits},
+                "hosts": {
+                    name: {"state": host.state, "requests": host.requests, "errors": host.errors,
+                           "rejected": host.rejected, "consecutive_failures": host.failures}
+                    for name, host in sorted(self._hosts.items())
+                    if host.requests or host.rejected
+                },
+            }
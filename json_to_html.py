@@ -6,19 +6,36 @@ Converts debate JSON files into well-formatted HTML pages
 
 import json
 import argparse
+import hashlib
 import os
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, Any, List
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
 import re
-import markdown
 
+import assets
+from assets import minify_html, stylesheet_link
+from fsutil import atomic_write_text
+from profiling import add_profile_arguments, phase, start_from_args
 
-class DebateHTMLGenerator:
-    """Converts debate JSON files to HTML format"""
-    
-    def __init__(self):
-        self.css_template = """
-        <style>
+
+# Bump whenever process_message_content (or the markdown extensions it uses)
+# changes its output, so cached fragments from older renderers are ignored.
+RENDERER_VERSION = "2"
+MARKDOWN_EXTENSIONS = ['nl2br', 'codehilite', 'fenced_code']
+DEFAULT_CACHE_DIR = ".render_cache"
+
+# Placeholder delimiter for search/fetch blocks while markdown runs; plain
+# letters so no markdown syntax can alter it
+BLOCK_TOKEN = "qzblockqz"
+_BLOCK_PATTERN = re.compile(rf'(<p>)?{BLOCK_TOKEN}(\d+){BLOCK_TOKEN}(</p>)?')
+
+# Lazy mode: turns rendered into the main page, and turns per fragment page after that
+DEFAULT_INLINE_TURNS = 4
+DEFAULT_CHUNK_TURNS = 10
+
+DEBATE_CSS = """
             * {
                 margin: 0;
                 padding: 0;
@@ -114,6 +131,26 @@ class DebateHTMLGenerator:
                 border-left: 5px solid #4caf50;
             }
             
+            .claude-3 {
+                background: linear-gradient(135deg, #fff3e0 0%, #fbe9e7 100%);
+                border-left: 5px solid #ff9800;
+            }
+            
+            .claude-4 {
+                background: linear-gradient(135deg, #f3e5f5 0%, #ede7f6 100%);
+                border-left: 5px solid #9c27b0;
+            }
+            
+            .claude-5 {
+                background: linear-gradient(135deg, #e0f7fa 0%, #e8f5e9 100%);
+                border-left: 5px solid #00bcd4;
+            }
+            
+            .claude-6 {
+                background: linear-gradient(135deg, #ffebee 0%, #fce4ec 100%);
+                border-left: 5px solid #f44336;
+            }
+            
             .message-header {
                 display: flex;
                 justify-content: space-between;
@@ -142,6 +179,22 @@ class DebateHTMLGenerator:
                 color: #388e3c;
             }
             
+            .claude-3 .participant {
+                color: #e65100;
+            }
+            
+            .claude-4 .participant {
+                color: #6a1b9a;
+            }
+            
+            .claude-5 .participant {
+                color: #00838f;
+            }
+            
+            .claude-6 .participant {
+                color: #c62828;
+            }
+            
             .timestamp {
                 color: #666;
                 font-size: 0.9em;
@@ -320,6 +373,17 @@ class DebateHTMLGenerator:
                 margin-bottom: 10px;
             }
             
+            .lazy-turns {
+                padding: 25px 30px;
+                text-align: center;
+            }
+            
+            .lazy-more {
+                color: #667eea;
+                font-weight: 600;
+                text-decoration: none;
+            }
+            
             @media (max-width: 768px) {
                 body {
                     padding: 10px;
@@ -343,8 +407,138 @@ class DebateHTMLGenerator:
                     gap: 10px;
                 }
             }
-        </style>
         """
+
+# Appends fragment pages to the main page as the reader nears the "continue"
+# link. Without JavaScript (or fetch, e.g. over file://) the link still works.
+LAZY_LOAD_SCRIPT = """
+    <script>
+    (function () {
+        var link = document.querySelector('.lazy-more');
+        if (!link || !('IntersectionObserver' in window) || !window.fetch) return;
+        var content = document.querySelector('.debate-content');
+        var loading = false;
+        var observer = new IntersectionObserver(function (entries) {
+            if (entries.some(function (e) { return e.isIntersecting; })) load();
+        }, { rootMargin: '800px 0px' });
+        function load() {
+            if (loading) return;
+            loading = true;
+            fetch(link.href).then(function (response) {
+                if (!response.ok) throw new Error(response.status);
+                return response.text();
+            }).then(function (text) {
+                var doc = new DOMParser().parseFromString(text, 'text/html');
+                var holder = link.parentNode;
+                doc.querySelectorAll('.debate-content > .message').forEach(function (message) {
+                    content.insertBefore(document.importNode(message, true), holder);
+                });
+                var next = doc.querySelector('.lazy-more');
+                observer.unobserve(link);
+                if (next) {
+                    link.href = next.getAttribute('href');
+                    link.textContent = next.textContent;
+                    observer.observe(link);
+                } else {
+                    holder.remove();
+                }
+                loading = false;
+            }).catch(function () {
+                observer.disconnect();
+            });
+        }
+        observer.observe(link);
+    })();
+    </script>"""
+
+
+class FragmentCache:
+    """Caches rendered message fragments in memory and on disk.
+
+    Entries are keyed on a hash of the raw message content and RENDERER_VERSION,
+    so re-rendering an unchanged debate skips markdown conversion entirely.
+    """
+    
+    def __init__(self, cache_dir: Optional[str] = DEFAULT_CACHE_DIR, max_memory_entries: int = 4096):
+        self.cache_dir = Path(cache_dir) / "fragments" if cache_dir else None
+        self.max_memory_entries = max_memory_entries
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def key_for(content: str) -> str:
+        """Return the cache key for a message body"""
+        digest = hashlib.sha256()
+        digest.update(RENDERER_VERSION.encode('utf-8'))
+        digest.update(b"\0")
+        digest.update(content.encode('utf-8'))
+        return digest.hexdigest()
+    
+    def _path_for(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.html"
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached fragment for key, or None"""
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return self._memory[key]
+        
+        if self.cache_dir is not None:
+            try:
+                fragment = self._path_for(key).read_text(encoding='utf-8')
+            except OSError:
+                fragment = None
+            if fragment is not None:
+                self._remember(key, fragment)
+                self.hits += 1
+                return fragment
+        
+        self.misses += 1
+        return None
+    
+    def put(self, key: str, fragment: str) -> None:
+        """Store a rendered fragment"""
+        self._remember(key, fragment)
+        if self.cache_dir is None:
+            return
+        path = self._path_for(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Concurrent renderers must never read a partial entry
+            atomic_write_text(path, fragment)
+        except OSError:
+            # The disk cache is only an optimization
+            pass
+    
+    def _remember(self, key: str, fragment: str) -> None:
+        self._memory[key] = fragment
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+
+class DebateHTMLGenerator:
+    """Converts debate JSON files to HTML format"""
+    
+    def __init__(self, fragment_cache: Optional[FragmentCache] = None,
+                 stylesheet_href: Optional[str] = None, minify: bool = False):
+        self.fragment_cache = fragment_cache
+        # When set, pages link to a shared stylesheet (see assets.py) instead of inlining DEBATE_CSS
+        self.stylesheet_href = stylesheet_href
+        self.minify = minify
+        # One Markdown engine per generator, reset between messages; building a
+        # new instance (and its extensions) per message dominates render time.
+        # Built on first use, so fully cached renders never import markdown.
+        self._markdown = None
+        self.css_template = f"\n        <style>{DEBATE_CSS}</style>\n        "
+    
+    def head_styles(self) -> str:
+        """Return the inline stylesheet, or a link to the shared one"""
+        if self.stylesheet_href:
+            return stylesheet_link(self.stylesheet_href)
+        return self.css_template
     
     def format_timestamp(self, timestamp: float) -> str:
         """Format Unix timestamp to readable date/time"""
@@ -367,49 +561,90 @@ class DebateHTMLGenerator:
     
     def process_message_content(self, content: str) -> str:
         """Process message content to format search results and convert markdown"""
-        # First, extract and temporarily replace search results and fetched content
-        search_results = []
-        fetched_contents = []
+        if self.fragment_cache is None:
+            return self._render_message_content(content)
         
-        # Extract search results
+        key = self.fragment_cache.key_for(content)
+        html_content = self.fragment_cache.get(key)
+        if html_content is None:
+            html_content = self._render_message_content(content)
+            self.fragment_cache.put(key, html_content)
+        return html_content
+    
+    def _render_message_content(self, content: str) -> str:
+        """Render message content without consulting the fragment cache"""
+        # First, extract search results and fetched content, leaving placeholder
+        # tokens that markdown passes through untouched (an underscore-wrapped
+        # token would be rendered as bold and never restored)
+        blocks = []
+        
+        # Extract search results, keeping them as plain text with line breaks
         search_pattern = r'\[Search Results for \'([^\']+)\':\n([^\]]+)\]'
         def replace_search(match):
-            search_results.append((match.group(1), match.group(2)))
-            return f"__SEARCH_RESULT_{len(search_results)-1}__"
+            formatted_results = match.group(2).replace('\n', '<br>')
+            blocks.append(f'<div class="search-results"><h4>🔍 Search Results for "{match.group(1)}"</h4>{formatted_results}</div>')
+            return f"{BLOCK_TOKEN}{len(blocks)-1}{BLOCK_TOKEN}"
         content = re.sub(search_pattern, replace_search, content, flags=re.DOTALL)
         
-        # Extract fetched content
+        # Extract fetched content, keeping it as plain text with line breaks
         fetch_pattern = r'\[Fetched Content:\n([^\]]+)\]'
         def replace_fetch(match):
-            fetched_contents.append(match.group(1))
-            return f"__FETCHED_CONTENT_{len(fetched_contents)-1}__"
+            formatted_content = match.group(1).replace('\n', '<br>')
+            blocks.append(f'<div class="fetched-content"><h4>🌐 Fetched Content</h4>{formatted_content}</div>')
+            return f"{BLOCK_TOKEN}{len(blocks)-1}{BLOCK_TOKEN}"
         content = re.sub(fetch_pattern, replace_fetch, content, flags=re.DOTALL)
         
         # Convert markdown to HTML
-        html_content = markdown.markdown(content, extensions=['nl2br', 'codehilite', 'fenced_code'])
-        
-        # Restore search results with proper formatting (preserve original simple format)
-        for i, (query, results) in enumerate(search_results):
-            # Keep search results as plain text with line breaks
-            formatted_results = results.replace('\n', '<br>')
-            search_html = f'<div class="search-results"><h4>🔍 Search Results for "{query}"</h4>{formatted_results}</div>'
-            html_content = html_content.replace(f"__SEARCH_RESULT_{i}__", search_html)
-        
-        # Restore fetched content with proper formatting (preserve original simple format)
-        for i, content_text in enumerate(fetched_contents):
-            # Keep fetched content as plain text with line breaks
-            formatted_content = content_text.replace('\n', '<br>')
-            fetch_html = f'<div class="fetched-content"><h4>🌐 Fetched Content</h4>{formatted_content}</div>'
-            html_content = html_content.replace(f"__FETCHED_CONTENT_{i}__", fetch_html)
+        with phase("markdown"):
+            html_content = self.markdown_engine().reset().convert(content)
+        if not blocks:
+            return html_content
         
-        return html_content
+        # Restore every block in one pass; a block that was its own paragraph
+        # replaces the <p> around it rather than nesting a <div> inside it
+        def restore(match):
+            block = blocks[int(match.group(2))]
+            if match.group(1) and match.group(3):
+                return block
+            return (match.group(1) or '') + block + (match.group(3) or '')
+        return _BLOCK_PATTERN.sub(restore, html_content)
+    
+    def markdown_engine(self):
+        """The generator's Markdown instance, importing markdown on first use"""
+        if self._markdown is None:
+            import markdown
+            self._markdown = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+        return self._markdown
+    
+    @staticmethod
+    def participant_name(participant: str) -> str:
+        """claude_3 -> Claude 3"""
+        return f"Claude {participant.rsplit('_', 1)[-1]}"
+    
+    @staticmethod
+    def end_reason_html(metadata: Dict[str, Any]) -> str:
+        """Why the debate ended, for debates that recorded it"""
+        reason = metadata.get('end_reason')
+        if reason == 'converged':
+            turn = (metadata.get('convergence') or {}).get('converged_at_turn')
+            text = f"Converged at turn {turn}" if turn else "Converged"
+        elif reason == 'max_turns':
+            text = "Turn limit"
+        elif reason:
+            text = str(reason)
+        else:
+            return ""
+        return f'''
+            <div class="metadata-item">
+                <div class="metadata-label">Ended</div>
+                <div class="metadata-value">{text}</div>
+            </div>'''
     
-    def extract_positions(self, conversation: List[Dict]) -> tuple:
-        """Extract the positions taken by each Claude"""
-        claude_1_position = "Position not clearly stated"
-        claude_2_position = "Position not clearly stated"
+    def extract_positions(self, conversation: List[Dict], participants: int = 2) -> Dict[str, str]:
+        """Extract the position each Claude took in their opening message"""
+        positions = {f"claude_{n}": "Position not clearly stated" for n in range(1, participants + 1)}
         
-        for msg in conversation[:2]:  # Look at first two messages
+        for msg in conversation[:participants]:  # Look at the opening messages
             content_lower = msg['content'].lower()
             participant = msg['participant']
             
@@ -418,71 +653,117 @@ class DebateHTMLGenerator:
                 lines = msg['content'].split('\n')
                 for line in lines[:5]:
                     if any(phrase in line.lower() for phrase in ['argue', 'believe', 'position', 'contend']):
-                        position = line.strip()[:100]
-                        if participant == 'claude_1':
-                            claude_1_position = position
-                        else:
-                            claude_2_position = position
+                        positions[participant] = line.strip()[:100]
                         break
         
-        return claude_1_position, claude_2_position
+        return positions
     
     def generate_html(self, debate_data: Dict[str, Any]) -> str:
         """Generate complete HTML from debate JSON data"""
+        messages_html = "".join(
+            self.render_message(i, msg) for i, msg in enumerate(debate_data['conversation'], 1)
+        )
+        return self._render_page(debate_data, messages_html)
+    
+    def generate_lazy_html(self, debate_data: Dict[str, Any], base_name: str,
+                           inline_turns: int = DEFAULT_INLINE_TURNS,
+                           chunk_turns: int = DEFAULT_CHUNK_TURNS) -> Tuple[str, Dict[str, str]]:
+        """Generate a page with only the first turns inline and the rest in fragment pages.
+        
+        Returns (html, parts) where parts maps each fragment filename (placed
+        next to base_name.html) to its HTML. Each fragment is a standalone page
+        linking to the next one, so the chain stays readable without JavaScript;
+        with JavaScript the main page appends fragments as the reader scrolls.
+        """
+        conversation = debate_data['conversation']
+        if len(conversation) <= inline_turns:
+            return self.generate_html(debate_data), {}
+        
+        chunk_turns = max(1, chunk_turns)
+        starts = list(range(inline_turns, len(conversation), chunk_turns))
+        names = [f"{base_name}.part-{k}.html" for k in range(1, len(starts) + 1)]
+        
+        def continue_link(k: int) -> str:
+            if k >= len(starts):
+                return ""
+            first = starts[k] + 1
+            last = min(starts[k] + chunk_turns, len(conversation))
+            return (f'<div class="lazy-turns"><a class="lazy-more" href="{names[k]}">'
+                    f'Continue reading: turns {first}–{last} →</a></div>')
+        
+        parts = {}
+        for k, start in enumerate(starts):
+            messages_html = "".join(
+                self.render_message(i, msg)
+                for i, msg in enumerate(conversation[start:start + chunk_turns], start + 1)
+            )
+            parts[names[k]] = self._render_part_page(debate_data, base_name, messages_html + continue_link(k + 1))
+        
+        inline_html = "".join(
+            self.render_message(i, msg) for i, msg in enumerate(conversation[:inline_turns], 1)
+        )
+        html = self._render_page(debate_data, inline_html + continue_link(0), scripts=LAZY_LOAD_SCRIPT)
+        return html, parts
+    
+    def render_message(self, i: int, msg: Dict[str, Any]) -> str:
+        """Render one turn of the debate"""
+        participant_class = msg['participant'].replace('_', '-')
+        participant_name = self.participant_name(msg['participant'])
+        timestamp = self.format_timestamp(msg['timestamp'])
+        content = self.process_message_content(msg['content'])
+        
+        # Generate search queries section
+        search_queries_html = ""
+        if msg.get('searches') and len(msg['searches']) > 0:
+            search_links = []
+            for search in msg['searches']:
+                if search.get('url'):  # This is a fetch operation
+                    search_links.append(f'<a href="{search["url"]}" class="search-link fetch-link" target="_blank" title="Fetched: {search["url"]}">{search["query"]}</a>')
+                else:  # This is a search operation
+                    # Create Google search URL
+                    search_url = f"https://www.google.com/search?q={search['query'].replace(' ', '+')}"
+                    search_links.append(f'<a href="{search_url}" class="search-link" target="_blank" title="Search: {search["query"]}">{search["query"]}</a>')
+            
+            if search_links:
+                search_queries_html = f'''
+                <div class="search-queries">
+                    <h5>🔍 Web Searches & Fetches</h5>
+                    {''.join(search_links)}
+                </div>
+                '''
+        
+        return f'''
+        <div class="message {participant_class}">
+            <div class="turn-number">Turn {i}</div>
+            <div class="message-header">
+                <div class="participant">{participant_name}</div>
+                <div class="timestamp">{timestamp}</div>
+            </div>
+            {search_queries_html}
+            <div class="message-content">
+                {content}
+            </div>
+        </div>
+        '''
+    
+    def _render_page(self, debate_data: Dict[str, Any], messages_html: str, scripts: str = "") -> str:
+        """Wrap rendered messages in the full debate page"""
         config = debate_data['config']
         conversation = debate_data['conversation']
         metadata = debate_data['metadata']
         
         # Extract positions
-        claude_1_pos, claude_2_pos = self.extract_positions(conversation)
+        positions = self.extract_positions(conversation, config.get('participants', 2))
+        positions_html = "\n            ".join(
+            f"<p><strong>{self.participant_name(participant)}:</strong> {position}</p>"
+            for participant, position in positions.items()
+        )
         
         # Calculate duration
         duration = ""
         if metadata.get('start_time') and metadata.get('end_time'):
             duration = self.format_duration(metadata['start_time'], metadata['end_time'])
         
-        # Generate messages HTML
-        messages_html = ""
-        for i, msg in enumerate(conversation, 1):
-            participant_class = msg['participant'].replace('_', '-')
-            participant_name = f"Claude {msg['participant'][-1]}"
-            timestamp = self.format_timestamp(msg['timestamp'])
-            content = self.process_message_content(msg['content'])
-            
-            # Generate search queries section
-            search_queries_html = ""
-            if msg.get('searches') and len(msg['searches']) > 0:
-                search_links = []
-                for search in msg['searches']:
-                    if search.get('url'):  # This is a fetch operation
-                        search_links.append(f'<a href="{search["url"]}" class="search-link fetch-link" target="_blank" title="Fetched: {search["url"]}">{search["query"]}</a>')
-                    else:  # This is a search operation
-                        # Create Google search URL
-                        search_url = f"https://www.google.com/search?q={search['query'].replace(' ', '+')}"
-                        search_links.append(f'<a href="{search_url}" class="search-link" target="_blank" title="Search: {search["query"]}">{search["query"]}</a>')
-                
-                if search_links:
-                    search_queries_html = f'''
-                    <div class="search-queries">
-                        <h5>🔍 Web Searches & Fetches</h5>
-                        {''.join(search_links)}
-                    </div>
-                    '''
-            
-            messages_html += f'''
-            <div class="message {participant_class}">
-                <div class="turn-number">Turn {i}</div>
-                <div class="message-header">
-                    <div class="participant">{participant_name}</div>
-                    <div class="timestamp">{timestamp}</div>
-                </div>
-                {search_queries_html}
-                <div class="message-content">
-                    {content}
-                </div>
-            </div>
-            '''
-        
         # Generate complete HTML
         html = f'''<!DOCTYPE html>
 <html lang="en">
@@ -490,7 +771,7 @@ class DebateHTMLGenerator:
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Claude Debate: {config['topic']}</title>
-    {self.css_template}
+    {self.head_styles()}
 </head>
 <body>
     <div class="container">
@@ -515,13 +796,12 @@ class DebateHTMLGenerator:
             <div class="metadata-item">
                 <div class="metadata-label">Max Turns</div>
                 <div class="metadata-value">{config.get('max_turns', 'Unknown')}</div>
-            </div>
+            </div>{self.end_reason_html(metadata)}
         </div>
         
         <div class="summary">
             <h3>📊 Debate Positions</h3>
-            <p><strong>Claude 1:</strong> {claude_1_pos}</p>
-            <p><strong>Claude 2:</strong> {claude_2_pos}</p>
+            {positions_html}
         </div>
         
         <div class="debate-content">
@@ -532,19 +812,272 @@ class DebateHTMLGenerator:
             Generated on {datetime.now().strftime("%B %d, %Y at %I:%M:%S %p")} • 
             Claude Debate Tool
         </div>
+    </div>{scripts}
+</body>
+</html>'''
+        
+        if self.minify:
+            html = minify_html(html)
+        return html
+    
+    def _render_part_page(self, debate_data: Dict[str, Any], base_name: str, messages_html: str) -> str:
+        """Render a standalone fragment page holding a chunk of turns"""
+        topic = debate_data['config']['topic']
+        html = f'''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Claude Debate: {topic}</title>
+    {self.head_styles()}
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>🎭 Claude Debate</h1>
+            <div class="topic">"{topic}"</div>
+        </div>
+        
+        <div class="debate-content">
+            {messages_html}
+        </div>
+        
+        <div class="footer">
+            <a href="{base_name}.html">Back to the start of the debate</a>
+        </div>
     </div>
 </body>
 </html>'''
         
+        if self.minify:
+            html = minify_html(html)
         return html
 
 
-def main():
+REQUIRED_KEYS = ['config', 'conversation', 'metadata']
+RENDER_STATE_FILE = ".render-state.json"
+
+# Per-process generator for batch workers, so each worker builds its Markdown
+# engine and fragment cache once rather than once per file
+_worker_generator: Optional[DebateHTMLGenerator] = None
+
+
+def renderer_fingerprint(options: str = "") -> str:
+    """Identify the renderer that produced a page: RENDERER_VERSION, the source of this module and assets.py, and page options"""
+    digest = hashlib.sha256(RENDERER_VERSION.encode('utf-8'))
+    digest.update(Path(__file__).read_bytes())
+    # Pages also depend on assets.minify_html and assets.stylesheet_link
+    digest.update(Path(assets.__file__).read_bytes())
+    digest.update(options.encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def hash_file(path: str) -> str:
+    """Return the SHA-256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def expand_inputs(inputs: List[str]) -> List[str]:
+    """Expand files, directories and glob patterns into a sorted list of JSON files"""
+    import glob
+    
+    found = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            found.update(str(p) for p in Path(item).glob("*.json"))
+        elif any(ch in item for ch in "*?["):
+            found.update(p for p in glob.glob(item, recursive=True) if p.endswith('.json'))
+        else:
+            found.add(item)
+    return sorted(found)
+
+
+def load_render_state(output_dir: str) -> Dict[str, Any]:
+    """Load the incremental render state kept alongside rendered pages"""
+    state_path = os.path.join(output_dir, RENDER_STATE_FILE)
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {"renderer": None, "sources": {}}
+    state.setdefault("sources", {})
+    return state
+
+
+def save_render_state(output_dir: str, state: Dict[str, Any]) -> None:
+    """Persist the incremental render state"""
+    state_path = os.path.join(output_dir, RENDER_STATE_FILE)
+    atomic_write_text(state_path, json.dumps(state, indent=2, sort_keys=True))
+
+
+def _init_worker(cache_dir: Optional[str], stylesheet_href: Optional[str] = None, minify: bool = False) -> None:
+    global _worker_generator
+    fragment_cache = FragmentCache(cache_dir) if cache_dir else None
+    _worker_generator = DebateHTMLGenerator(fragment_cache=fragment_cache,
+                                            stylesheet_href=stylesheet_href, minify=minify)
+
+
+def write_debate(generator: DebateHTMLGenerator, debate_data: Dict[str, Any], output_file: str,
+                 lazy: Optional[Tuple[int, int]] = None) -> List[str]:
+    """Render a debate and write its page (plus fragment pages in lazy mode).
+    
+    lazy is (inline_turns, chunk_turns), or None to render every turn inline.
+    Fragment pages left over from an earlier, longer render are removed.
+    Returns the paths written.
+    """
+    output_dir = os.path.dirname(output_file)
+    base_name = os.path.splitext(os.path.basename(output_file))[0]
+    
+    with phase("template"):
+        if lazy:
+            html_content, parts = generator.generate_lazy_html(debate_data, base_name, *lazy)
+        else:
+            html_content, parts = generator.generate_html(debate_data), {}
+    
+    written = []
+    with phase("write"):
+        for name, part_html in parts.items():
+            part_file = os.path.join(output_dir, name)
+            atomic_write_text(part_file, part_html)
+            written.append(part_file)
+        atomic_write_text(output_file, html_content)
+        written.append(output_file)
+    
+    for stale in Path(output_dir or ".").glob(f"{base_name}.part-*.html"):
+        if stale.name not in parts:
+            stale.unlink()
+    return written
+
+
+def render_file(json_file: str, output_file: str, lazy: Optional[Tuple[int, int]] = None) -> str:
+    """Render one debate JSON file to HTML using this process's generator"""
+    if _worker_generator is None:
+        _init_worker(None)
+    
+    with phase("load"), open(json_file, 'r', encoding='utf-8') as f:
+        debate_data = json.load(f)
+    
+    if not all(key in debate_data for key in REQUIRED_KEYS):
+        raise ValueError(f"Invalid debate JSON format. Missing required keys: {REQUIRED_KEYS}")
+    
+    write_debate(_worker_generator, debate_data, output_file, lazy)
+    return output_file
+
+
+def render_many(json_files: List[str], output_dir: str, jobs: int = 1,
+                cache_dir: Optional[str] = DEFAULT_CACHE_DIR, force: bool = False,
+                stylesheet_href: Optional[str] = None, minify: bool = False,
+                lazy: Optional[Tuple[int, int]] = None) -> Dict[str, Any]:
+    """Render many debate files, skipping those whose source and renderer are unchanged.
+    
+    Returns a summary dict with rendered/skipped/failed counts and throughput.
+    """
+    import time
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    
+    start = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    
+    fingerprint = renderer_fingerprint(f"stylesheet={stylesheet_href or ''};minify={minify};lazy={lazy}")
+    state = load_render_state(output_dir)
+    if state.get("renderer") != fingerprint:
+        state = {"renderer": fingerprint, "sources": {}}
+    
+    rendered = 0
+    failures = []
+    
+    def record(job, error):
+        nonlocal rendered
+        json_file, _, output_name, source_hash = job
+        if error is None:
+            state["sources"][output_name] = source_hash
+            rendered += 1
+        else:
+            state["sources"].pop(output_name, None)
+            failures.append((json_file, error))
+            print(f"❌ {json_file}: {error}")
+    
+    pending = []
+    skipped = 0
+    for json_file in json_files:
+        base_name = os.path.splitext(os.path.basename(json_file))[0]
+        output_name = f"{base_name}.html"
+        output_file = os.path.join(output_dir, output_name)
+        try:
+            source_hash = hash_file(json_file)
+        except OSError as e:
+            # A missing or unreadable input fails on its own, like a render error
+            record((json_file, output_file, output_name, None), e)
+            continue
+        if (not force and state["sources"].get(output_name) == source_hash
+                and os.path.exists(output_file)):
+            skipped += 1
+            continue
+        pending.append((json_file, output_file, output_name, source_hash))
+    
+    if jobs <= 1 or len(pending) <= 1:
+        _init_worker(cache_dir, stylesheet_href, minify)
+        for job in pending:
+            try:
+                render_file(job[0], job[1], lazy)
+                record(job, None)
+            except Exception as e:
+                record(job, e)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(cache_dir, stylesheet_href, minify)) as pool:
+            futures = {pool.submit(render_file, job[0], job[1], lazy): job for job in pending}
+            for future in as_completed(futures):
+                record(futures[future], future.exception())
+    
+    save_render_state(output_dir, state)
+    
+    elapsed = time.perf_counter() - start
+    return {
+        "total": len(json_files),
+        "rendered": rendered,
+        "skipped": skipped,
+        "failed": len(failures),
+        "failures": failures,
+        "elapsed": elapsed,
+        "files_per_second": len(json_files) / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def main(argv: Optional[List[str]] = None):
     parser = argparse.ArgumentParser(description="Convert Claude debate JSON to HTML")
-    parser.add_argument("json_file", help="Path to the debate JSON file")
+    parser.add_argument("json_files", nargs='+', metavar="json_file",
+                        help="Debate JSON file(s); directories and glob patterns render every match")
     parser.add_argument("-o", "--output", help="Output HTML filename (default: same name as JSON with .html extension)")
+    parser.add_argument("--output-dir", default="conversations", help="Output directory in batch mode (default: conversations)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes in batch mode (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Re-render in batch mode even if source and renderer are unchanged")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help=f"Directory for cached message fragments (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--no-cache", action="store_true", help="Render every message from scratch without the fragment cache")
+    parser.add_argument("--stylesheet", metavar="HREF", help="Link to a shared stylesheet (see assets.py) instead of inlining the CSS")
+    parser.add_argument("--minify", action="store_true", help="Minify the generated HTML")
+    parser.add_argument("--lazy", action="store_true", help="Render only the first turns inline and load the rest on scroll from fragment pages")
+    parser.add_argument("--inline-turns", type=int, default=DEFAULT_INLINE_TURNS, help=f"Turns rendered inline in lazy mode (default: {DEFAULT_INLINE_TURNS})")
+    parser.add_argument("--chunk-turns", type=int, default=DEFAULT_CHUNK_TURNS, help=f"Turns per fragment page in lazy mode (default: {DEFAULT_CHUNK_TURNS})")
+    add_profile_arguments(parser)
+    
+    args = parser.parse_args(argv)
+    args.lazy = (args.inline_turns, args.chunk_turns) if args.lazy else None
+    start_from_args(args)
     
-    args = parser.parse_args()
+    batch_mode = len(args.json_files) > 1 or any(
+        os.path.isdir(item) or any(ch in item for ch in "*?[") for item in args.json_files
+    )
+    if batch_mode:
+        if args.output:
+            parser.error("-o/--output only applies to a single input file; use --output-dir")
+        return batch_main(args)
+    
+    args.json_file = args.json_files[0]
     
     # Validate input file
     if not os.path.exists(args.json_file):
@@ -568,25 +1101,28 @@ def main():
     try:
         # Load JSON data
         print(f"📖 Loading debate data from {args.json_file}")
-        with open(args.json_file, 'r', encoding='utf-8') as f:
+        with phase("load"), open(args.json_file, 'r', encoding='utf-8') as f:
             debate_data = json.load(f)
         
         # Validate JSON structure
-        required_keys = ['config', 'conversation', 'metadata']
-        if not all(key in debate_data for key in required_keys):
-            print(f"❌ Error: Invalid debate JSON format. Missing required keys: {required_keys}")
+        if not all(key in debate_data for key in REQUIRED_KEYS):
+            print(f"❌ Error: Invalid debate JSON format. Missing required keys: {REQUIRED_KEYS}")
             return 1
         
         # Generate HTML
         print(f"🎨 Generating HTML...")
-        generator = DebateHTMLGenerator()
-        html_content = generator.generate_html(debate_data)
+        fragment_cache = None if args.no_cache else FragmentCache(args.cache_dir)
+        generator = DebateHTMLGenerator(fragment_cache=fragment_cache,
+                                        stylesheet_href=args.stylesheet, minify=args.minify)
         
-        # Write HTML file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        # Write HTML file (and fragment pages in lazy mode)
+        written = write_debate(generator, debate_data, output_file, args.lazy)
         
         print(f"✅ HTML generated successfully: {output_file}")
+        if len(written) > 1:
+            print(f"🧩 Deferred turns split into {len(written) - 1} fragment page(s)")
+        if fragment_cache is not None:
+            print(f"🗃️  Fragment cache: {fragment_cache.hits} hits, {fragment_cache.misses} misses")
         print(f"🌐 Open in browser: file://{os.path.abspath(output_file)}")
         
     except json.JSONDecodeError as e:
@@ -599,5 +1135,32 @@ def main():
     return 0
 
 
+def batch_main(args) -> int:
+    """Render every matched debate file on a process pool"""
+    json_files = expand_inputs(args.json_files)
+    if not json_files:
+        print("❌ Error: No JSON files matched")
+        return 1
+    
+    print(f"📚 Rendering {len(json_files)} debate file(s) into {args.output_dir}/ with {args.jobs} worker(s)")
+    if args.profile and args.jobs > 1:
+        print("⚠️  --profile only sees this process; add -j 1 to profile the rendering itself")
+    summary = render_many(
+        json_files,
+        args.output_dir,
+        jobs=args.jobs,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        force=args.force,
+        stylesheet_href=args.stylesheet,
+        minify=args.minify,
+        lazy=args.lazy,
+    )
+    
+    print(f"✅ Rendered {summary['rendered']}, skipped {summary['skipped']} unchanged, "
+          f"failed {summary['failed']} in {summary['elapsed']:.2f}s "
+          f"({summary['files_per_second']:.1f} files/sec)")
+    return 1 if summary['failed'] else 0
+
+
 if __name__ == "__main__":
-    exit(main())
\ No newline at end of file
+    exit(main())
@@ -1,6 +1,48 @@
-def main():
-    print("Hello from devils-advocate!")
+#!/usr/bin/env python3
+"""
+Devil's Advocate command line
+One entry point for the debate tools: `main.py <command> [args]`. A command's
+module is imported only when that command runs, so `main.py publish` never
+loads the Anthropic SDK and `main.py --help` imports nothing but this file
+"""
+
+import sys
+from importlib import import_module
+from typing import List, Optional
+
+# command -> (module, summary); each module exposes main(argv)
+COMMANDS = {
+    "debate": ("debate", "Run a new debate between Claude instances"),
+    "render": ("json_to_html", "Convert debate JSON files to HTML pages"),
+    "publish": ("publish", "Publish rendered debates to the published/ gallery"),
+    "stage": ("stage_publish", "Publish every debate in conversations/ in one pass"),
+    "serve": ("serve", "Serve the published gallery over HTTP"),
+    "watch": ("watch", "Render and publish debates as they appear in conversations/"),
+}
+
+
+def usage() -> str:
+    lines = ["usage: main.py <command> [args]", "", "commands:"]
+    lines += [f"  {name:<9} {summary}" for name, (_, summary) in COMMANDS.items()]
+    lines += ["", "Run `main.py <command> --help` for a command's options."]
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return 0 if argv else 2
+
+    command, rest = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(usage(), file=sys.stderr)
+        print(f"\nmain.py: error: unknown command '{command}'", file=sys.stderr)
+        return 2
+
+    module = import_module(COMMANDS[command][0])
+    return module.main(rest) or 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Manifest of published debates
+The source of truth for the gallery index: one record per published debate
+(title, model, turns and dates), stored as an append-only JSON Lines log
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from fsutil import atomic_write_text
+
+MANIFEST_FILE = "manifest.jsonl"
+
+# Compact once the log holds this many more lines than live entries
+COMPACT_SLACK = 64
+
+
+class Manifest:
+    """Published debates keyed by page file name.
+
+    Updates append one line to the log, so recording a publish costs O(1);
+    the log is rewritten with one line per debate once superseded lines
+    outnumber live ones, which keeps updates O(1) amortized. Callers that
+    update a shared manifest must hold a lock from load() through flush()
+    (see publish.publish_lock).
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._log_lines = 0
+        self._pending: List[str] = []
+
+    @classmethod
+    def load(cls, path) -> "Manifest":
+        """Replay the log at path; later records for a file replace earlier ones"""
+        manifest = cls(path)
+        try:
+            with open(manifest.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn final line from an interrupted write
+                        continue
+                    manifest._log_lines += 1
+                    if record.get("deleted"):
+                        manifest.entries.pop(record["file"], None)
+                    else:
+                        manifest.entries[record["file"]] = record
+        except FileNotFoundError:
+            pass
+        return manifest
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def __contains__(self, file: str) -> bool:
+        return file in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, file: str) -> Optional[Dict[str, Any]]:
+        return self.entries.get(file)
+
+    def upsert(self, entry: Dict[str, Any]) -> bool:
+        """Record an entry; returns False if an identical one is already recorded"""
+        if self.entries.get(entry["file"]) == entry:
+            return False
+        self.entries[entry["file"]] = entry
+        self._pending.append(json.dumps(entry, sort_keys=True, ensure_ascii=False))
+        return True
+
+    def remove(self, file: str) -> bool:
+        """Drop a debate from the manifest"""
+        if self.entries.pop(file, None) is None:
+            return False
+        self._pending.append(json.dumps({"file": file, "deleted": True}))
+        return True
+
+    def sorted_entries(self) -> List[Dict[str, Any]]:
+        """Entries newest first, with ties broken by file name so the order is deterministic"""
+        return sorted(self.entries.values(), key=lambda e: (e.get("published") or 0, e["file"]), reverse=True)
+
+    def flush(self) -> None:
+        """Append pending records to the log, compacting it when it has grown stale"""
+        if not self._pending:
+            return
+
+        if self._log_lines + len(self._pending) > 2 * len(self.entries) + COMPACT_SLACK:
+            self.compact()
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = "".join(line + "\n" for line in self._pending).encode("utf-8")
+        with open(self.path, "a+b") as f:
+            # Never glue a record onto a line torn by an interrupted append
+            if f.seek(0, 2) > 0:
+                f.seek(-1, 2)
+                if f.read(1) != b"\n":
+                    data = b"\n" + data
+            f.write(data)
+        self._log_lines += len(self._pending)
+        self._pending = []
+
+    def compact(self) -> None:
+        """Rewrite the log with exactly one line per live entry"""
+        lines = [json.dumps(self.entries[file], sort_keys=True, ensure_ascii=False) for file in sorted(self.entries)]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(self.path, "".join(line + "\n" for line in lines))
+        self._log_lines = len(lines)
+        self._pending = []
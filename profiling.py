@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Opt-in profiling for the command line tools
+--profile FILE writes cProfile stats to FILE (read them with `python -m pstats
+FILE`), --profile-sample also writes sampled wall-clock stacks to
+FILE.stacks in collapsed flamegraph format, and a per-phase timing summary
+is printed at exit. With profiling off, phase() returns a shared no-op
+context manager and nothing else runs
+"""
+
+import atexit
+import cProfile
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import nullcontext
+from typing import Dict, List, Optional
+
+DEFAULT_SAMPLE_INTERVAL = 0.005
+
+_NULL_PHASE = nullcontext()
+_session: Optional["ProfileSession"] = None
+
+
+def add_profile_arguments(parser) -> None:
+    """Add --profile and --profile-sample to an argparse parser"""
+    parser.add_argument("--profile", metavar="FILE",
+                        help="Write cProfile stats to FILE and print a per-phase timing summary at exit")
+    parser.add_argument("--profile-sample", action="store_true",
+                        help="With --profile, also write sampled wall-clock stacks to FILE.stacks")
+
+
+def phase(name: str):
+    """Time the with block under name while profiling; a no-op otherwise"""
+    if _session is None:
+        return _NULL_PHASE
+    return _Phase(_session, name)
+
+
+class _Phase:
+    """Accumulates exclusive time: time spent in a nested phase is not counted in its parent"""
+
+    __slots__ = ("session", "name", "start")
+
+    def __init__(self, session: "ProfileSession", name: str):
+        self.session = session
+        self.name = name
+
+    def __enter__(self):
+        stack = self.session.stack()
+        now = time.perf_counter()
+        if stack:
+            parent = stack[-1]
+            self.session.add(parent.name, now - parent.start, 0)
+        self.start = now
+        stack.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        stack = self.session.stack()
+        now = time.perf_counter()
+        stack.pop()
+        self.session.add(self.name, now - self.start, 1)
+        if stack:
+            stack[-1].start = now
+        return False
+
+
+class _Sampler(threading.Thread):
+    """Samples the main thread's stack at a fixed interval, counting identical stacks"""
+
+    def __init__(self, interval: float):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._target = threading.main_thread().ident
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class ProfileSession:
+    """cProfile, optional stack sampling and phase timers for one run of a tool"""
+
+    def __init__(self, path: str, sample: bool = False, sample_interval: float = DEFAULT_SAMPLE_INTERVAL):
+        self.path = path
+        self.totals: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self.started = time.perf_counter()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._profiler = cProfile.Profile()
+        self._sampler = _Sampler(sample_interval) if sample else None
+
+    def stack(self) -> List[_Phase]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def add(self, name: str, seconds: float, count: int) -> None:
+        with self._lock:
+            self.totals[name] = self.totals.get(name, 0.0) + seconds
+            self.counts[name] = self.counts.get(name, 0) + count
+
+    def start(self) -> None:
+        self._profiler.enable()
+        if self._sampler is not None:
+            self._sampler.start()
+
+    def stop(self) -> None:
+        self._profiler.disable()
+        if self._sampler is not None:
+            self._sampler.stop()
+        elapsed = time.perf_counter() - self.started
+
+        self._profiler.dump_stats(self.path)
+        written = [self.path]
+        if self._sampler is not None:
+            stacks_path = f"{self.path}.stacks"
+            with open(stacks_path, "w", encoding="utf-8") as f:
+                for stack, count in self._sampler.samples.most_common():
+                    f.write(f"{stack} {count}\n")
+            written.append(stacks_path)
+
+        print(f"\n⏱️  Profile ({elapsed:.3f}s total)", file=sys.stderr)
+        for name, seconds in sorted(self.totals.items(), key=lambda item: -item[1]):
+            share = seconds / elapsed if elapsed else 0.0
+            print(f"   {name:<14} {seconds:9.3f}s {share:6.1%}  ({self.counts[name]} calls)", file=sys.stderr)
+        print(f"   Written to {', '.join(written)}", file=sys.stderr)
+
+
+def start(path: Optional[str], sample: bool = False) -> Optional[ProfileSession]:
+    """Begin profiling if path is set; the results are written when the process exits"""
+    global _session
+    if not path or _session is not None:
+        return _session
+    _session = ProfileSession(path, sample=sample)
+    _session.start()
+    atexit.register(stop)
+    return _session
+
+
+def stop() -> None:
+    """Finish the active session, writing its output; safe to call more than once"""
+    global _session
+    session, _session = _session, None
+    if session is not None:
+        session.stop()
+
+
+def start_from_args(args) -> Optional[ProfileSession]:
+    """start() using the options added by add_profile_arguments"""
+    return start(getattr(args, "profile", None), sample=getattr(args, "profile_sample", False))
@@ -6,184 +6,422 @@ import json
 from pathlib import Path
 from datetime import datetime
 
-def main():
-    if len(sys.argv) != 2:
-        print("Usage: python publish.py <html_file>")
-        print("\nThis script will:")
-        print("1. Copy the HTML file to the published/ directory")
-        print("2. Find and copy the matching JSON file with the same base name")
-        print("3. Update or create published/index.html with a link to the debate")
-        print("\nExample: python publish.py conversations/debate_1748273237.html")
-        sys.exit(1)
-    
-    html_file = sys.argv[1]
-    if not os.path.exists(html_file) or not html_file.endswith('.html'):
-        print(f"Error: {html_file} does not exist or is not an HTML file")
-        sys.exit(1)
-    
-    # Find matching JSON file
-    json_file = html_file.replace('.html', '.json')
-    if not os.path.exists(json_file):
-        print(f"Error: Matching JSON file {json_file} does not exist")
-        sys.exit(1)
-    
-    # Create published directory if it doesn't exist
-    published_dir = Path("published")
-    published_dir.mkdir(exist_ok=True)
+from assets import build_stylesheet, externalize_stylesheet, format_bytes, minify_html, precompress_tree
+from json_to_html import DEBATE_CSS
+from gallery import GALLERY_CSS, write_gallery
+from fsutil import atomic_copy, atomic_write_text, file_lock
+from manifest import MANIFEST_FILE, Manifest
+from profiling import add_profile_arguments, phase, start_from_args
+
+LOCK_FILE = ".publish.lock"
+PUBLISH_STATE_FILE = ".publish-state.json"
+
+
+def publish_lock(published_dir):
+    """Lock serializing manifest and index updates across concurrent publishers"""
+    return file_lock(Path(published_dir) / LOCK_FILE)
+
+
+def build_site_stylesheet(published_dir):
+    """Write the shared site stylesheet into published_dir and return its href"""
+    return build_stylesheet(published_dir, [DEBATE_CSS, GALLERY_CSS])
+
+
+def is_current(source, target):
+    """Return True if target was published from source and source has not changed since"""
+    try:
+        return os.stat(target).st_mtime_ns == os.stat(source).st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+
+def publish_options(stylesheet_href, minify):
+    """What a published page depends on besides its source; the href changes with the CSS"""
+    return f"stylesheet={stylesheet_href};minify={bool(minify)}"
+
+
+def load_publish_state(published_dir):
+    """Load the options each page was last published with"""
+    try:
+        with open(Path(published_dir) / PUBLISH_STATE_FILE, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {"pages": {}}
+    state.setdefault("pages", {})
+    return state
+
+
+def save_publish_state(published_dir, state):
+    """Persist the publish state; call with publish_lock() held"""
+    atomic_write_text(Path(published_dir) / PUBLISH_STATE_FILE, json.dumps(state, indent=2, sort_keys=True))
+
+
+def file_hash(path):
+    """Return the SHA-256 hex digest of a file's contents"""
+    import hashlib
+    
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def copy_if_changed(source, target, force=False):
+    """Copy source to target unless target already holds the same file.
+    
+    Size and mtime are compared first; when only the mtime differs the contents
+    are hashed, so touching a file does not trigger a copy. Returns True if copied.
+    """
+    if not force:
+        try:
+            source_stat = os.stat(source)
+            target_stat = os.stat(target)
+        except FileNotFoundError:
+            pass
+        else:
+            if source_stat.st_size == target_stat.st_size:
+                if source_stat.st_mtime_ns == target_stat.st_mtime_ns:
+                    return False
+                if file_hash(source) == file_hash(target):
+                    shutil.copystat(source, target)
+                    return False
+    atomic_copy(source, target)
+    return True
+
+
+def publish_page(html_file, target_path, stylesheet_href, minify=False):
+    """Copy a debate page into the gallery, linking the shared stylesheet.
+    
+    The published page keeps the source's mtime, which is how is_current()
+    recognizes it on the next run. Returns (original_bytes, published_bytes, externalized).
+    """
+    with open(html_file, "r", encoding="utf-8") as f:
+        original = f.read()
+    
+    html, externalized = externalize_stylesheet(original, DEBATE_CSS, stylesheet_href)
+    if minify:
+        html = minify_html(html)
+    
+    atomic_write_text(target_path, html, copystat_from=html_file)
+    
+    return len(original.encode("utf-8")), len(html.encode("utf-8")), externalized
+
+
+def publish_parts(html_file, published_dir, stylesheet_href, minify=False, force=False):
+    """Publish the fragment pages belonging to a lazily rendered debate page.
+    
+    Returns the number of fragment pages copied.
+    """
+    source = Path(html_file)
+    pattern = f"{source.stem}.part-*.html"
+    part_names = set()
+    copied = 0
+    for part in sorted(source.parent.glob(pattern)):
+        target = Path(published_dir) / part.name
+        if force or not is_current(part, target):
+            publish_page(part, target, stylesheet_href, minify=minify)
+            copied += 1
+        part_names.add(part.name)
+    
+    # Drop fragments from an earlier, longer render of the same debate
+    for stale in Path(published_dir).glob(pattern):
+        if stale.name not in part_names:
+            stale.unlink()
+    
+    return copied
+
+
+def report_page_weight(published_dir, stylesheet_href, original_bytes, published_bytes, externalized):
+    """Print how many bytes a view of the published page costs compared to the source page"""
+    if not externalized:
+        print("Page stylesheet differs from the current template; kept it inline")
+        return
+    css_bytes = (Path(published_dir) / stylesheet_href).stat().st_size
+    saved = 100 * (1 - published_bytes / original_bytes) if original_bytes else 0
+    print(f"Page weight: {format_bytes(original_bytes)} inline -> {format_bytes(published_bytes)} "
+          f"per view with cached stylesheet ({saved:.0f}% smaller), "
+          f"{format_bytes(published_bytes + css_bytes)} on first view")
+
+
+def find_json_file(html_file):
+    """Return the JSON file matching a debate HTML file"""
+    return html_file.replace('.html', '.json')
+
+
+def publish_debate(html_file, published_dir, stylesheet_href, minify=False, force=False, verbose=True,
+                   stale=False):
+    """Copy one debate (page, fragment pages and JSON) into published_dir.
     
-    # Copy HTML file to published directory
+    Only files that are new or changed are copied; stale republishes the pages
+    because they were published with other options. Returns a dict with the
+    page and JSON file names, the number of files copied and whether the
+    JSON changed (which is what the manifest entry is built from).
+    """
+    html_file = str(html_file)
+    json_file = find_json_file(html_file)
+    published_dir = Path(published_dir)
+    
+    # Copy HTML file to published directory, linking the shared stylesheet
     html_filename = os.path.basename(html_file)
     html_target_path = published_dir / html_filename
-    shutil.copy2(html_file, html_target_path)
-    print(f"Copied {html_file} to {html_target_path}")
+    copied = 0
+    if force or stale or not is_current(html_file, html_target_path):
+        weights = publish_page(html_file, html_target_path, stylesheet_href, minify=minify)
+        copied += 1
+        if verbose:
+            print(f"Copied {html_file} to {html_target_path}")
+            report_page_weight(published_dir, stylesheet_href, *weights)
+    
+    # Copy fragment pages of lazily rendered debates (see json_to_html.py --lazy)
+    parts_copied = publish_parts(html_file, published_dir, stylesheet_href, minify=minify, force=force or stale)
+    copied += parts_copied
+    if verbose and parts_copied:
+        print(f"Copied {parts_copied} fragment page(s) for {html_filename}")
     
     # Copy JSON file to published directory
     json_filename = os.path.basename(json_file)
     json_target_path = published_dir / json_filename
-    shutil.copy2(json_file, json_target_path)
-    print(f"Copied {json_file} to {json_target_path}")
+    json_copied = copy_if_changed(json_file, json_target_path, force=force)
+    if json_copied:
+        copied += 1
+        if verbose:
+            print(f"Copied {json_file} to {json_target_path}")
+    
+    return {"file": html_filename, "json": json_filename, "copied": copied, "json_copied": json_copied}
+
+
+def publish_many(html_files, published_dir="published", minify=False, force=False, verbose=True):
+    """Publish many debates in one pass, updating the manifest and gallery pages once.
+    
+    Safe to run from many processes at once: files are copied atomically
+    without a lock, then the manifest and index pages are updated under
+    publish_lock(). Returns a summary dict with
+    published/copied/unchanged/added/failed counts.
+    """
+    import time
+    
+    start = time.perf_counter()
+    now = time.time()
+    published_dir = Path(published_dir)
+    published_dir.mkdir(exist_ok=True)
+    stylesheet_href = build_site_stylesheet(published_dir)
+    options = publish_options(stylesheet_href, minify)
+    published_with = load_publish_state(published_dir)["pages"]
+    
+    results = []
+    failures = []
+    copied_files = 0
+    unchanged = 0
+    for html_file in html_files:
+        html_file = str(html_file)
+        if not os.path.exists(html_file) or not html_file.endswith('.html'):
+            failures.append((html_file, "does not exist or is not an HTML file"))
+            continue
+        json_file = find_json_file(html_file)
+        if not os.path.exists(json_file):
+            failures.append((html_file, f"matching JSON file {json_file} does not exist"))
+            continue
+        
+        with phase("copy"):
+            stale = published_with.get(os.path.basename(html_file)) != options
+            result = publish_debate(html_file, published_dir, stylesheet_href, minify=minify, force=force,
+                                    verbose=verbose, stale=stale)
+        result["json_path"] = json_file
+        results.append(result)
+        copied_files += result["copied"]
+        if not result["copied"]:
+            unchanged += 1
     
-    # Extract title from JSON file
-    debate_title = extract_title_from_json(json_file)
+    added = 0
+    changed = []
+    with publish_lock(published_dir), phase("index update"):
+        manifest = load_manifest(published_dir)
+        for result in results:
+            # The manifest entry only depends on the JSON, so unchanged debates are not re-parsed
+            existing = manifest.get(result["file"])
+            if existing is None or result["json_copied"] or force:
+                entry = manifest_entry(load_debate_json(result["json_path"]), result["json_path"], result["file"],
+                                       published=existing["published"] if existing else now)
+                if manifest.upsert(entry):
+                    changed.append((existing, entry))
+                if existing is None:
+                    added += 1
+        
+        manifest.flush()
+        # Reloaded under the lock so concurrent publishers' pages are kept
+        state = load_publish_state(published_dir)
+        state["pages"].update((result["file"], options) for result in results)
+        save_publish_state(published_dir, state)
+        # Only the index pages and shards the changed debates belong to are rewritten
+        write_gallery(published_dir, manifest.entries.values(), stylesheet_href, changed=changed)
     
-    # Update index.html
+    return {
+        "published": len(results),
+        "copied_files": copied_files,
+        "unchanged": unchanged,
+        "added": added,
+        "failures": failures,
+        "elapsed": time.perf_counter() - start,
+    }
+
+
+def load_manifest(published_dir):
+    """Load the manifest, seeding it from a legacy index.html if there is none yet.
+    
+    Call with publish_lock() held.
+    """
+    published_dir = Path(published_dir)
+    manifest = Manifest.load(published_dir / MANIFEST_FILE)
     index_path = published_dir / "index.html"
+    if not manifest.exists() and index_path.exists():
+        for entry in legacy_index_entries(index_path):
+            manifest.upsert(entry)
+        manifest.flush()
+    return manifest
+
+
+def legacy_index_entries(index_path):
+    """Parse entries out of an index.html written before the manifest existed"""
+    import html
+    import re
     
-    # Create basic structure if index doesn't exist
-    if not index_path.exists():
-        with open(index_path, "w") as f:
-            f.write("""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Published Debates</title>
-    <style>
-        body { 
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
-            line-height: 1.6;
-            max-width: 900px; 
-            margin: 0 auto; 
-            padding: 30px;
-            background-color: #f5f7fa;
-            color: #333;
-        }
-        h1 { 
-            color: #333;
-            text-align: center;
-            margin-bottom: 30px;
-            border-bottom: 2px solid #667eea;
-            padding-bottom: 10px;
-        }
-        ul { 
-            list-style-type: none; 
-            padding: 0; 
-        }
-        li { 
-            margin: 15px 0; 
-            padding: 15px; 
-            border: 1px solid #ddd; 
-            border-radius: 8px;
-            background-color: white;
-            box-shadow: 0 2px 5px rgba(0,0,0,0.05);
-            transition: transform 0.2s, box-shadow 0.2s;
-        }
-        li:hover {
-            transform: translateY(-3px);
-            box-shadow: 0 5px 15px rgba(0,0,0,0.1);
-        }
-        a { 
-            color: #667eea; 
-            text-decoration: none;
-            font-weight: bold;
-            font-size: 1.1em;
-        }
-        a:hover { 
-            text-decoration: underline; 
-        }
-        .date { 
-            color: #666; 
-            font-size: 0.9em;
-            display: block;
-            margin-top: 5px;
-        }
-        .model, .turns {
-            display: inline-block;
-            font-size: 0.8em;
-            background-color: #e2e8f0;
-            padding: 2px 8px;
-            border-radius: 4px;
-            margin-left: 8px;
-        }
-        footer {
-            text-align: center;
-            margin-top: 30px;
-            padding-top: 20px;
-            border-top: 1px solid #ddd;
-            color: #666;
-            font-size: 0.9em;
-        }
-    </style>
-</head>
-<body>
-    <h1>Published Debates</h1>
-    <ul id="debate-list">
-    </ul>
-    <footer>
-        Generated with the arguing-opus tool
-    </footer>
-</body>
-</html>""")
-    
-    # Read the current index file
     with open(index_path, "r") as f:
         content = f.read()
     
-    # Check if the file is already in the index
-    if html_filename in content:
-        print(f"{html_filename} is already in the index")
+    entries = []
+    pattern = (r'<li><a href="([^"]+)">(.*?)</a>(?:<span class="model">(.*?)</span>)?\s*'
+               r'(?:<span class="turns">(\d+) turns</span>)?<span class="date">Published: ([^<]+)</span></li>')
+    for file, title, model, turns, date in re.findall(pattern, content):
+        try:
+            published = datetime.strptime(date.strip(), "%Y-%m-%d %H:%M").timestamp()
+        except ValueError:
+            published = None
+        entries.append({
+            "file": file,
+            "json": file.replace('.html', '.json'),
+            "title": html.unescape(title),
+            "model": html.unescape(model) or None,
+            "turns": int(turns) if turns else None,
+            "published": published,
+            "start_time": None,
+            "end_time": None,
+        })
+    return entries
+
+
+def manifest_entry(data, json_file, html_filename, published):
+    """Build the manifest record for a debate from its parsed JSON"""
+    entry = index_entry(data, json_file)
+    metadata = data.get('metadata', {}) if isinstance(data, dict) else {}
+    entry.update({
+        "file": html_filename,
+        "json": os.path.basename(json_file),
+        "published": published,
+        "start_time": metadata.get('start_time'),
+        "end_time": metadata.get('end_time'),
+    })
+    return entry
+
+
+def print_summary(summary):
+    """Print the outcome of a publish run"""
+    for html_file, error in summary["failures"]:
+        print(f"Error: {html_file}: {error}")
+    print(f"Published {summary['published']} debate(s): {summary['copied_files']} file(s) copied, "
+          f"{summary['unchanged']} debate(s) unchanged, {summary['added']} new index entr"
+          f"{'y' if summary['added'] == 1 else 'ies'} in {summary['elapsed']:.2f}s")
+
+
+def report_precompressed(published_dir):
+    """Refresh precompressed copies of the published files and report how many were written"""
+    written = precompress_tree(published_dir)
+    print(f"🗜️  Precompressed {written} file(s)")
+
+
+def main(argv=None):
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description="Publish debates to the published/ gallery",
+        epilog="This copies each HTML file and its matching JSON file to published/ "
+               "and adds links to published/index.html. "
+               "Example: python publish.py conversations/debate_1748273237.html",
+    )
+    parser.add_argument("html_files", nargs='*', metavar="html_file",
+                        help="Debate HTML file(s); the JSON file with the same base name is published too")
+    parser.add_argument("--minify", action="store_true", help="Minify the published HTML")
+    parser.add_argument("--force", action="store_true", help="Copy files even if the published copies are up to date")
+    parser.add_argument("--rebuild-index", action="store_true", help="Regenerate every gallery index page from the manifest")
+    parser.add_argument("--precompress", action="store_true", help="Write .gz (and .br) copies of published text files for serve.py")
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+    start_from_args(args)
+    
+    if args.rebuild_index and not args.html_files:
+        published_dir = Path("published")
+        published_dir.mkdir(exist_ok=True)
+        with publish_lock(published_dir):
+            manifest = load_manifest(published_dir)
+            written = write_gallery(published_dir, manifest.entries.values(), build_site_stylesheet(published_dir))
+        print(f"Rebuilt the gallery index for {len(manifest)} debate(s); {written} page(s) updated")
+        if args.precompress:
+            report_precompressed(published_dir)
         return
+    if not args.html_files:
+        parser.error("at least one html_file is required unless using --rebuild-index")
     
-    # Add new entry to the list
-    current_date = datetime.now().strftime("%Y-%m-%d %H:%M")
+    for html_file in args.html_files:
+        if not os.path.exists(html_file) or not html_file.endswith('.html'):
+            print(f"Error: {html_file} does not exist or is not an HTML file")
+            sys.exit(1)
+        
+        # Find matching JSON file
+        json_file = find_json_file(html_file)
+        if not os.path.exists(json_file):
+            print(f"Error: Matching JSON file {json_file} does not exist")
+            sys.exit(1)
     
-    # Get model name and turns from JSON if available
-    model_tag = ""
-    turns_info = ""
+    summary = publish_many(args.html_files, "published", minify=args.minify, force=args.force)
+    print_summary(summary)
+    if args.precompress:
+        report_precompressed("published")
+
+
+def load_debate_json(json_file):
+    """Load a debate JSON file, returning an empty dict if it cannot be parsed"""
     try:
-        with open(json_file, 'r') as f:
-            data = json.load(f)
-        if 'config' in data and 'model_name' in data['config']:
-            model_name = data['config']['model_name']
-            model_tag = f'<span class="model">{model_name}</span>'
-            
+        with phase("load"), open(json_file, 'r') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Warning: Could not read {json_file}: {e}")
+        return {}
+
+
+def index_entry(data, json_file):
+    """Return the title, model and turn count shown in the index for a debate"""
+    model = None
+    turns = None
+    if isinstance(data, dict):
+        model = data.get('config', {}).get('model_name')
+        
         # Get number of turns
-        if 'metadata' in data and 'total_turns' in data['metadata']:
+        if 'total_turns' in data.get('metadata', {}):
             turns = data['metadata']['total_turns']
-            turns_info = f'<span class="turns">{turns} turns</span>'
         elif 'conversation' in data:
             turns = len(data['conversation'])
-            turns_info = f'<span class="turns">{turns} turns</span>'
-    except:
-        pass
-    
-    new_entry = f'        <li><a href="{html_filename}">{debate_title}</a>{model_tag} {turns_info}<span class="date">Published: {current_date}</span></li>'
-    
-    # Insert the new entry at the beginning of the list
-    updated_content = content.replace('<ul id="debate-list">', f'<ul id="debate-list">\n{new_entry}')
     
-    # Write updated content back
-    with open(index_path, "w") as f:
-        f.write(updated_content)
-    
-    print(f"Updated {index_path} with link to {html_filename}")
+    return {"title": extract_title(data, json_file), "model": model, "turns": turns}
+
 
 def extract_title_from_json(json_file):
     """Extract a title from the JSON debate file."""
+    return extract_title(load_debate_json(json_file), json_file)
+
+
+def extract_title(data, json_file):
+    """Extract a title from parsed debate JSON, falling back to the file name."""
     try:
-        with open(json_file, 'r') as f:
-            data = json.load(f)
-            
         # Based on the structure in the sample file
         if 'config' in data and 'topic' in data['config']:
             return data['config']['topic']
@@ -224,4 +462,4 @@ def extract_title_from_json(json_file):
         return os.path.basename(json_file).replace('.json', '')
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
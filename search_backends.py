@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Search backends for the debate web tools
+Every backend answers search(query, count) with a list of SearchResult or
+raises SearchError. HedgedSearch puts several behind one interface: it asks
+the first backend, and if no answer has come back by that backend's own
+p95 latency, it asks the next one too and takes whichever good answer
+arrives first
+"""
+
+import math
+import os
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+BRAVE_URL = "https://api.search.brave.com/res/v1/web/search"
+BRAVE_TIMEOUT = 10
+
+HEDGE_PERCENTILE = 0.95
+# Until a backend has this many samples its percentile is noise; use DEFAULT_HEDGE_DELAY
+MIN_HEDGE_SAMPLES = 20
+DEFAULT_HEDGE_DELAY = 1.0
+MIN_HEDGE_DELAY = 0.05
+MAX_HEDGE_DELAY = 5.0
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+@dataclass
+class SearchResult:
+    title: str
+    url: str
+    description: str
+
+
+class SearchError(Exception):
+    """A backend could not answer"""
+
+
+class SearchBackend(ABC):
+    """Interface for search providers"""
+
+    name = "backend"
+
+    @abstractmethod
+    def search(self, query: str, count: int) -> List[SearchResult]:
+        """Up to count results for query; raises SearchError when the backend cannot answer"""
+
+
+class BraveSearch(SearchBackend):
+    """The Brave web search API"""
+
+    name = "brave"
+
+    def __init__(self, api_key: Optional[str] = None, timeout: float = BRAVE_TIMEOUT):
+        self.api_key = api_key
+        self.timeout = timeout
+
+    def search(self, query: str, count: int) -> List[SearchResult]:
+        import requests
+
+        api_key = self.api_key or os.getenv('BRAVE_SEARCH_API_KEY')
+        if not api_key:
+            raise SearchError("BRAVE_SEARCH_API_KEY environment variable not set")
+
+        headers = {
+            'Accept': 'application/json',
+            'Accept-Encoding': 'gzip',
+            'X-Subscription-Token': api_key
+        }
+        params = {
+            'q': query,
+            'count': count,
+            'search_lang': 'en',
+            'country': 'US',
+            'safesearch': 'moderate',
+            'freshness': 'pw'
+        }
+        try:
+            response = requests.get(BRAVE_URL, headers=headers, params=params, timeout=self.timeout)
+            response.raise_for_status()
+            data = response.json()
+        except (requests.RequestException, ValueError) as e:
+            raise SearchError(str(e)) from e
+
+        return [
+            SearchResult(result.get('title', 'No title'), result.get('url', ''),
+                         result.get('description', 'No description'))
+            for result in data.get('web', {}).get('results', [])
+        ]
+
+
+class LocalIndex(SearchBackend):
+    """TF-IDF search over a directory of saved pages and notes (.html, .md, .txt)
+
+    Results link to file:// URLs, which WebToolkit.fetch_url can read.
+    """
+
+    name = "local"
+    SUFFIXES = (".html", ".htm", ".md", ".txt")
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.documents: List[Dict[str, Any]] = []
+        self.postings: Dict[str, Dict[int, int]] = {}
+        for path in sorted(self.directory.rglob("*")):
+            if path.suffix.lower() in self.SUFFIXES and path.is_file():
+                self._add(path)
+
+    def _add(self, path: Path) -> None:
+        raw = path.read_text(encoding="utf-8", errors="replace")
+        if path.suffix.lower() in (".html", ".htm"):
+            from extract import extract_main_text
+            text = extract_main_text(raw, max_chars=len(raw))
+        else:
+            text = raw
+        lines = [line.strip("#- ").strip() for line in text.splitlines() if line.strip()]
+        if not lines:
+            return
+        doc_id = len(self.documents)
+        self.documents.append({"title": lines[0], "url": path.resolve().as_uri(), "lines": lines[1:] or lines})
+        for word in _WORD.findall(text.lower()):
+            counts = self.postings.setdefault(word, {})
+            counts[doc_id] = counts.get(doc_id, 0) + 1
+
+    def search(self, query: str, count: int) -> List[SearchResult]:
+        terms = set(_WORD.findall(query.lower()))
+        scores: Dict[int, float] = {}
+        for term in terms:
+            docs = self.postings.get(term, {})
+            if not docs:
+                continue
+            idf = math.log(1 + len(self.documents) / len(docs))
+            for doc_id, tf in docs.items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + (1 + math.log(tf)) * idf
+        ranked = sorted(scores, key=lambda doc_id: -scores[doc_id])[:count]
+        return [self._result(self.documents[doc_id], terms) for doc_id in ranked]
+
+    @staticmethod
+    def _result(document: Dict[str, Any], terms: Iterable[str]) -> SearchResult:
+        # The line sharing the most query terms makes the snippet
+        snippet = max(document["lines"], key=lambda line: len(set(_WORD.findall(line.lower())) & set(terms)))
+        return SearchResult(document["title"], document["url"], snippet[:300])
+
+
+class StaticSearch(SearchBackend):
+    """Canned results with configurable latency and failures, for tests and benchmarks"""
+
+    def __init__(self, results: Sequence[SearchResult] = (), delay: float = 0.0,
+                 error: Optional[str] = None, name: str = "static"):
+        self.results = list(results)
+        self.delay = delay
+        self.error = error
+        self.name = name
+        self.calls = 0
+
+    def search(self, query: str, count: int) -> List[SearchResult]:
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        if self.error:
+            raise SearchError(self.error)
+        return self.results[:count]
+
+
+class LatencyHistogram:
+    """Counts of latencies in logarithmic buckets from 1 ms to about 3 minutes
+
+    Percentiles are read from bucket upper bounds, so they are accurate to
+    the bucket width (~19%) in constant memory.
+    """
+
+    BASE = 0.001
+    GROWTH = 1.19
+    BUCKETS = 70
+
+    def __init__(self):
+        self.counts = [0] * self.BUCKETS
+        self.count = 0
+        self.total = 0.0
+
+    def bucket(self, seconds: float) -> int:
+        if seconds <= self.BASE:
+            return 0
+        return min(self.BUCKETS - 1, int(math.ceil(math.log(seconds / self.BASE, self.GROWTH))))
+
+    def upper_bound(self, bucket: int) -> float:
+        return self.BASE * self.GROWTH ** bucket
+
+    def record(self, seconds: float) -> None:
+        self.counts[self.bucket(seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(fraction * self.count))
+        seen = 0
+        for bucket, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return self.upper_bound(bucket)
+        return self.upper_bound(self.BUCKETS - 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary plus the non-empty buckets, keyed by upper bound in ms"""
+        summary = {"count": self.count, "mean_ms": self.total / self.count * 1000 if self.count else None}
+        for label, fraction in (("p50_ms", 0.5), ("p95_ms", 0.95), ("p99_ms", 0.99)):
+            value = self.percentile(fraction)
+            summary[label] = value * 1000 if value is not None else None
+        summary["buckets"] = {f"{self.upper_bound(b) * 1000:.0f}": n for b, n in enumerate(self.counts) if n}
+        return summary
+
+
+class HedgedSearch(SearchBackend):
+    """Query backends in order, hedging to the next when one is slower than its usual tail"""
+
+    name = "hedged"
+
+    def __init__(self, backends: Sequence[SearchBackend], percentile: float = HEDGE_PERCENTILE,
+                 default_delay: float = DEFAULT_HEDGE_DELAY, min_samples: int = MIN_HEDGE_SAMPLES):
+        if not backends:
+            raise ValueError("HedgedSearch needs at least one backend")
+        self.backends = list(backends)
+        self.percentile = percentile
+        self.default_delay = default_delay
+        self.min_samples = min_samples
+        self.latency = {backend.name: LatencyHistogram() for backend in self.backends}
+        self.stats = {backend.name: {"requests": 0, "errors": 0, "wins": 0} for backend in self.backends}
+        self.hedges = 0
+        self._lock = threading.Lock()
+        # Losing requests keep running, so allow a few per backend
+        self._pool = ThreadPoolExecutor(max_workers=4 * len(self.backends), thread_name_prefix="search")
+
+    def hedge_delay(self, backend: SearchBackend) -> float:
+        """How long to wait on backend before asking the next one"""
+        with self._lock:
+            histogram = self.latency[backend.name]
+            if histogram.count < self.min_samples:
+                return self.default_delay
+            delay = histogram.percentile(self.percentile)
+        return min(MAX_HEDGE_DELAY, max(MIN_HEDGE_DELAY, delay))
+
+    def _timed(self, backend: SearchBackend, query: str, count: int) -> List[SearchResult]:
+        start = time.perf_counter()
+        try:
+            results = backend.search(query, count)
+        except Exception:
+            with self._lock:
+                self.stats[backend.name]["errors"] += 1
+            raise
+        with self._lock:
+            self.latency[backend.name].record(time.perf_counter() - start)
+        return results
+
+    def _launch(self, index: int, query: str, count: int) -> Future:
+        backend = self.backends[index]
+        with self._lock:
+            self.stats[backend.name]["requests"] += 1
+        return self._pool.submit(self._timed, backend, query, count)
+
+    def search(self, query: str, count: int) -> List[SearchResult]:
+        first = self._launch(0, query, count)
+        owners = {first: self.backends[0].name}
+        pending = {first}
+        next_index = 1
+        empty_answer = False
+        last_error: Optional[BaseException] = None
+
+        while pending:
+            can_hedge = next_index < len(self.backends)
+            timeout = self.hedge_delay(self.backends[next_index - 1]) if can_hedge else None
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                if future.exception() is not None:
+                    last_error = future.exception()
+                    continue
+                results = future.result()
+                if results:
+                    with self._lock:
+                        self.stats[owners[future]]["wins"] += 1
+                    return results
+                empty_answer = True
+
+            # Nothing usable yet: on a timeout or a failure, bring in the next backend
+            if can_hedge and (not done or not pending):
+                if not done:
+                    with self._lock:
+                        self.hedges += 1
+                future = self._launch(next_index, query, count)
+                owners[future] = self.backends[next_index].name
+                pending.add(future)
+                next_index += 1
+
+        if empty_answer:
+            return []
+        raise SearchError(str(last_error) if last_error else "no backend answered")
+
+    def telemetry(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "hedges": self.hedges,
+                "backends": {
+                    name: {**self.stats[name], "latency": self.latency[name].to_dict()}
+                    for name in self.stats
+                },
+            }
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def create_search(names: Sequence[str], index_dir: Optional[str] = None) -> HedgedSearch:
+    """A HedgedSearch over backends named "brave" or "local", in priority order"""
+    backends: List[SearchBackend] = []
+    for name in names:
+        if name == "brave":
+            backends.append(BraveSearch())
+        elif name == "local":
+            if not index_dir:
+                raise ValueError("the local search backend needs an index directory")
+            backends.append(LocalIndex(index_dir))
+        else:
+            raise ValueError(f"unknown search backend {name!r}")
+    return HedgedSearch(backends)
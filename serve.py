@@ -1,52 +1,732 @@
 #!/usr/bin/env uv run
+import argparse
+import datetime
+import email.utils
+import hashlib
+import http.server
+import io
+import json
 import os
+import signal
+import socket
 import sys
-import http.server
-import socketserver
+import threading
+import urllib.parse
 import webbrowser
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import partial
+from http import HTTPStatus
 from pathlib import Path
 
-def main():
+from api import API_PREFIX, DebateIndex, handle_request
+from assets import ENCODINGS, MIN_COMPRESS_SIZE, compress, sibling_is_fresh, supported_encodings
+from fsutil import atomic_write_bytes
+
+DEFAULT_WORKERS = 32
+DEFAULT_IDLE_TIMEOUT = 5.0
+DEFAULT_GRACE = 10.0
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+# Larger files are streamed from disk rather than held in the cache
+DEFAULT_CACHE_ENTRY_BYTES = 1024 * 1024
+# Bodies read from disk at least this large go out via sendfile(), skipping user-space copies
+SENDFILE_MIN_BYTES = 64 * 1024
+
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "image/svg+xml")
+
+
+def parse_accept_encoding(header):
+    """Map each content coding in an Accept-Encoding header to its q-value"""
+    accepted = {}
+    for item in (header or "").split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def parse_range(header, length):
+    """Resolve a single-range Range header against a body of length bytes.
+
+    Returns (start, end) inclusive, "unsatisfiable", or None when the header
+    should be ignored (malformed, not bytes, or several ranges) and the whole
+    body sent instead.
+    """
+    unit, _, spec = (header or "").partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, dash, last = spec.strip().partition("-")
+    if not dash:
+        return None
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else max(start, length - 1)
+            if start < 0 or end < start:
+                return None
+        else:
+            suffix = int(last)
+            if suffix < 0:
+                return None
+            if suffix == 0:
+                return "unsatisfiable"
+            start, end = max(0, length - suffix), length - 1
+    except ValueError:
+        return None
+    if start >= length:
+        return "unsatisfiable"
+    return start, min(end, length - 1)
+
+
+def make_etag(stat, encoding=None):
+    """Strong validator for a file body; each content coding is a distinct representation"""
+    tag = f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+    return f'"{tag}-{encoding}"' if encoding else f'"{tag}"'
+
+
+class FileCache:
+    """Byte-bounded LRU of file bodies.
+
+    Each body is stored with the (mtime, size) of the file it was read from and
+    is discarded as soon as a request sees a different one, so republished
+    files are never served stale.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES, max_entry_bytes=DEFAULT_CACHE_ENTRY_BYTES):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = min(max_entry_bytes, max_bytes)
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, validator, load):
+        """Return the cached body for key if it was read at validator, else load() and cache it"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == validator:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        body = load()
+        if len(body) > self.max_entry_bytes:
+            return body
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous[1])
+            self._entries[key] = (validator, body)
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+        return body
+
+
+class RenderError(Exception):
+    """A debate source could not be rendered"""
+
+
+class _Flight:
+    """One in-progress computation that concurrent callers wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class OnDemandRenderer:
+    """Renders debate pages straight from their JSON sources on first request.
+
+    Rendered pages are cached in memory (validated against the source's mtime
+    and size) and on disk under cache_dir/pages, keyed by a hash of the source
+    and the renderer fingerprint, so a restart or an unchanged template skips
+    rendering, and a template change invalidates every page. Concurrent
+    requests for a page that is not cached yet share a single render.
+    """
+
+    def __init__(self, source_dir, cache_dir=None, memory_bytes=DEFAULT_CACHE_BYTES):
+        # Imported here so serving static files never loads the renderer and markdown
+        from json_to_html import (DEFAULT_CACHE_DIR, DebateHTMLGenerator, FragmentCache,
+                                  REQUIRED_KEYS, renderer_fingerprint)
+
+        cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.source_dir = Path(source_dir)
+        self.cache_dir = Path(cache_dir) / "pages"
+        self.fingerprint = renderer_fingerprint("on-demand")
+        self.memory = FileCache(max(memory_bytes, 1), max_entry_bytes=8 * DEFAULT_CACHE_ENTRY_BYTES)
+        self.renders = 0
+        self.disk_hits = 0
+        self._required_keys = REQUIRED_KEYS
+        self._generator = DebateHTMLGenerator(fragment_cache=FragmentCache(cache_dir))
+        # The generator reuses one Markdown engine, so renders run one at a time
+        self._render_lock = threading.Lock()
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+
+    def source_for(self, url_path):
+        """Return the JSON source for a request path like /debate_123.html, or None"""
+        path = urllib.parse.unquote(urllib.parse.urlsplit(url_path).path)
+        name = path[1:]
+        if not name.endswith(".html") or "/" in name or name.startswith(".") or ".part-" in name:
+            return None
+        json_path = self.source_dir / f"{name[:-len('.html')]}.json"
+        return json_path if json_path.is_file() else None
+
+    def page(self, json_path, stat, encoding=None):
+        """Return the page for json_path as bytes, compressed with encoding if given"""
+        validator = (stat.st_mtime_ns, stat.st_size)
+        if encoding:
+            return self.memory.get((json_path, encoding), validator,
+                                   lambda: compress(self.page(json_path, stat), encoding))
+        return self.memory.get((json_path, None), validator,
+                               lambda: self._coalesced((json_path, validator), lambda: self._load(json_path)))
+
+    def _coalesced(self, key, compute):
+        """Run compute() once for all callers that ask for key while it is running"""
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = compute()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._flights_lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def _load(self, json_path):
+        source = Path(json_path).read_bytes()
+        digest = hashlib.sha256(self.fingerprint.encode("utf-8") + source).hexdigest()
+        cached = self.cache_dir / digest[:2] / f"{digest}.html"
+        try:
+            html = cached.read_bytes()
+            self.disk_hits += 1
+            return html
+        except FileNotFoundError:
+            pass
+
+        try:
+            debate_data = json.loads(source)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise RenderError(f"{json_path} is not valid JSON: {e}") from e
+        if not isinstance(debate_data, dict) or not all(key in debate_data for key in self._required_keys):
+            raise RenderError(f"{json_path} is not a debate file")
+
+        with self._render_lock:
+            html = self._generator.generate_html(debate_data).encode("utf-8")
+            self.renders += 1
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(cached, html)
+        return html
+
+
+class GalleryRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """Static file handler with compression, validators and immutable caching of hashed assets"""
+
+    # Keep connections open between requests; every response carries a Content-Length
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY the body
+    # waits on the client's delayed ACK (~40 ms per keep-alive request)
+    disable_nagle_algorithm = True
+    # SimpleHTTPRequestHandler only has index_pages from Python 3.12
+    index_pages = ("index.html", "index.htm")
+
+    def setup(self):
+        # Idle keep-alive connections are dropped after this many seconds
+        self.timeout = getattr(self.server, "idle_timeout", None)
+        self.busy = False
+        super().setup()
+        if hasattr(self.server, "track"):
+            self.server.track(self)
+
+    def finish(self):
+        try:
+            super().finish()
+        finally:
+            if hasattr(self.server, "untrack"):
+                self.server.untrack(self)
+
+    def parse_request(self):
+        self.busy = True
+        return super().parse_request()
+
+    def handle_one_request(self):
+        super().handle_one_request()
+        self.busy = False
+        if getattr(self.server, "draining", False):
+            self.close_connection = True
+
+    def end_headers(self):
+        if getattr(self.server, "draining", False):
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        super().end_headers()
+
+    def send_head(self):
+        """Serve files with content negotiation, validators, byte ranges and the server's file cache"""
+        self.body_range = None
+        api_index = getattr(self.server, "api", None)
+        if api_index is not None and self.path.startswith(API_PREFIX):
+            return self.send_api(api_index)
+
+        renderer = getattr(self.server, "renderer", None)
+        if renderer is not None:
+            json_path = renderer.source_for(self.path)
+            if json_path is not None:
+                return self.send_rendered(renderer, json_path)
+
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            if not urllib.parse.urlsplit(self.path).path.endswith("/"):
+                return super().send_head()
+            for index in self.index_pages:
+                if os.path.isfile(os.path.join(path, index)):
+                    path = os.path.join(path, index)
+                    break
+            else:
+                return super().send_head()
+        if path.endswith("/"):
+            return super().send_head()
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+
+        ctype = self.guess_type(path)
+        compressible = ctype.startswith(COMPRESSIBLE_TYPES)
+        body_path, body_stat, encoding = self.select_variant(path, stat, compressible)
+        # Precompressed siblings are already encoded; anything else is compressed here
+        compress_as = encoding if body_path == path else None
+        return self.send_entity(ctype, make_etag(body_stat, encoding), stat.st_mtime, encoding, compressible,
+                                lambda: self.open_body(body_path, body_stat, compress_as))
+
+    def send_api(self, api_index):
+        """Answer a JSON API request (see api.py)"""
+        status, payload = handle_request(api_index, self.path)
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        encoding = None
+        if len(body) >= MIN_COMPRESS_SIZE:
+            encoding = next((e for e, _ in self.accepted_encodings() if e in supported_encodings()), None)
+        if encoding:
+            body = compress(body, encoding)
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        return io.BytesIO(body)
+
+    def send_rendered(self, renderer, json_path):
+        """Serve a debate page rendered from its JSON source"""
+        try:
+            stat = os.stat(json_path)
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+        encoding = next((e for e, _ in self.accepted_encodings() if e in supported_encodings()), None)
+        etag = f'"{renderer.fingerprint}-{make_etag(stat, encoding)[1:]}'
+
+        return self.send_entity("text/html; charset=utf-8", etag, stat.st_mtime, encoding, True,
+                                lambda: io.BytesIO(renderer.page(json_path, stat, encoding)))
+
+    def send_entity(self, ctype, etag, mtime, encoding, vary, open_body):
+        """Send the headers for one representation, answering 304/206/416 as the request asks.
+
+        open_body() is only called when a body is needed; returns the file object to copy, or None.
+        """
+        headers = [
+            ("ETag", etag),
+            ("Last-Modified", self.date_time_string(mtime)),
+            ("Cache-Control", self.cache_control()),
+            ("Accept-Ranges", "bytes"),
+        ]
+        if vary:
+            headers.append(("Vary", "Accept-Encoding"))
+
+        if self.not_modified(etag, mtime):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            for name, value in headers:
+                self.send_header(name, value)
+            self.end_headers()
+            return None
+
+        try:
+            body = open_body()
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+        except RenderError as e:
+            self.log_error("%s", e)
+            self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR, "Could not render debate")
+            return None
+        length = body.seek(0, io.SEEK_END)
+        body.seek(0)
+
+        byte_range = None
+        if "Range" in self.headers and self.range_applies(etag, mtime):
+            byte_range = parse_range(self.headers["Range"], length)
+        if byte_range == "unsatisfiable":
+            body.close()
+            self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+            self.send_header("Content-Range", f"bytes */{length}")
+            self.send_header("Content-Length", "0")
+            for name, value in headers:
+                self.send_header(name, value)
+            self.end_headers()
+            return None
+
+        if byte_range is None:
+            self.body_range = (0, length)
+            self.send_response(HTTPStatus.OK)
+        else:
+            start, end = byte_range
+            self.body_range = (start, end - start + 1)
+            self.send_response(HTTPStatus.PARTIAL_CONTENT)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{length}")
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(self.body_range[1]))
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        return body
+
+    def range_applies(self, etag, mtime):
+        """Evaluate If-Range: a Range only applies if the client's copy is still current"""
+        if_range = self.headers.get("If-Range")
+        if if_range is None:
+            return True
+        if_range = if_range.strip()
+        if if_range.startswith(('"', "W/")):
+            # If-Range needs a strong match
+            return if_range == etag
+        return if_range == self.date_time_string(mtime)
+
+    def copyfile(self, source, outputfile):
+        """Send the selected byte range of source, via sendfile() for large files on disk"""
+        if self.body_range is None:
+            return super().copyfile(source, outputfile)
+
+        offset, count = self.body_range
+        if count >= SENDFILE_MIN_BYTES and not isinstance(source, io.BytesIO):
+            # Headers were flushed by end_headers(), so the socket is ours
+            self.connection.sendfile(source, offset, count)
+            return
+
+        source.seek(offset)
+        while count > 0:
+            chunk = source.read(min(count, 64 * 1024))
+            if not chunk:
+                break
+            outputfile.write(chunk)
+            count -= len(chunk)
+
+    def cache_control(self):
+        # Bundled assets are content-hashed, so their URL changes whenever they do
+        if self.path.startswith("/assets/"):
+            return "public, max-age=31536000, immutable"
+        return "no-cache"
+
+    def accepted_encodings(self):
+        """(coding, sibling suffix) pairs the client accepts, best first"""
+        accepted = parse_accept_encoding(self.headers.get("Accept-Encoding"))
+        quality = {encoding: accepted.get(encoding, accepted.get("*", 0.0)) for encoding, _ in ENCODINGS}
+        # Highest q-value first; ties keep the server's preference order
+        return sorted(
+            ((encoding, suffix) for encoding, suffix in ENCODINGS if quality[encoding] > 0),
+            key=lambda item: -quality[item[0]],
+        )
+
+    def select_variant(self, path, stat, compressible):
+        """Pick the representation to send: (file to read, its stat, content coding or None).
+
+        A fresh precompressed sibling (path.br / path.gz, stamped with path's
+        mtime) is preferred; otherwise small enough compressible files are compressed on
+        the fly.
+        """
+        if not compressible:
+            return path, stat, None
+        wanted = self.accepted_encodings()
+        for encoding, suffix in wanted:
+            try:
+                sibling_stat = os.stat(path + suffix)
+            except OSError:
+                continue
+            if sibling_is_fresh(sibling_stat, stat):
+                return path + suffix, sibling_stat, encoding
+        if MIN_COMPRESS_SIZE <= stat.st_size <= self.cache_entry_limit():
+            for encoding, _ in wanted:
+                if encoding in supported_encodings():
+                    return path, stat, encoding
+        return path, stat, None
+
+    def cache_entry_limit(self):
+        file_cache = getattr(self.server, "file_cache", None)
+        return file_cache.max_entry_bytes if file_cache is not None else DEFAULT_CACHE_ENTRY_BYTES
+
+    def open_body(self, body_path, body_stat, compress_as=None):
+        """Return a file object for the response body, compressing it first if compress_as is set"""
+        file_cache = getattr(self.server, "file_cache", None)
+        if compress_as is None and (file_cache is None or body_stat.st_size > file_cache.max_entry_bytes):
+            return open(body_path, "rb")
+
+        def load():
+            with open(body_path, "rb") as f:
+                data = f.read()
+            return compress(data, compress_as) if compress_as else data
+
+        if file_cache is None:
+            return io.BytesIO(load())
+        validator = (body_stat.st_mtime_ns, body_stat.st_size)
+        return io.BytesIO(file_cache.get((body_path, compress_as), validator, load))
+
+    def not_modified(self, etag, mtime):
+        """Evaluate If-None-Match, falling back to If-Modified-Since as RFC 9110 prescribes"""
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            # Weak comparison: W/"x" matches "x"
+            return "*" in tags or etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since is None:
+            return False
+        try:
+            since = email.utils.parsedate_to_datetime(if_modified_since)
+        except (TypeError, IndexError, OverflowError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=datetime.timezone.utc)
+        modified = datetime.datetime.fromtimestamp(mtime, datetime.timezone.utc).replace(microsecond=0)
+        return modified <= since
+
+    def log_message(self, format, *args):
+        if getattr(self.server, "access_log", True):
+            super().log_message(format, *args)
+
+
+class GalleryServer(http.server.HTTPServer):
+    """HTTP server that handles connections on a bounded thread pool.
+
+    Each keep-alive connection occupies a worker until it goes idle for
+    idle_timeout seconds, so workers bounds concurrent connections; further
+    connections wait in the listen backlog.
+    """
+
+    allow_reuse_address = True
+    request_queue_size = 128
+
+    def __init__(self, server_address, handler_class, workers=DEFAULT_WORKERS,
+                 idle_timeout=DEFAULT_IDLE_TIMEOUT, access_log=True, cache_bytes=DEFAULT_CACHE_BYTES,
+                 renderer=None, api=None):
+        if ":" in server_address[0]:
+            self.address_family = socket.AF_INET6
+        super().__init__(server_address, handler_class)
+        self.idle_timeout = idle_timeout
+        self.access_log = access_log
+        self.file_cache = FileCache(cache_bytes) if cache_bytes > 0 else None
+        self.renderer = renderer
+        self.api = api
+        self.draining = False
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="serve")
+        self._futures = set()
+        self._handlers = set()
+        self._lock = threading.Lock()
+
+    def process_request(self, request, client_address):
+        future = self._executor.submit(self._process_request, request, client_address)
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(self._discard_future)
+
+    def _process_request(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def _discard_future(self, future):
+        with self._lock:
+            self._futures.discard(future)
+
+    def track(self, handler):
+        with self._lock:
+            self._handlers.add(handler)
+
+    def untrack(self, handler):
+        with self._lock:
+            self._handlers.discard(handler)
+
+    def _close_connections(self, idle_only):
+        with self._lock:
+            handlers = list(self._handlers)
+        for handler in handlers:
+            if idle_only and handler.busy:
+                continue
+            try:
+                # Wakes a handler blocked reading the next request so it exits cleanly
+                handler.connection.shutdown(socket.SHUT_RD if idle_only else socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def drain(self, grace=DEFAULT_GRACE):
+        """Finish in-flight requests (waiting up to grace seconds), close idle connections, then stop.
+
+        Call after serve_forever() has returned so no new connections are accepted.
+        Returns the number of connections that had to be cut off.
+        """
+        self.draining = True
+        self._close_connections(idle_only=True)
+        with self._lock:
+            pending = set(self._futures)
+        _, not_done = wait(pending, timeout=grace)
+        if not_done:
+            self._close_connections(idle_only=False)
+        self._executor.shutdown(wait=True)
+        self.server_close()
+        return len(not_done)
+
+
+def create_server(directory="published", bind="", port=8000, workers=DEFAULT_WORKERS,
+                  idle_timeout=DEFAULT_IDLE_TIMEOUT, access_log=True, cache_bytes=DEFAULT_CACHE_BYTES,
+                  render_from=None, render_cache_dir=None, api=True):
+    """Create a GalleryServer serving directory; port 0 picks a free port.
+
+    With render_from, debate pages whose JSON source is in that directory are
+    rendered on request instead of read from directory. Unless api is False,
+    /api/ serves the JSON query API over directory's manifest.
+    """
+    handler = partial(GalleryRequestHandler, directory=str(directory))
+    renderer = OnDemandRenderer(render_from, render_cache_dir, cache_bytes) if render_from else None
+    return GalleryServer((bind, port), handler, workers=workers, idle_timeout=idle_timeout,
+                         access_log=access_log, cache_bytes=cache_bytes, renderer=renderer,
+                         api=DebateIndex(directory) if api else None)
+
+
+def install_shutdown_handlers(server):
+    """Stop accepting connections on SIGINT/SIGTERM so the caller can drain the server"""
+    def request_shutdown(signum, frame):
+        # shutdown() blocks until serve_forever() returns, so it cannot run on
+        # the thread that is executing serve_forever()
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGINT, request_shutdown)
+    signal.signal(signal.SIGTERM, request_shutdown)
+
+
+def main(argv=None):
     """Start a local HTTP server to view published debates."""
-    port = 8000
-    directory = "published"
-    
-    # Check if published directory exists and has content
-    published_dir = Path(directory)
-    if not published_dir.exists():
-        print(f"Error: {directory} directory does not exist")
-        print("You need to publish at least one debate first. Run:")
-        print("  ./publish.py conversations/your_debate_file.html")
-        sys.exit(1)
-    
-    index_file = published_dir / "index.html"
-    if not index_file.exists():
-        print(f"Error: {directory}/index.html does not exist")
-        print("You need to publish at least one debate first. Run:")
-        print("  ./publish.py conversations/your_debate_file.html")
-        sys.exit(1)
-    
-    # Set up the server
-    handler = http.server.SimpleHTTPRequestHandler
-    
-    # Change to the published directory
-    os.chdir(directory)
-    
+    parser = argparse.ArgumentParser(description="Serve the published debate gallery")
+    parser.add_argument("--bind", default="", help="Address to bind (default: all interfaces)")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on (default: 8000)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Worker threads, i.e. concurrent connections (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT,
+                        help=f"Seconds before an idle keep-alive connection is closed (default: {DEFAULT_IDLE_TIMEOUT:g})")
+    parser.add_argument("--grace", type=float, default=DEFAULT_GRACE,
+                        help=f"Seconds to let in-flight requests finish on shutdown (default: {DEFAULT_GRACE:g})")
+    parser.add_argument("--cache-mb", type=float, default=DEFAULT_CACHE_BYTES / (1024 * 1024),
+                        help="Memory for caching hot files, in MB; 0 disables (default: %(default)g)")
+    parser.add_argument("--directory", default="published", help="Directory to serve (default: published)")
+    parser.add_argument("--render-from", metavar="DIR",
+                        help="Render debate pages on request from the JSON files in DIR (e.g. conversations)")
+    parser.add_argument("--render-cache", metavar="DIR",
+                        help="Cache directory for --render-from pages (default: .render_cache)")
+    parser.add_argument("--no-api", action="store_true", help="Don't serve the JSON API under /api/")
+    parser.add_argument("--no-browser", action="store_true", help="Don't open a browser")
+    parser.add_argument("--quiet", action="store_true", help="Don't log every request")
+    args = parser.parse_args(argv)
+
+    directory = args.directory
+
+    if args.render_from:
+        if not Path(args.render_from).is_dir():
+            print(f"Error: {args.render_from} directory does not exist")
+            sys.exit(1)
+        # Without a published gallery, serve the source directory itself
+        if not Path(directory).is_dir():
+            directory = args.render_from
+        print(f"Rendering debate pages on request from {args.render_from}/")
+
+    else:
+        # Check if published directory exists and has content
+        published_dir = Path(directory)
+        if not published_dir.exists():
+            print(f"Error: {directory} directory does not exist")
+            print("You need to publish at least one debate first. Run:")
+            print("  ./publish.py conversations/your_debate_file.html")
+            sys.exit(1)
+
+        index_file = published_dir / "index.html"
+        if not index_file.exists():
+            print(f"Error: {directory}/index.html does not exist")
+            print("You need to publish at least one debate first. Run:")
+            print("  ./publish.py conversations/your_debate_file.html")
+            sys.exit(1)
+
     # Create the server
-    with socketserver.TCPServer(("", port), handler) as httpd:
-        url = f"http://localhost:{port}/"
-        print(f"Server started at {url}")
-        print("Open your browser to view the debates")
-        print("Press Ctrl+C to stop the server")
-        
-        # Open the browser automatically
+    httpd = create_server(directory, args.bind, args.port, workers=args.workers,
+                          idle_timeout=args.idle_timeout, access_log=not args.quiet,
+                          cache_bytes=int(args.cache_mb * 1024 * 1024),
+                          render_from=args.render_from, render_cache_dir=args.render_cache,
+                          api=not args.no_api)
+    install_shutdown_handlers(httpd)
+
+    host = args.bind if args.bind not in ("", "0.0.0.0", "::") else "localhost"
+    if ":" in host:
+        host = f"[{host}]"
+    url = f"http://{host}:{httpd.server_address[1]}/"
+    print(f"Server started at {url} ({args.workers} workers)")
+    print("Open your browser to view the debates")
+    print("Press Ctrl+C to stop the server")
+
+    # Open the browser automatically
+    if not args.no_browser:
         webbrowser.open(url)
-        
-        # Keep the server running until interrupted
-        try:
-            httpd.serve_forever()
-        except KeyboardInterrupt:
-            print("\nServer stopped")
+
+    # Keep the server running until interrupted, then let in-flight requests finish
+    httpd.serve_forever()
+    print("\nShutting down...")
+    cut_off = httpd.drain(args.grace)
+    if cut_off:
+        print(f"Closed {cut_off} connection(s) that did not finish within {args.grace:g}s")
+    print("Server stopped")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,24 +1,46 @@
 #!/usr/bin/env uv run
 """Stage all conversation HTML files for deployment."""
 
-import subprocess
+import argparse
 from pathlib import Path
 
+import publish
+from profiling import add_profile_arguments, start_from_args
+
+
+def find_debate_pages(conv_dir):
+    """Return the debate pages in conv_dir, excluding lazy-render fragment pages"""
+    return sorted(path for path in conv_dir.glob("*.html") if ".part-" not in path.name)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Publish every debate in conversations/ in one pass")
+    parser.add_argument("--minify", action="store_true", help="Minify the published HTML")
+    parser.add_argument("--force", action="store_true", help="Copy files even if the published copies are up to date")
+    parser.add_argument("--precompress", action="store_true", help="Write .gz (and .br) copies of published text files for serve.py")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Report every file copied")
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+    start_from_args(args)
 
-def main():
     conv_dir = Path("conversations")
     if not conv_dir.exists():
         print(f"{conv_dir} does not exist. Nothing to stage.")
         return
 
-    html_files = sorted(conv_dir.glob("*.html"))
+    html_files = find_debate_pages(conv_dir)
     if not html_files:
         print("No HTML files found in conversations directory.")
         return
 
-    for html_file in html_files:
-        print(f"Publishing {html_file}...")
-        subprocess.run(["./publish.py", str(html_file)], check=True)
+    print(f"Publishing {len(html_files)} debate(s) from {conv_dir}...")
+    summary = publish.publish_many(html_files, "published", minify=args.minify,
+                                   force=args.force, verbose=args.verbose)
+    publish.print_summary(summary)
+    if args.precompress:
+        publish.report_precompressed("published")
+    if summary["failures"]:
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Synthetic debate generator for benchmarks
+Produces debate JSON in the same shape debate.py saves, with tunable size and
+content mix, deterministically from a seed, and web pages with a known article
+buried in boilerplate for the fetch extraction benchmark
+"""
+
+import json
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+WORDS = (
+    "evidence argument policy outcome cost benefit study data risk market society "
+    "labor energy climate model claim premise counterpoint rebuttal history trend "
+    "incentive regulation innovation productivity equity access scale adoption survey"
+).split()
+
+TOPICS = [
+    "Is remote work better than office work?",
+    "Should nuclear power replace fossil fuels?",
+    "Is universal basic income a good idea?",
+    "Should cities ban cars from downtown areas?",
+    "Is open source software more secure?",
+    "Should social media be regulated like utilities?",
+]
+
+MODELS = ["opus", "sonnet", "haiku"]
+
+BOILERPLATE_WORDS = (
+    "subscribe newsletter account login privacy cookies accept settings home "
+    "trending popular sponsored offer deal shop follow share menu search sign"
+).split()
+
+CODE_SAMPLE = """```python
+def weigh(evidence, prior=0.5):
+    score = prior
+    for item in evidence:
+        score += item.weight * (1 if item.supports else -1)
+    return max(0.0, min(1.0, score))
+```"""
+
+
+@dataclass
+class DebateShape:
+    """Knobs for the size and content mix of a synthetic debate"""
+    turns: int = 10
+    message_words: int = 250
+    markdown_density: float = 0.5  # share of paragraphs using emphasis, lists or quotes
+    code_density: float = 0.1  # chance a message includes a code block
+    searches: int = 1  # search result blocks per message
+    fetches: int = 0  # fetched-content blocks per message
+    fetch_words: int = 400
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def _paragraph(rng: random.Random, words: int, markdown_density: float) -> str:
+    sentences = []
+    while words > 0:
+        length = min(words, rng.randint(8, 20))
+        sentences.append(_sentence(rng, length))
+        words -= length
+    if rng.random() >= markdown_density:
+        return " ".join(sentences)
+
+    style = rng.randrange(4)
+    if style == 0:
+        return f"**{sentences[0]}** " + " ".join(sentences[1:])
+    if style == 1:
+        return "\n".join(f"- {sentence}" for sentence in sentences)
+    if style == 2:
+        return "\n".join(f"> {sentence}" for sentence in sentences)
+    return f"### {sentences[0].rstrip('.')}\n\n" + " ".join(f"*{s}*" for s in sentences[1:])
+
+
+def _search_block(rng: random.Random, n: int) -> str:
+    query = " ".join(rng.choice(WORDS) for _ in range(3))
+    results = "\n".join(
+        f"{i}. {_sentence(rng, 5)}\n   https://example.com/{rng.choice(WORDS)}/{n}-{i}\n   {_sentence(rng, 25)}\n"
+        for i in range(1, 4)
+    )
+    return f"[Search Results for '{query}':\n{results}]"
+
+
+def _fetch_block(rng: random.Random, n: int, words: int) -> str:
+    return f"[Fetched Content:\nContent from https://example.com/article/{n}:\n{_sentence(rng, words)}]"
+
+
+def make_message(rng: random.Random, index: int, shape: DebateShape, start_time: float) -> Dict[str, Any]:
+    """One turn of a synthetic debate"""
+    paragraphs = []
+    remaining = shape.message_words
+    while remaining > 0:
+        words = min(remaining, rng.randint(40, 90))
+        paragraphs.append(_paragraph(rng, words, shape.markdown_density))
+        remaining -= words
+    if rng.random() < shape.code_density:
+        paragraphs.insert(rng.randint(0, len(paragraphs)), CODE_SAMPLE)
+    for n in range(shape.searches):
+        paragraphs.insert(rng.randint(0, len(paragraphs)), _search_block(rng, index * 10 + n))
+    for n in range(shape.fetches):
+        paragraphs.insert(rng.randint(0, len(paragraphs)), _fetch_block(rng, index * 10 + n, shape.fetch_words))
+
+    timestamp = start_time + index * 30
+    participant = f"claude_{index % 2 + 1}"
+    return {
+        "role": "assistant",
+        "content": "\n\n".join(paragraphs),
+        "timestamp": timestamp,
+        "participant": participant,
+        "searches": [
+            {"query": " ".join(rng.choice(WORDS) for _ in range(3)), "timestamp": timestamp,
+             "participant": participant, "url": None}
+            for _ in range(shape.searches)
+        ],
+    }
+
+
+def make_debate(seed: int = 0, shape: DebateShape = DebateShape()) -> Dict[str, Any]:
+    """A complete synthetic debate, identical for identical seed and shape"""
+    rng = random.Random(seed)
+    start_time = 1735689600.0 + seed * 3600
+    conversation = [make_message(rng, i, shape, start_time) for i in range(shape.turns)]
+    return {
+        "config": {"topic": rng.choice(TOPICS), "max_turns": shape.turns, "api_key": None,
+                   "model_name": rng.choice(MODELS)},
+        "conversation": conversation,
+        "metadata": {
+            "total_turns": len(conversation),
+            "start_time": conversation[0]["timestamp"] if conversation else None,
+            "end_time": conversation[-1]["timestamp"] if conversation else None,
+        },
+    }
+
+
+def write_corpus(directory, count: int, shape: DebateShape = DebateShape(), seed: int = 0) -> List[Path]:
+    """Write count synthetic debates to directory/synthetic_<n>.json"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for n in range(count):
+        path = directory / f"synthetic_{n}.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(make_debate(seed + n, shape), f, ensure_ascii=False)
+        paths.append(path)
+    return paths
+
+
+def _boilerplate(rng: random.Random, words: int) -> str:
+    text = " ".join(rng.choice(BOILERPLATE_WORDS) for _ in range(words))
+    return text[0].upper() + text[1:]
+
+
+def make_page(seed: int = 0, paragraphs: int = 8, links: int = 30) -> Tuple[str, List[str]]:
+    """A news-style HTML page and the sentences of its article
+
+    The article sits among navigation, a cookie banner, a sidebar, comments,
+    a footer and inline scripts, in one of three layouts chosen by the seed
+    """
+    rng = random.Random(seed)
+    sentences: List[str] = []
+    body = []
+    for _ in range(paragraphs):
+        paragraph = [_sentence(rng, rng.randint(10, 24)).replace(" ", ", ", 1) for _ in range(rng.randint(2, 5))]
+        sentences.extend(paragraph)
+        body.append(f"<p>{' '.join(paragraph)}</p>")
+    headline = _sentence(rng, 6).rstrip(".")
+    article = f"<h1>{headline}</h1>\n<p class=\"byline\">By Staff</p>\n" + "\n".join(body)
+
+    layout = seed % 3
+    if layout == 0:
+        article = f"<article>{article}</article>"
+    elif layout == 1:
+        article = f"<div id=\"main-content\" class=\"post\">{article}</div>"
+    else:
+        article = f"<div class=\"col\"><div>{article}</div></div>"
+
+    def link_list(count: int) -> str:
+        return "".join(f"<li><a href=\"/{i}\">{_boilerplate(rng, 2)}</a></li>" for i in range(count))
+
+    script = "var config = {" + ", ".join(f"k{i}: {i}" for i in range(200)) + "};"
+    html = f"""<!DOCTYPE html>
+<html><head><title>{headline} | Example News</title>
+<style>body {{ font-family: sans-serif; }} .nav li {{ display: inline; }}</style>
+<script>{script}</script></head>
+<body>
+<div id="cookie-consent"><p>{_boilerplate(rng, 30)}</p><button>Accept</button></div>
+<header class="site-header"><div class="logo">Example News</div>
+<nav class="nav"><ul>{link_list(links)}</ul></nav></header>
+<div class="container">
+{article}
+<div class="sidebar"><h3>Trending</h3><ul>{link_list(links // 2)}</ul><p>{_boilerplate(rng, 40)}</p></div>
+</div>
+<div class="comments"><h3>Comments</h3>{"".join(f"<p>{_boilerplate(rng, 20)}</p>" for _ in range(5))}</div>
+<footer><ul>{link_list(links // 2)}</ul><p>{_boilerplate(rng, 25)}</p></footer>
+<script>window.dataLayer = window.dataLayer || []; {script}</script>
+</body></html>"""
+    return html, sentences
@@ -0,0 +1,106 @@
+import json
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from api import DebateIndex, decode_cursor, encode_cursor, handle_request, parse_time
+from manifest import MANIFEST_FILE, Manifest
+from test_json_to_html import make_debate
+
+DAY = 86400
+JAN_1 = 1735689600  # 2025-01-01T00:00:00Z
+
+
+def entry(n, model="opus", title=None, start=None):
+    return {"file": f"debate_{n}.html", "json": f"debate_{n}.json", "title": title or f"Topic {n}",
+            "model": model, "turns": 2, "published": JAN_1 + n * DAY + 60,
+            "start_time": start if start is not None else JAN_1 + n * DAY, "end_time": None}
+
+
+class TestDebateIndex(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.write_manifest([
+            entry(0, "opus", "Remote work"),
+            entry(1, "sonnet", "Nuclear power"),
+            entry(2, "opus", "Nuclear fusion"),
+            entry(3, "opus", "Universal basic income"),
+        ])
+        self.index = DebateIndex(self.test_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def write_manifest(self, entries):
+        manifest = Manifest.load(Path(self.test_dir) / MANIFEST_FILE)
+        for e in entries:
+            manifest.upsert(e)
+        manifest.flush()
+
+    def ids(self, result):
+        return [d["id"] for d in result["debates"]]
+
+    def test_filters(self):
+        self.assertEqual(self.ids(self.index.query()), ["debate_3", "debate_2", "debate_1", "debate_0"])
+        self.assertEqual(self.ids(self.index.query(model="OPUS")), ["debate_3", "debate_2", "debate_0"])
+        self.assertEqual(self.ids(self.index.query(q="nuclear")), ["debate_2", "debate_1"])
+        self.assertEqual(self.ids(self.index.query(model="opus", q="nuclear")), ["debate_2"])
+        since, until = parse_time("2025-01-02"), parse_time("2025-01-03", end=True)
+        self.assertEqual(self.ids(self.index.query(since=since, until=until)), ["debate_2", "debate_1"])
+        self.assertEqual(self.index.query(model="missing"), {"debates": [], "next_cursor": None})
+
+    def test_cursor_pagination_is_stable(self):
+        first = self.index.query(limit=2)
+        self.assertEqual(self.ids(first), ["debate_3", "debate_2"])
+
+        # A debate published between page requests does not shift later pages
+        self.write_manifest([entry(9)])
+        second = self.index.query(limit=2, cursor=first["next_cursor"])
+        self.assertEqual(self.ids(second), ["debate_1", "debate_0"])
+        self.assertIsNone(second["next_cursor"])
+        self.assertEqual(self.ids(self.index.query(limit=1)), ["debate_9"])
+
+    def test_turn_slices(self):
+        with open(Path(self.test_dir) / "debate_2.json", "w") as f:
+            json.dump(make_debate("Nuclear fusion", turns=6), f)
+        result = self.index.turns("debate_2", 2, 4)
+        self.assertEqual((result["total_turns"], result["start"], result["end"]), (6, 2, 4))
+        self.assertEqual([t["content"] for t in result["turns"]],
+                         ["Turn 2 on **Nuclear fusion**", "Turn 3 on **Nuclear fusion**"])
+
+        self.assertEqual(handle_request(self.index, "/api/debates/debate_0/turns")[0], 404)
+        self.assertEqual(handle_request(self.index, "/api/debates/nope")[0], 404)
+
+    def test_handle_request(self):
+        status, payload = handle_request(self.index, "/api/debates?model=opus&since=2025-01-03&limit=1")
+        self.assertEqual(status, 200)
+        self.assertEqual(self.ids(payload), ["debate_3"])
+        status, payload = handle_request(self.index, f"/api/debates?limit=1&cursor={payload['next_cursor']}")
+        self.assertEqual(self.ids(payload), ["debate_2"])
+
+        self.assertEqual(handle_request(self.index, "/api/debates/debate_1")[1]["title"], "Nuclear power")
+        self.assertEqual(handle_request(self.index, "/api/debates?since=yesterday")[0], 400)
+        self.assertEqual(handle_request(self.index, "/api/debates?cursor=!!")[0], 400)
+        self.assertEqual(handle_request(self.index, "/api/debates?limit=0")[0], 400)
+        self.assertEqual(handle_request(self.index, "/api/other")[0], 404)
+
+    def test_cursor_round_trip(self):
+        self.assertEqual(decode_cursor(encode_cursor((1.5, "debate_1.html"))), (1.5, "debate_1.html"))
+
+    def test_large_corpus_queries_are_fast(self):
+        self.write_manifest([entry(n, "opus" if n % 3 else "sonnet") for n in range(20000)])
+        self.index.refresh()
+
+        start = time.perf_counter()
+        cursor = None
+        for _ in range(20):
+            result = self.index.query(model="sonnet", limit=50, cursor=cursor)
+            cursor = result["next_cursor"]
+        self.index.query(since=parse_time("2030-01-01"), until=parse_time("2030-02-01"))
+        self.assertLess((time.perf_counter() - start) / 21, 0.01)
+
+
+if __name__ == "__main__":
+    unittest.main()
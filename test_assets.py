@@ -0,0 +1,59 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from assets import build_stylesheet, externalize_stylesheet, minify_css, minify_html
+
+
+class TestAssets(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_minify_css(self):
+        css = """
+            /* comment */
+            .a, .b {
+                color: #333;
+                margin: 0 auto;
+            }
+            @media (max-width: 768px) {
+                .a { padding: 0; }
+            }
+        """
+        self.assertEqual(minify_css(css), ".a,.b{color:#333;margin:0 auto}@media (max-width:768px){.a{padding:0}}")
+
+    def test_minify_css_keeps_selectors_and_strings(self):
+        self.assertEqual(minify_css(".a :hover { color: red; }"), ".a :hover{color:red}")
+        self.assertEqual(minify_css('p::before { content: "a ; b" ; }'), 'p::before{content:"a ; b"}')
+        self.assertEqual(minify_css('a[title="x : y"] > b { color : red }'), 'a[title="x : y"]>b{color:red}')
+        self.assertEqual(minify_css("q { content: '/* kept */'; }"), "q{content:'/* kept */'}")
+
+    def test_minify_html_preserves_pre(self):
+        html = "<div>\n    <p>one  <strong>two</strong></p>\n</div>\n<pre>  keep\n    this</pre>"
+        self.assertEqual(minify_html(html), "<div>\n<p>one <strong>two</strong></p>\n</div>\n<pre>  keep\n    this</pre>")
+
+    def test_stylesheet_is_content_hashed(self):
+        href = build_stylesheet(self.test_dir, [".a { color: red; }"])
+        self.assertTrue((Path(self.test_dir) / href).exists())
+        self.assertEqual(build_stylesheet(self.test_dir, [".a{color:red}"]), href)
+        self.assertNotEqual(build_stylesheet(self.test_dir, [".a { color: blue; }"]), href)
+
+    def test_externalize_only_matching_stylesheet(self):
+        css = "\n    body { color: red; }\n"
+        page = f"<head><style>{css}</style></head>"
+
+        html, replaced = externalize_stylesheet(page, "body{color:red}", "assets/site.abc.css")
+        self.assertTrue(replaced)
+        self.assertEqual(html, '<head><link rel="stylesheet" href="assets/site.abc.css"></head>')
+
+        html, replaced = externalize_stylesheet(page, "body{color:blue}", "assets/site.abc.css")
+        self.assertFalse(replaced)
+        self.assertEqual(html, page)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import contextlib
+import io
+import unittest
+from types import SimpleNamespace
+
+from compaction import (COMPACTED_MARKER, compact_tool_results, request_chars, summarize_tool_result,
+                        tool_result_chars)
+from debate import ClaudeDebater
+
+PAGE = ("Content from https://example.com/study:\n"
+        + "Filler sentence without figures. " * 100
+        + "Output rose 12% in 2023 according to the survey. More filler here.")
+
+
+def tool_round(n):
+    return [
+        {"role": "assistant", "content": [{"type": "tool_use", "id": f"tool_{n}", "name": "web_fetch", "input": {}}]},
+        {"role": "user", "content": [{"type": "tool_result", "tool_use_id": f"tool_{n}", "content": PAGE}]},
+    ]
+
+
+class TestCompaction(unittest.TestCase):
+    def test_summary_keeps_header_sources_and_figures(self):
+        summary = summarize_tool_result(PAGE)
+        self.assertTrue(summary.startswith(f"{COMPACTED_MARKER} Content from https://example.com/study:"))
+        self.assertNotIn("Sources:", summary)
+        self.assertIn("- Output rose 12% in 2023 according to the survey.", summary)
+        self.assertNotIn("Filler", summary)
+
+    def test_search_summary_lists_sources(self):
+        results = ("Search results for 'output':\n"
+                   "1. Output report\n   https://a.example/report\n   Output fell sharply last year.\n"
+                   "2. Survey\n   https://b.example/survey\n   About 40 percent of firms agree.\n")
+        summary = summarize_tool_result(results)
+        self.assertIn("Sources: https://a.example/report https://b.example/survey", summary)
+        self.assertIn("About 40 percent of firms agree.", summary)
+
+    def test_compacts_oldest_first_and_keeps_pairing(self):
+        messages = [{"role": "user", "content": "Open"}] + tool_round(1) + tool_round(2) + tool_round(3)
+        before = request_chars(messages)
+        saved = compact_tool_results(messages, threshold=tool_result_chars(messages) - 1)
+
+        results = [m["content"][0] for m in messages if m["role"] == "user" and isinstance(m["content"], list)]
+        self.assertEqual([r["tool_use_id"] for r in results], ["tool_1", "tool_2", "tool_3"])
+        self.assertTrue(results[0]["content"].startswith(COMPACTED_MARKER))
+        self.assertEqual(results[1]["content"], PAGE)  # already under threshold after the first
+        self.assertEqual(results[2]["content"], PAGE)
+        self.assertEqual(request_chars(messages), before - saved)
+
+    def test_newest_results_and_small_requests_untouched(self):
+        messages = tool_round(1)
+        self.assertEqual(compact_tool_results(messages, threshold=1), 0)
+        self.assertEqual(messages[1]["content"][0]["content"], PAGE)
+        self.assertEqual(compact_tool_results(tool_round(1) + tool_round(2), threshold=10**6), 0)
+        self.assertEqual(compact_tool_results(tool_round(1) + tool_round(2), threshold=0), 0)
+
+    def test_transcript_does_not_count_toward_threshold(self):
+        transcript = [{"role": "user", "content": "Earlier argument. " * 5000}]
+        messages = transcript + tool_round(1) + tool_round(2)
+        self.assertEqual(compact_tool_results(messages, threshold=3 * len(PAGE)), 0)
+        self.assertGreater(compact_tool_results(messages, threshold=len(PAGE)), 0)
+
+
+class FakeClient:
+    """Asks for three fetches, one per request, then answers"""
+
+    def __init__(self):
+        self.sizes = []
+        self.tool_chars = []
+        self.messages = SimpleNamespace(create=self.create)
+
+    def create(self, system, messages, **kwargs):
+        self.sizes.append(request_chars(messages, system))
+        self.tool_chars.append(tool_result_chars(messages))
+        n = len(self.sizes)
+        if n <= 3:
+            block = SimpleNamespace(type="tool_use", id=f"tool_{n}", name="web_fetch",
+                                    input={"url": f"https://example.com/{n}"})
+        else:
+            block = SimpleNamespace(type="text", text="I argue that the evidence is clear.")
+        return SimpleNamespace(content=[block])
+
+
+class TestGenerateResponse(unittest.TestCase):
+    def test_request_size_stays_bounded(self):
+        sizes = {}
+        for threshold in (0, 5000):
+            client = FakeClient()
+            debater = ClaudeDebater(client, "claude_1")
+            debater.web_toolkit = SimpleNamespace(fetch_url=lambda url: PAGE)
+            with contextlib.redirect_stdout(io.StringIO()):
+                text, queries = debater.generate_response([], "Topic", "sonnet", compact_threshold=threshold)
+            self.assertEqual(text, "I argue that the evidence is clear.")
+            self.assertEqual(len(queries), 3)
+            self.assertEqual(debater.requests, 4)
+            sizes[threshold] = client.sizes
+            tool_chars = client.tool_chars
+        self.assertEqual(debater.compacted_chars, sizes[0][-1] - sizes[5000][-1])
+        self.assertGreater(sizes[0][-1], 3 * len(PAGE))
+        self.assertLessEqual(tool_chars[-1], 5000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+from convergence import ConvergenceDetector, MinHash, normalize_query, shingles
+
+ARGUMENT = ("Remote work raised output per hour by 4% in the 2023 survey of 3,000 firms, "
+            "and commuting costs fell for most employees while hiring pools widened across regions.")
+FRESH = ("Office attendance builds mentorship for junior staff, and the 2024 study of 40 teams "
+         "found faster onboarding when new hires sat beside experienced colleagues every week.")
+OTHER = ("Cities lose tax revenue when downtown offices empty, which strains transit budgets "
+         "and the small businesses that depend on weekday foot traffic near those towers.")
+
+
+class TestMinHash(unittest.TestCase):
+    def test_shingles(self):
+        self.assertEqual(shingles("The cat sat on", 3), {"the cat sat", "cat sat on"})
+        self.assertEqual(shingles("Hi", 3), {"hi"})
+        self.assertEqual(shingles("", 3), set())
+
+    def test_similarity_estimates_jaccard(self):
+        minhash = MinHash(num_hashes=256)
+        first, second = shingles(ARGUMENT), shingles(ARGUMENT + " " + FRESH)
+        exact = len(first & second) / len(first | second)
+        estimate = MinHash.similarity(minhash.signature(first), minhash.signature(second))
+        self.assertAlmostEqual(estimate, exact, delta=0.1)
+        self.assertEqual(MinHash.similarity(minhash.signature(first), minhash.signature(first)), 1.0)
+        self.assertEqual(MinHash.similarity(minhash.signature(first), None), 0.0)
+
+    def test_query_normalization(self):
+        self.assertEqual(normalize_query("Remote work productivity"), normalize_query("productivity, remote WORK"))
+        self.assertNotEqual(normalize_query("remote work"), normalize_query("remote work 2024"))
+
+
+class TestConvergenceDetector(unittest.TestCase):
+    def test_new_arguments_keep_the_debate_going(self):
+        detector = ConvergenceDetector(["claude_1", "claude_2"], patience=1)
+        for text in (ARGUMENT, FRESH, OTHER):
+            detector.observe("claude_1", text)
+            detector.observe("claude_2", text)
+        self.assertFalse(detector.converged)
+        self.assertEqual(detector.turns[0]["novelty"], 1.0)
+
+    def test_converges_once_every_participant_repeats(self):
+        detector = ConvergenceDetector(["claude_1", "claude_2"], patience=2)
+        detector.observe("claude_1", ARGUMENT)
+        detector.observe("claude_2", FRESH)
+        for _ in range(2):
+            detector.observe("claude_1", ARGUMENT)
+        # Only one side is stuck
+        self.assertFalse(detector.converged)
+        detector.observe("claude_2", FRESH)
+        detector.observe("claude_2", FRESH + " Indeed.")
+        self.assertTrue(detector.converged)
+        self.assertEqual(detector.to_dict()["converged_at_turn"], 6)
+
+    def test_repeated_queries_lower_novelty(self):
+        detector = ConvergenceDetector(["claude_1"])
+        detector.observe("claude_1", ARGUMENT, ["remote work productivity"])
+        fresh = detector.observe("claude_1", FRESH, ["office mentorship study"])
+        repeat = detector.observe("claude_1", OTHER, ["Productivity remote work"])
+        self.assertEqual(fresh["repeated_queries"], 0.0)
+        self.assertEqual(repeat["repeated_queries"], 1.0)
+        self.assertLess(repeat["novelty"], fresh["novelty"])
+
+
+if __name__ == "__main__":
+    unittest.main()
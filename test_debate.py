@@ -0,0 +1,170 @@
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from debate import ClaudeDebater, DebateConfig, DebateOrchestrator, Message, format_history
+
+
+def message(participant, content):
+    return Message(role="assistant", content=content, timestamp=0.0, participant=participant)
+
+
+class RecordingClient:
+    """Answers every request with a fixed opening line, keeping each request"""
+
+    def __init__(self, name):
+        self.name = name
+        self.requests = []
+        self.messages = SimpleNamespace(create=self.create)
+
+    def create(self, system, messages, **kwargs):
+        self.requests.append({"system": system, "messages": [dict(m) for m in messages]})
+        text = f"I argue the position of {self.name}."
+        return SimpleNamespace(content=[SimpleNamespace(type="text", text=text)])
+
+
+class TestFormatHistory(unittest.TestCase):
+    def test_two_party_history_alternates(self):
+        history = [message("claude_1", "Opening"), message("claude_2", "Rebuttal")]
+        self.assertEqual(format_history(history, "claude_2", "Topic"), [
+            {"role": "user", "content": "Opening"},
+            {"role": "assistant", "content": "Rebuttal"},
+        ])
+
+    def test_panel_messages_merge_with_attribution(self):
+        history = [message("claude_1", "A"), message("claude_2", "B"), message("claude_3", "C")]
+        formatted = format_history(history, "claude_2", "Topic", attribute=True)
+        self.assertEqual(formatted, [
+            {"role": "user", "content": "Claude 1: A"},
+            {"role": "assistant", "content": "B"},
+            {"role": "user", "content": "Claude 3: C"},
+        ])
+        # The first speaker's history would start with its own message
+        formatted = format_history(history, "claude_1", "Topic", attribute=True)
+        self.assertEqual(formatted[0], {"role": "user", "content": "Debate topic: Topic"})
+        self.assertEqual(formatted[2]["content"], "Claude 2: B\n\nClaude 3: C")
+
+
+class TestOpenings(unittest.TestCase):
+    def test_second_speaker_is_told_to_oppose(self):
+        client = RecordingClient("claude_2")
+        debater = ClaudeDebater(client, "claude_2")
+        with contextlib.redirect_stdout(io.StringIO()):
+            debater.generate_response([message("claude_1", "I argue for it.")], "Topic", "sonnet")
+        self.assertIn("OPPOSITE", client.requests[0]["system"])
+        self.assertEqual(debater.position, "I argue the position of claude_2.")
+
+
+class TestPanelDebate(unittest.TestCase):
+    def test_panel_rounds(self):
+        config = DebateConfig(topic="Topic", max_turns=2, api_key="test-key", participants=3, on_convergence="off")
+        orchestrator = DebateOrchestrator(config)
+        clients = {}
+        for debater in orchestrator.debaters:
+            debater.client = clients[debater.participant_id] = RecordingClient(debater.participant_id)
+
+        with contextlib.redirect_stdout(io.StringIO()), mock.patch("debate.time.sleep"):
+            conversation = orchestrator.run_debate()
+
+        self.assertEqual([msg["participant"] for msg in conversation], ["claude_1", "claude_2", "claude_3"] * 2)
+        opening = clients["claude_3"].requests[0]["system"]
+        self.assertIn("DIFFERENT", opening)
+        self.assertIn("Claude 2: I argue the position of claude_2.", opening)
+
+        # Every rebuttal in a round answers the same snapshot: all three openings, none of the round
+        for participant, client in clients.items():
+            rebuttal = client.requests[1]
+            text = "\n".join(m["content"] for m in rebuttal["messages"])
+            self.assertIn("panelist", rebuttal["system"])
+            for other in clients:
+                if other != participant:
+                    self.assertIn(f"Claude {other[-1]}: I argue the position of {other}.", text)
+            self.assertEqual(text.count("I argue"), 3)
+
+    def test_needs_two_participants(self):
+        with self.assertRaises(ValueError):
+            DebateOrchestrator(DebateConfig(topic="Topic", api_key="test-key", participants=1))
+
+
+class TestConvergence(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.test_dir)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.test_dir)
+
+    def run_debate(self, on_convergence):
+        config = DebateConfig(topic="Topic", max_turns=10, api_key="test-key", on_convergence=on_convergence)
+        orchestrator = DebateOrchestrator(config)
+        clients = {}
+        for debater in orchestrator.debaters:
+            debater.client = clients[debater.participant_id] = RecordingClient(debater.participant_id)
+        with contextlib.redirect_stdout(io.StringIO()), mock.patch("debate.time.sleep"):
+            conversation = orchestrator.run_debate()
+            with open(orchestrator.save_conversation()) as f:
+                metadata = json.load(f)["metadata"]
+        return conversation, metadata, clients
+
+    def test_repetition_leads_to_closing_statements(self):
+        conversation, metadata, clients = self.run_debate("close")
+        # Two openings, then two repeated turns each, then one closing statement each
+        self.assertEqual(len(conversation), 8)
+        self.assertEqual(metadata["end_reason"], "converged")
+        self.assertEqual(metadata["convergence"]["converged_at_turn"], 6)
+        self.assertEqual(len(metadata["convergence"]["turns"]), 6)
+        for client in clients.values():
+            self.assertIn("closing statement", client.requests[-1]["system"])
+            self.assertNotIn("closing statement", client.requests[-2]["system"])
+
+    def test_api_errors_are_not_convergence(self):
+        def failing(**kwargs):
+            raise RuntimeError("overloaded")
+
+        config = DebateConfig(topic="Topic", max_turns=4, api_key="test-key")
+        orchestrator = DebateOrchestrator(config)
+        for debater in orchestrator.debaters:
+            debater.client = SimpleNamespace(messages=SimpleNamespace(create=failing))
+        with contextlib.redirect_stdout(io.StringIO()), mock.patch("debate.time.sleep"):
+            conversation = orchestrator.run_debate()
+        self.assertEqual(len(conversation), 8)
+        self.assertEqual(orchestrator.end_reason, "max_turns")
+        self.assertEqual(orchestrator.convergence.turns, [])
+
+    def test_turn_numbers_count_failed_turns(self):
+        config = DebateConfig(topic="Topic", max_turns=10, api_key="test-key", on_convergence="stop")
+        orchestrator = DebateOrchestrator(config)
+        for debater in orchestrator.debaters:
+            debater.client = RecordingClient(debater.participant_id)
+        answer = orchestrator.debaters[0].client.create
+
+        def fail_once(**kwargs):
+            orchestrator.debaters[0].client.messages.create = answer
+            raise RuntimeError("overloaded")
+
+        orchestrator.debaters[0].client.messages.create = fail_once
+        with contextlib.redirect_stdout(io.StringIO()), mock.patch("debate.time.sleep"):
+            conversation = orchestrator.run_debate()
+        # Turn 1 failed, so claude_1 only stalls for the second time on turn 7
+        self.assertEqual(len(conversation), 7)
+        self.assertEqual(orchestrator.convergence.converged_at, 7)
+        self.assertEqual([turn["turn"] for turn in orchestrator.convergence.turns], [2, 3, 4, 5, 6, 7])
+
+    def test_stop_and_off(self):
+        conversation, metadata, _ = self.run_debate("stop")
+        self.assertEqual(len(conversation), 6)
+        self.assertEqual(metadata["end_reason"], "converged")
+
+        conversation, metadata, _ = self.run_debate("off")
+        self.assertEqual(len(conversation), 20)
+        self.assertEqual(metadata["end_reason"], "max_turns")
+        self.assertEqual(metadata["convergence"]["converged_at_turn"], 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+
+from bench_extract import run_benchmark
+from extract import extract_main_text, truncate
+from synthetic import BOILERPLATE_WORDS, make_page
+
+PAGE = """<html><head><title>Study finds X | Example News</title><script>var a = 1;</script></head><body>
+<header><a href="/">Home</a> <a href="/news">News</a></header>
+<div id="cookie-banner">We use cookies to improve your experience. Accept all cookies?</div>
+<div class="layout"><div class="sidebar"><p>Related: ten things you must know about something else entirely.</p></div>
+<div class="story-body"><h1>Study finds X</h1>
+<p>Researchers at a large university found that, across several cohorts, outcomes improved by 12 percent.</p>
+<ul><li>Key point one, which is fairly long</li><li>Key point two</li></ul>
+<p>Critics argue the sample was not representative, but the authors disagree strongly.</p></div></div>
+<footer>Copyright 2024. All rights reserved.</footer></body></html>"""
+
+
+class TestExtract(unittest.TestCase):
+    def test_keeps_article_and_drops_boilerplate(self):
+        text = extract_main_text(PAGE)
+        self.assertEqual(text.splitlines(), [
+            "## Study finds X",
+            "Researchers at a large university found that, across several cohorts, outcomes improved by 12 percent.",
+            "- Key point one, which is fairly long",
+            "- Key point two",
+            "Critics argue the sample was not representative, but the authors disagree strongly.",
+        ])
+
+    def test_every_synthetic_layout(self):
+        for seed in range(3):
+            html, sentences = make_page(seed, paragraphs=3)
+            text = extract_main_text(html)
+            self.assertTrue(all(sentence in text for sentence in sentences), seed)
+            self.assertFalse([word for word in BOILERPLATE_WORDS if word in text.lower()], seed)
+
+    def test_truncates_at_word_boundary(self):
+        self.assertEqual(truncate("alpha beta gamma", 12), "alpha beta... [truncated]")
+        self.assertEqual(truncate("short", 12), "short")
+        self.assertLessEqual(len(extract_main_text(make_page(0, paragraphs=20)[0], max_chars=500)), 500 + 15)
+
+    def test_plain_body_without_paragraphs(self):
+        self.assertEqual(extract_main_text("<html><body>Just some text</body></html>"), "Just some text")
+
+    def test_ad_hint_is_a_whole_token(self):
+        lead = "The council voted on Tuesday to expand the bus network, citing a 20 percent rise in riders."
+        page = (f'<html><body><p class="lead-paragraph">{lead}</p>'
+                f'<div class="ad-slot"><p>Buy one of these shiny things today, limited offer for everyone.</p></div>'
+                f'<div id="top_ads">Sponsored links and more sponsored links here.</div></body></html>')
+        self.assertEqual(extract_main_text(page), lead)
+
+        page = f'<html><body><div class="thread-view"><p>{lead}</p><p>{lead}</p></div></body></html>'
+        self.assertEqual(extract_main_text(page), f"{lead}\n{lead}")
+
+
+class TestBenchExtract(unittest.TestCase):
+    def test_extractor_beats_regex_on_precision(self):
+        results = run_benchmark([make_page(seed, paragraphs=3) for seed in range(3)], repeat=1)
+        self.assertEqual(results["extract"]["recall"], 1.0)
+        self.assertGreater(results["extract"]["precision"], results["regex"]["precision"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import json
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+from gallery import SUMMARY_FILE, write_gallery
+
+
+def entry(n, model, month):
+    published = datetime(2025, month, 1 + n).timestamp()
+    return {"file": f"debate_{n}.html", "json": f"debate_{n}.json", "title": f"Topic {n}",
+            "model": model, "turns": 4, "published": published, "start_time": None, "end_time": None}
+
+
+class TestGallery(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.entries = [entry(n, "opus" if n % 2 else "sonnet", 5 if n < 4 else 6) for n in range(7)]
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_full_build_writes_pages_and_shards(self):
+        write_gallery(self.test_dir, self.entries, "assets/site.css", page_size=3)
+
+        for name in ["index.html", "page-1.html", "page-2.html", "page-3.html",
+                     "model-opus.html", "model-sonnet.html", "model-sonnet-2.html",
+                     "month-2025-05.html", "month-2025-06.html"]:
+            self.assertTrue((self.test_dir / name).exists(), name)
+
+        index = (self.test_dir / "index.html").read_text()
+        self.assertEqual(index.count("<li>"), 3)
+        self.assertLess(index.index("debate_6.html"), index.index("debate_4.html"))
+        self.assertIn('href="model-opus.html"', index)
+        self.assertIn('href="month-2025-06.html"', index)
+
+        # Archive pages are chronological slices: page 1 holds the oldest debates
+        page_1 = (self.test_dir / "page-1.html").read_text()
+        self.assertIn("debate_0.html", page_1)
+        self.assertNotIn("debate_3.html", page_1)
+
+        summary = json.loads((self.test_dir / SUMMARY_FILE).read_text())
+        self.assertEqual(summary["total"], 7)
+        self.assertEqual(summary["models"], {"opus": 3, "sonnet": 4})
+        self.assertEqual(summary["months"], {"2025-05": 4, "2025-06": 3})
+        self.assertEqual(summary["latest"][0]["file"], "debate_6.html")
+
+    def test_publishing_touches_only_its_shards(self):
+        write_gallery(self.test_dir, self.entries, "assets/site.css", page_size=3)
+        for name in ["page-1.html", "page-2.html", "model-sonnet.html", "month-2025-05.html"]:
+            (self.test_dir / name).unlink()
+
+        new_entry = entry(8, "opus", 6)
+        write_gallery(self.test_dir, self.entries + [new_entry], "assets/site.css",
+                      changed=[(None, new_entry)], page_size=3)
+
+        # Untouched pages and shards are not rewritten
+        for name in ["page-1.html", "page-2.html", "model-sonnet.html", "month-2025-05.html"]:
+            self.assertFalse((self.test_dir / name).exists(), name)
+
+        self.assertIn("debate_8.html", (self.test_dir / "page-3.html").read_text())
+        self.assertIn("debate_8.html", (self.test_dir / "model-opus.html").read_text())
+        self.assertIn("debate_8.html", (self.test_dir / "month-2025-06.html").read_text())
+        self.assertIn("debate_8.html", (self.test_dir / "index.html").read_text())
+
+    def test_incremental_output_matches_full_rebuild(self):
+        incremental = self.test_dir / "incremental"
+        rebuilt = self.test_dir / "rebuilt"
+        incremental.mkdir()
+        rebuilt.mkdir()
+        entries = self.entries[:6]
+        write_gallery(incremental, entries, "assets/site.css", page_size=3)
+        # The 7th entry adds page-3, so page-2 gains a "Newer" link
+        for new_entry in self.entries[6:] + [entry(8, "opus", 6), entry(9, "sonnet", 6), entry(10, "opus", 6)]:
+            entries = entries + [new_entry]
+            write_gallery(incremental, entries, "assets/site.css", changed=[(None, new_entry)], page_size=3)
+            write_gallery(rebuilt, entries, "assets/site.css", page_size=3)
+            pages = sorted(path.name for path in rebuilt.iterdir())
+            self.assertEqual(sorted(path.name for path in incremental.iterdir()), pages)
+            for name in pages:
+                self.assertEqual((incremental / name).read_bytes(), (rebuilt / name).read_bytes(), name)
+        self.assertIn('href="page-3.html">← Newer', (incremental / "page-2.html").read_text())
+
+
+if __name__ == "__main__":
+    unittest.main()
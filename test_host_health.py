@@ -0,0 +1,93 @@
+import threading
+import unittest
+
+from host_health import CLOSED, HALF_OPEN, OPEN, HostHealth, HostUnavailable
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestHostHealth(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.health = HostHealth(failure_threshold=2, open_seconds=30, negative_ttl=10, clock=self.clock)
+
+    def state(self, host="a.example"):
+        return self.health.telemetry()["hosts"][host]
+
+    def test_breaker_opens_then_probes(self):
+        for n in range(2):
+            self.health.check(f"https://a.example/{n}")
+            self.health.record_failure(f"https://a.example/{n}", 503)
+        self.assertEqual(self.state()["state"], OPEN)
+        with self.assertRaisesRegex(HostUnavailable, "failed 2 times in a row; retrying it in 30s"):
+            self.health.check("https://a.example/other")
+        self.health.check("https://b.example/")  # other hosts are unaffected
+
+        self.clock.now += 31
+        self.health.check("https://a.example/probe")
+        self.assertEqual(self.state()["state"], HALF_OPEN)
+        with self.assertRaises(HostUnavailable):
+            self.health.check("https://a.example/second")  # one probe at a time
+        self.health.record_failure("https://a.example/probe", None)
+        self.assertEqual(self.state()["state"], OPEN)
+
+        self.clock.now += 31
+        self.health.check("https://a.example/probe2")
+        self.health.record_success("https://a.example/probe2")
+        self.assertEqual(self.state()["state"], CLOSED)
+        self.assertEqual(self.state()["rejected"], 2)
+
+    def test_released_probe_lets_the_next_fetch_probe(self):
+        for n in range(2):
+            self.health.check(f"https://a.example/{n}")
+            self.health.record_failure(f"https://a.example/{n}", 503)
+        self.clock.now += 31
+        self.health.check("https://a.example/probe")
+        self.health.release_probe("https://a.example/probe")
+        self.health.check("https://a.example/next")
+        self.assertEqual(self.state()["state"], HALF_OPEN)
+
+    def test_missing_page_only_caches_the_url(self):
+        self.health.check("https://a.example/gone")
+        self.health.record_failure("https://a.example/gone", 404)
+        self.health.record_failure("https://a.example/gone2", 404)
+        self.assertEqual(self.state()["state"], CLOSED)
+        with self.assertRaisesRegex(HostUnavailable, "it failed 0s ago"):
+            self.health.check("https://a.example/gone")
+        self.assertFalse(self.health.available("https://a.example/gone"))
+        self.assertTrue(self.health.available("https://a.example/fine"))
+
+        self.clock.now += 11
+        self.health.check("https://a.example/gone")
+        self.assertEqual(self.health.telemetry()["negative_cache"], {"entries": 0, "hits": 1})
+
+    def test_per_host_concurrency_limit(self):
+        health = HostHealth(max_per_host=1)
+        entered = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with health.slot("https://a.example/1"):
+                entered.set()
+                release.wait()
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        entered.wait()
+        semaphore = health._hosts["a.example"].semaphore
+        self.assertFalse(semaphore.acquire(blocking=False))
+        with health.slot("https://b.example/1"):
+            pass
+        release.set()
+        thread.join()
+        self.assertTrue(semaphore.acquire(blocking=False))
+
+
+if __name__ == "__main__":
+    unittest.main()
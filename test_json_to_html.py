@@ -0,0 +1,214 @@
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import markdown
+
+import json_to_html
+from json_to_html import DebateHTMLGenerator, FragmentCache, render_many, write_debate
+
+
+SAMPLE_CONTENT = """**Opening Statement**
+
+First line
+second line
+
+```python
+print("hello")
+```
+
+[Search Results for 'frozen box office':
+1. Frozen
+   https://example.com/frozen
+]"""
+
+
+class TestFragmentCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_reused_engine_matches_fresh_markdown(self):
+        generator = DebateHTMLGenerator()
+        # Render twice to make sure state does not leak between messages
+        generator.process_message_content("# Heading\n\nSome *text*")
+        rendered = generator.process_message_content("Plain `code` and a\nline break")
+
+        expected = markdown.markdown("Plain `code` and a\nline break", extensions=json_to_html.MARKDOWN_EXTENSIONS)
+        self.assertEqual(rendered, expected)
+
+    def test_cache_hit_skips_markdown(self):
+        first = DebateHTMLGenerator(fragment_cache=FragmentCache(self.cache_dir))
+        expected = first.process_message_content(SAMPLE_CONTENT)
+        self.assertEqual(first.fragment_cache.misses, 1)
+
+        # A fresh generator backed by the same directory must not touch markdown
+        second = DebateHTMLGenerator(fragment_cache=FragmentCache(self.cache_dir))
+        second._markdown = object()  # any use of the engine raises AttributeError
+        self.assertEqual(second.process_message_content(SAMPLE_CONTENT), expected)
+        self.assertEqual(second.fragment_cache.hits, 1)
+
+    def test_search_and_fetch_blocks_are_restored(self):
+        rendered = DebateHTMLGenerator().process_message_content(
+            SAMPLE_CONTENT + "\n\n[Fetched Content:\nContent from https://example.com:\nBody]"
+        )
+        self.assertIn('<div class="search-results"><h4>🔍 Search Results for "frozen box office"</h4>', rendered)
+        self.assertIn('<div class="fetched-content"><h4>🌐 Fetched Content</h4>Content from https://example.com:<br>Body</div>',
+                      rendered)
+        self.assertNotIn(json_to_html.BLOCK_TOKEN, rendered)
+        self.assertNotIn("<p><div", rendered)
+
+    def test_renderer_version_changes_key(self):
+        key = FragmentCache.key_for(SAMPLE_CONTENT)
+        original_version = json_to_html.RENDERER_VERSION
+        try:
+            json_to_html.RENDERER_VERSION = original_version + "-next"
+            self.assertNotEqual(FragmentCache.key_for(SAMPLE_CONTENT), key)
+        finally:
+            json_to_html.RENDERER_VERSION = original_version
+
+
+def make_debate(topic, turns=2):
+    return {
+        "config": {"topic": topic, "max_turns": turns, "model_name": "opus"},
+        "conversation": [
+            {
+                "role": "assistant",
+                "content": f"Turn {i} on **{topic}**",
+                "timestamp": 1748273037.0 + i,
+                "participant": f"claude_{i % 2 + 1}",
+                "searches": [],
+            }
+            for i in range(turns)
+        ],
+        "metadata": {"total_turns": turns, "start_time": 1748273037.0, "end_time": 1748273040.0},
+    }
+
+
+class TestRenderMany(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.source_dir = os.path.join(self.test_dir, "conversations")
+        self.output_dir = os.path.join(self.test_dir, "html")
+        os.makedirs(self.source_dir)
+        self.json_files = []
+        for n in range(3):
+            path = os.path.join(self.source_dir, f"debate_{n}.json")
+            with open(path, "w") as f:
+                json.dump(make_debate(f"Topic {n}"), f)
+            self.json_files.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_incremental_parallel_render(self):
+        summary = render_many(self.json_files, self.output_dir, jobs=2, cache_dir=None)
+        self.assertEqual((summary["rendered"], summary["skipped"], summary["failed"]), (3, 0, 0))
+        for n in range(3):
+            self.assertTrue(os.path.exists(os.path.join(self.output_dir, f"debate_{n}.html")))
+
+        summary = render_many(self.json_files, self.output_dir, jobs=2, cache_dir=None)
+        self.assertEqual((summary["rendered"], summary["skipped"]), (0, 3))
+
+        with open(self.json_files[1], "w") as f:
+            json.dump(make_debate("Changed topic"), f)
+        summary = render_many(self.json_files, self.output_dir, jobs=2, cache_dir=None)
+        self.assertEqual((summary["rendered"], summary["skipped"]), (1, 2))
+        with open(os.path.join(self.output_dir, "debate_1.html")) as f:
+            self.assertIn("Changed topic", f.read())
+
+    def test_invalid_file_is_reported_and_retried(self):
+        bad_file = os.path.join(self.source_dir, "debate_bad.json")
+        with open(bad_file, "w") as f:
+            json.dump({"config": {}}, f)
+
+        summary = render_many(self.json_files + [bad_file], self.output_dir, jobs=1, cache_dir=None)
+        self.assertEqual((summary["rendered"], summary["failed"]), (3, 1))
+
+        summary = render_many(self.json_files + [bad_file], self.output_dir, jobs=1, cache_dir=None)
+        self.assertEqual((summary["skipped"], summary["failed"]), (3, 1))
+
+    def test_missing_file_does_not_abort_the_batch(self):
+        missing = os.path.join(self.source_dir, "debate_gone.json")
+        with contextlib.redirect_stdout(io.StringIO()):
+            summary = render_many([missing] + self.json_files, self.output_dir, jobs=1, cache_dir=None)
+        self.assertEqual((summary["rendered"], summary["failed"]), (3, 1))
+        self.assertEqual(summary["failures"][0][0], missing)
+        # The successes were recorded, so a second pass skips them
+        summary = render_many(self.json_files, self.output_dir, jobs=1, cache_dir=None)
+        self.assertEqual(summary["skipped"], 3)
+
+
+
+class TestLazyRender(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.generator = DebateHTMLGenerator()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_short_debate_is_rendered_inline(self):
+        html, parts = self.generator.generate_lazy_html(make_debate("Short", turns=3), "debate_1", inline_turns=4)
+        self.assertEqual(parts, {})
+        self.assertIn("Turn 3", html)
+
+    def test_remaining_turns_are_chunked(self):
+        debate = make_debate("Long", turns=12)
+        html, parts = self.generator.generate_lazy_html(debate, "debate_1", inline_turns=4, chunk_turns=5)
+
+        self.assertIn("Turn 4<", html)
+        self.assertNotIn("Turn 5<", html)
+        self.assertIn('href="debate_1.part-1.html"', html)
+        self.assertIn("<script>", html)
+
+        self.assertEqual(sorted(parts), ["debate_1.part-1.html", "debate_1.part-2.html"])
+        first, second = parts["debate_1.part-1.html"], parts["debate_1.part-2.html"]
+        self.assertIn("Turn 5<", first)
+        self.assertIn("Turn 9<", first)
+        self.assertIn('href="debate_1.part-2.html"', first)
+        self.assertIn("Turn 12<", second)
+        self.assertNotIn('class="lazy-more"', second)
+        self.assertIn('href="debate_1.html"', second)
+
+    def test_stale_parts_are_removed(self):
+        output_file = os.path.join(self.test_dir, "debate_1.html")
+        written = write_debate(self.generator, make_debate("Long", turns=30), output_file, lazy=(4, 10))
+        self.assertEqual(len(written), 4)
+
+        write_debate(self.generator, make_debate("Long", turns=10), output_file, lazy=(4, 10))
+        remaining = sorted(name for name in os.listdir(self.test_dir) if ".part-" in name)
+        self.assertEqual(remaining, ["debate_1.part-1.html"])
+
+
+class TestPanelRender(unittest.TestCase):
+    def test_every_panelist_is_named_with_their_position(self):
+        debate = make_debate("Panel", turns=3)
+        debate["config"]["participants"] = 3
+        for i, msg in enumerate(debate["conversation"]):
+            msg["participant"] = f"claude_{i + 1}"
+            msg["content"] = f"I argue position {i + 1}."
+        html = DebateHTMLGenerator().generate_html(debate)
+        self.assertIn('<div class="message claude-3">', html)
+        self.assertIn('<div class="participant">Claude 3</div>', html)
+        self.assertIn("<p><strong>Claude 3:</strong> I argue position 3.</p>", html)
+        self.assertIn("<p><strong>Claude 1:</strong> I argue position 1.</p>", html)
+
+
+    def test_end_reason_is_shown_when_recorded(self):
+        generator = DebateHTMLGenerator()
+        debate = make_debate("Ended", turns=2)
+        self.assertNotIn("metadata-label\">Ended", generator.generate_html(debate))
+        debate["metadata"]["end_reason"] = "converged"
+        debate["metadata"]["convergence"] = {"converged_at_turn": 2}
+        self.assertIn("Converged at turn 2", generator.generate_html(debate))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import contextlib
+import io
+import subprocess
+import sys
+import unittest
+
+import main
+from bench_startup import HEAVY_MODULES, check, run_benchmark
+
+
+class TestMain(unittest.TestCase):
+    def test_dispatches_to_command(self):
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout), self.assertRaises(SystemExit) as raised:
+            main.main(["publish", "--help"])
+        self.assertEqual(raised.exception.code, 0)
+        self.assertIn("--rebuild-index", stdout.getvalue())
+
+    def test_unknown_command(self):
+        with contextlib.redirect_stderr(io.StringIO()) as stderr:
+            self.assertEqual(main.main(["frobnicate"]), 2)
+        self.assertIn("unknown command 'frobnicate'", stderr.getvalue())
+
+    def test_light_commands_skip_heavy_imports(self):
+        # A fresh interpreter, since this test process may already have imported them
+        script = (
+            "import sys, main\n"
+            "for command in main.COMMANDS:\n"
+            "    try:\n"
+            "        main.main([command, '--help'])\n"
+            "    except SystemExit:\n"
+            "        pass\n"
+            f"print(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+        )
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.splitlines()[-1], "[]")
+
+
+class TestBenchStartup(unittest.TestCase):
+    def test_report_and_budget(self):
+        report = run_benchmark([["--help"]], repeat=1)
+        self.assertEqual(report["commands"][0]["heavy"], [])
+        self.assertEqual(check(report, budget_ms=10_000), [])
+        self.assertEqual(len(check(report, budget_ms=-1_000)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import manifest as manifest_module
+from manifest import Manifest
+
+
+def entry(file, published, title="Topic"):
+    return {"file": file, "json": file.replace(".html", ".json"), "title": title,
+            "model": "opus", "turns": 4, "published": published, "start_time": None, "end_time": None}
+
+
+class TestManifest(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.path = Path(self.test_dir) / "manifest.jsonl"
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_replay_keeps_latest_record(self):
+        manifest = Manifest.load(self.path)
+        manifest.upsert(entry("a.html", 1.0, "First"))
+        manifest.upsert(entry("b.html", 2.0))
+        manifest.flush()
+        manifest.upsert(entry("a.html", 1.0, "Renamed"))
+        manifest.remove("b.html")
+        manifest.flush()
+
+        reloaded = Manifest.load(self.path)
+        self.assertEqual(list(reloaded.entries), ["a.html"])
+        self.assertEqual(reloaded.get("a.html")["title"], "Renamed")
+
+    def test_identical_upsert_is_not_logged(self):
+        manifest = Manifest.load(self.path)
+        self.assertTrue(manifest.upsert(entry("a.html", 1.0)))
+        manifest.flush()
+        self.assertFalse(manifest.upsert(entry("a.html", 1.0)))
+        manifest.flush()
+        self.assertEqual(len(self.path.read_text().splitlines()), 1)
+
+    def test_log_is_compacted(self):
+        manifest = Manifest.load(self.path)
+        for n in range(manifest_module.COMPACT_SLACK * 2):
+            manifest.upsert(entry("a.html", float(n)))
+            manifest.flush()
+        self.assertLessEqual(len(self.path.read_text().splitlines()), manifest_module.COMPACT_SLACK + 2)
+        self.assertEqual(Manifest.load(self.path).get("a.html")["published"], float(manifest_module.COMPACT_SLACK * 2 - 1))
+
+    def test_sorted_entries_are_deterministic(self):
+        manifest = Manifest.load(self.path)
+        manifest.upsert(entry("debate_1.html", 5.0))
+        manifest.upsert(entry("debate_3.html", 5.0))
+        manifest.upsert(entry("debate_2.html", 9.0))
+        self.assertEqual([e["file"] for e in manifest.sorted_entries()],
+                         ["debate_2.html", "debate_3.html", "debate_1.html"])
+
+
+if __name__ == "__main__":
+    unittest.main()
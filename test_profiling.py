@@ -0,0 +1,62 @@
+import contextlib
+import io
+import os
+import pstats
+import shutil
+import tempfile
+import time
+import unittest
+
+import profiling
+from profiling import ProfileSession, phase
+
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        profiling.stop()
+        shutil.rmtree(self.test_dir)
+
+    def test_phase_is_shared_noop_when_off(self):
+        self.assertIs(phase("load"), phase("write"))
+        with phase("load"):
+            pass
+
+    def test_nested_phases_count_exclusive_time(self):
+        session = ProfileSession(os.path.join(self.test_dir, "out.prof"))
+        profiling._session = session
+        try:
+            with phase("copy"):
+                time.sleep(0.02)
+                with phase("load"):
+                    time.sleep(0.05)
+        finally:
+            profiling._session = None
+        self.assertEqual(session.counts, {"copy": 1, "load": 1})
+        self.assertGreaterEqual(session.totals["load"], 0.05)
+        self.assertLess(session.totals["copy"], 0.05)
+
+    def test_session_writes_stats_stacks_and_summary(self):
+        path = os.path.join(self.test_dir, "out.prof")
+        profiling.start(path, sample=True)
+        with phase("template"):
+            deadline = time.perf_counter() + 0.05
+            while time.perf_counter() < deadline:
+                pass
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            profiling.stop()
+
+        self.assertIn("template", stderr.getvalue())
+        self.assertGreater(pstats.Stats(path).total_calls, 0)
+        with open(path + ".stacks") as f:
+            lines = f.read().splitlines()
+        self.assertTrue(lines)
+        self.assertTrue(all(line.rsplit(" ", 1)[1].isdigit() for line in lines))
+        self.assertIs(phase("template"), phase("other"))
+
+
+if __name__ == "__main__":
+    unittest.main()
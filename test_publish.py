@@ -1,8 +1,11 @@
+import json
 import os
+import sys
 import tempfile
 import unittest
 import shutil
 from pathlib import Path
+from unittest import mock
 import publish
 
 class TestPublish(unittest.TestCase):
@@ -28,7 +31,6 @@ class TestPublish(unittest.TestCase):
             
     def test_publish_file(self):
         # Run the publish function
-        import sys
         sys.argv = ["publish.py", str(self.test_html)]
         publish.main()
         
@@ -48,5 +50,135 @@ class TestPublish(unittest.TestCase):
             content = f.read()
             self.assertIn("test_debate.html", content)
 
+    def write_debate(self, name, topic):
+        html_path = Path(self.test_dir) / "conversations" / f"{name}.html"
+        html_path.parent.mkdir(exist_ok=True)
+        html_path.write_text(f"<html><body>{topic}</body></html>")
+        json_path = html_path.with_suffix(".json")
+        json_path.write_text(json.dumps({
+            "config": {"topic": topic, "model_name": "opus"},
+            "conversation": [],
+            "metadata": {"total_turns": 4},
+        }))
+        return html_path
+
+    def test_publish_many_copies_only_changed_files(self):
+        html_files = [self.write_debate(f"debate_{n}", f"Topic {n}") for n in range(3)]
+
+        summary = publish.publish_many(html_files, "published", verbose=False)
+        self.assertEqual((summary["published"], summary["copied_files"], summary["added"]), (3, 6, 3))
+
+        with open(Path("published") / "index.html") as f:
+            content = f.read()
+        for n in range(3):
+            self.assertEqual(content.count(f'href="debate_{n}.html"'), 1)
+        self.assertIn('<span class="model">opus</span> <span class="turns">4 turns</span>', content)
+
+        summary = publish.publish_many(html_files, "published", verbose=False)
+        self.assertEqual((summary["copied_files"], summary["unchanged"], summary["added"]), (0, 3, 0))
+
+        # Touching a JSON file without changing it does not trigger a copy
+        os.utime(html_files[0].with_suffix(".json"), (0, 0))
+        html_files[1].write_text("<html><body>Edited</body></html>")
+        summary = publish.publish_many(html_files, "published", verbose=False)
+        self.assertEqual((summary["copied_files"], summary["unchanged"]), (1, 2))
+        self.assertEqual((Path("published") / "debate_1.html").read_text(), "<html><body>Edited</body></html>")
+
+    def test_changed_options_republish_pages(self):
+        html_files = [self.write_debate(f"debate_{n}", f"Topic {n}") for n in range(2)]
+        publish.publish_many(html_files, "published", verbose=False)
+
+        summary = publish.publish_many(html_files, "published", minify=True, verbose=False)
+        self.assertEqual((summary["copied_files"], summary["unchanged"]), (2, 0))
+        summary = publish.publish_many(html_files, "published", minify=True, verbose=False)
+        self.assertEqual(summary["copied_files"], 0)
+
+        # A new stylesheet (e.g. after a CSS change) has a new href
+        with mock.patch("publish.build_site_stylesheet", return_value="assets/site.changed.css"):
+            summary = publish.publish_many(html_files[:1], "published", minify=True, verbose=False)
+        self.assertEqual(summary["copied_files"], 1)
+        # debate_1 was not part of that run, so it still counts as published with the old stylesheet
+        pages = publish.load_publish_state("published")["pages"]
+        self.assertNotEqual(pages["debate_0.html"], pages["debate_1.html"])
+
+    def test_index_is_generated_from_manifest(self):
+        from manifest import Manifest
+
+        html_files = [self.write_debate(f"debate_{n}", f"Topic <{n}>") for n in range(2)]
+        publish.publish_many(html_files, "published", verbose=False)
+
+        manifest = Manifest.load(Path("published") / "manifest.jsonl")
+        self.assertEqual(manifest.get("debate_0.html")["title"], "Topic <0>")
+        self.assertEqual(manifest.get("debate_0.html")["turns"], 4)
+
+        index_path = Path("published") / "index.html"
+        content = index_path.read_text()
+        self.assertIn("Topic &lt;1&gt;", content)
+        self.assertLess(content.index("debate_1.html"), content.index("debate_0.html"))
+
+        # Regenerating from the manifest reproduces the index exactly
+        index_path.unlink()
+        sys.argv = ["publish.py", "--rebuild-index"]
+        publish.main()
+        self.assertEqual(index_path.read_text(), content)
+
+    def test_legacy_index_is_migrated(self):
+        published_dir = Path("published")
+        published_dir.mkdir()
+        (published_dir / "index.html").write_text(
+            '<ul id="debate-list">\n'
+            '        <li><a href="debate_9.html">Old debate</a><span class="model">opus</span> '
+            '<span class="turns">4 turns</span><span class="date">Published: 2025-05-26 13:01</span></li>\n'
+            '    </ul>')
+
+        publish.publish_many([self.write_debate("debate_1", "New debate")], published_dir, verbose=False)
+
+        content = (published_dir / "index.html").read_text()
+        self.assertIn('<li><a href="debate_9.html">Old debate</a><span class="model">opus</span> '
+                      '<span class="turns">4 turns</span><span class="date">Published: 2025-05-26 13:01</span></li>', content)
+        self.assertLess(content.index("debate_1.html"), content.index("debate_9.html"))
+
+    def test_parallel_publishers_do_not_lose_entries(self):
+        import subprocess
+        import time
+        from manifest import Manifest
+
+        html_files = [self.write_debate(f"debate_{n}", f"Topic {n}") for n in range(16)]
+        # Everyone starts publishing at the same moment once imports are done
+        start_at = time.time() + 2
+        script = ("import sys, time, publish; "
+                  "time.sleep(max(0, float(sys.argv[1]) - time.time())); "
+                  "sys.argv = ['publish.py', sys.argv[2]]; publish.main()")
+        env = dict(os.environ, PYTHONPATH=self.original_dir)
+        processes = [
+            subprocess.Popen([sys.executable, "-c", script, str(start_at), str(html_file)],
+                             env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            for html_file in html_files + html_files[:4]
+        ]
+        for process in processes:
+            _, stderr = process.communicate(timeout=60)
+            self.assertEqual(process.returncode, 0, stderr.decode())
+
+        manifest = Manifest.load(Path("published") / "manifest.jsonl")
+        self.assertEqual(len(manifest), 16)
+        index = (Path("published") / "index.html").read_text()
+        for n in range(16):
+            self.assertEqual(index.count(f'href="debate_{n}.html"'), 1)
+            self.assertTrue((Path("published") / f"debate_{n}.json").exists())
+        self.assertEqual([p.name for p in Path("published").glob(".*.tmp")], [])
+
+    def test_stage_publish_skips_fragment_pages(self):
+        import stage_publish
+
+        self.write_debate("debate_1", "Topic")
+        (Path(self.test_dir) / "conversations" / "debate_1.part-1.html").write_text("<html></html>")
+
+        pages = stage_publish.find_debate_pages(Path("conversations"))
+        self.assertEqual([page.name for page in pages], ["debate_1.html"])
+
+        sys.argv = ["stage_publish.py"]
+        stage_publish.main()
+        self.assertTrue((Path("published") / "debate_1.part-1.html").exists())
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,119 @@
+import contextlib
+import io
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from debate import WebToolkit, debug_search
+from search_backends import (HedgedSearch, LatencyHistogram, LocalIndex, SearchBackend, SearchError,
+                             SearchResult, StaticSearch, create_search)
+
+RESULT = SearchResult("Title", "https://example.com/a", "Description")
+
+
+class TestHedgedSearch(unittest.TestCase):
+    def test_fast_primary_is_not_hedged(self):
+        primary, secondary = StaticSearch([RESULT], name="a"), StaticSearch([RESULT], name="b")
+        search = HedgedSearch([primary, secondary], default_delay=0.5)
+        self.assertEqual(search.search("q", 3), [RESULT])
+        self.assertEqual((primary.calls, secondary.calls, search.hedges), (1, 0, 0))
+        search.close()
+
+    def test_slow_primary_is_hedged(self):
+        other = SearchResult("Other", "https://example.com/b", "")
+        search = HedgedSearch([StaticSearch([RESULT], delay=1.0, name="slow"), StaticSearch([other], name="fast")],
+                              default_delay=0.05)
+        start = time.perf_counter()
+        self.assertEqual(search.search("q", 3), [other])
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+        telemetry = search.telemetry()
+        self.assertEqual(telemetry["hedges"], 1)
+        self.assertEqual(telemetry["backends"]["fast"]["wins"], 1)
+        self.assertEqual(telemetry["backends"]["slow"]["requests"], 1)
+        search.close()
+
+    def test_failure_moves_on_without_waiting(self):
+        search = HedgedSearch([StaticSearch(error="down", name="a"), StaticSearch([RESULT], name="b")],
+                              default_delay=5.0)
+        start = time.perf_counter()
+        self.assertEqual(search.search("q", 3), [RESULT])
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertEqual(search.telemetry()["backends"]["a"]["errors"], 1)
+        self.assertEqual(search.telemetry()["hedges"], 0)
+
+        failing = HedgedSearch([StaticSearch(error="down")])
+        with self.assertRaises(SearchError):
+            failing.search("q", 3)
+        self.assertEqual(HedgedSearch([StaticSearch([])]).search("q", 3), [])
+
+    def test_delay_follows_observed_percentile(self):
+        backend = StaticSearch([RESULT])
+        search = HedgedSearch([backend], default_delay=1.0, min_samples=10)
+        self.assertEqual(search.hedge_delay(backend), 1.0)
+        for _ in range(10):
+            search.latency[backend.name].record(0.2)
+        self.assertAlmostEqual(search.hedge_delay(backend), 0.2, delta=0.2 * 0.2)
+
+    def test_histogram(self):
+        histogram = LatencyHistogram()
+        for ms in range(1, 101):
+            histogram.record(ms / 1000)
+        self.assertAlmostEqual(histogram.percentile(0.5), 0.050, delta=0.010)
+        self.assertAlmostEqual(histogram.percentile(0.99), 0.099, delta=0.020)
+        summary = histogram.to_dict()
+        self.assertEqual(summary["count"], 100)
+        self.assertEqual(sum(summary["buckets"].values()), 100)
+        self.assertIsNone(LatencyHistogram().percentile(0.5))
+
+
+class TestLocalIndex(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        Path(self.test_dir, "nuclear.md").write_text(
+            "# Nuclear power costs\n\nNew reactors cost more per MWh than solar.\n\nSafety record is strong.\n")
+        Path(self.test_dir, "remote.txt").write_text("Remote work\nSurveys show productivity held steady.\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_search_and_fetch(self):
+        index = LocalIndex(self.test_dir)
+        results = index.search("nuclear reactors cost", 3)
+        self.assertEqual(results[0].title, "Nuclear power costs")
+        self.assertEqual(results[0].description, "New reactors cost more per MWh than solar.")
+        self.assertEqual(index.search("unrelated", 3), [])
+
+        toolkit = WebToolkit(search=create_search(["local"], self.test_dir))
+        listing = toolkit.search_web("productivity surveys")
+        self.assertTrue(listing.startswith("1. Remote work\n   file://"))
+        fetched = toolkit.fetch_url(results[0].url)
+        self.assertIn("Safety record is strong.", fetched)
+        self.assertTrue(toolkit.fetch_url("file:///etc/hostname").startswith("Error fetching"))
+        self.assertIn("local", toolkit.telemetry()["search"]["backends"])
+        toolkit.close()
+
+    def test_debug_search_uses_given_backends(self):
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            debug_search("nuclear reactors", create_search(["local"], self.test_dir))
+        self.assertIn("1. Nuclear power costs", out.getvalue())
+        self.assertIn("local: 1 request(s), 1 win(s)", out.getvalue())
+
+    def test_backend_must_implement_search(self):
+        class Incomplete(SearchBackend):
+            name = "incomplete"
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            create_search(["altavista"])
+        with self.assertRaises(ValueError):
+            create_search(["local"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,290 @@
+import gzip
+import http.client
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from assets import precompress_tree, supported_encodings
+from serve import FileCache, OnDemandRenderer, create_server, parse_accept_encoding, parse_range
+from test_json_to_html import make_debate
+
+PAGE = "<h1>Gallery</h1>" + "<p>A debate turn.</p>" * 100
+
+
+class TestGalleryServer(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        Path(self.test_dir, "index.html").write_text(PAGE)
+        (Path(self.test_dir) / "assets").mkdir()
+        Path(self.test_dir, "assets", "site.abc.css").write_text("body{}")
+        self.server = create_server(self.test_dir, "127.0.0.1", 0, workers=4,
+                                    idle_timeout=2.0, access_log=False)
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.stopped = False
+
+    def tearDown(self):
+        self.stop()
+        shutil.rmtree(self.test_dir)
+
+    def stop(self, grace=1.0):
+        if self.stopped:
+            return 0
+        self.stopped = True
+        self.server.shutdown()
+        self.thread.join()
+        return self.server.drain(grace)
+
+    def connect(self):
+        return http.client.HTTPConnection("127.0.0.1", self.port, timeout=5)
+
+    def test_keep_alive_reuses_connection(self):
+        conn = self.connect()
+        conn.request("GET", "/index.html")
+        response = conn.getresponse()
+        self.assertEqual(response.read(), PAGE.encode())
+        sock = conn.sock
+
+        conn.request("GET", "/assets/site.abc.css")
+        response = conn.getresponse()
+        self.assertEqual(response.read(), b"body{}")
+        self.assertIn("immutable", response.getheader("Cache-Control"))
+        self.assertIs(conn.sock, sock)
+        conn.close()
+
+    def test_stalled_client_does_not_block_others(self):
+        stalled = socket.create_connection(("127.0.0.1", self.port))
+        stalled.sendall(b"GET /index.html HTTP/1.1\r\n")
+        try:
+            conn = self.connect()
+            conn.request("GET", "/index.html")
+            self.assertEqual(conn.getresponse().status, 200)
+            conn.close()
+        finally:
+            stalled.close()
+
+    def test_drain_closes_idle_keep_alive_connections(self):
+        conn = self.connect()
+        conn.request("GET", "/index.html")
+        conn.getresponse().read()
+
+        start = time.monotonic()
+        self.assertEqual(self.stop(grace=5.0), 0)
+        self.assertLess(time.monotonic() - start, 1.5)
+        self.assertEqual(conn.sock.recv(1), b"")
+        conn.close()
+
+    def get(self, path, headers=None):
+        conn = self.connect()
+        conn.request("GET", path, headers=headers or {})
+        response = conn.getresponse()
+        body = response.read()
+        conn.close()
+        return response, body
+
+    def test_gzip_negotiated_on_the_fly(self):
+        response, body = self.get("/index.html", {"Accept-Encoding": "br;q=0, gzip"})
+        self.assertEqual(response.getheader("Content-Encoding"), "gzip")
+        self.assertEqual(response.getheader("Vary"), "Accept-Encoding")
+        self.assertEqual(gzip.decompress(body), PAGE.encode())
+
+        response, body = self.get("/index.html", {"Accept-Encoding": "gzip;q=0"})
+        self.assertIsNone(response.getheader("Content-Encoding"))
+        self.assertEqual(body, PAGE.encode())
+
+    def test_precompressed_sibling_preferred_while_fresh(self):
+        index = os.path.join(self.test_dir, "index.html")
+        self.assertEqual(precompress_tree(self.test_dir), len(supported_encodings()))
+        self.assertEqual(precompress_tree(self.test_dir), 0)
+        self.assertEqual(gzip.decompress(Path(index + ".gz").read_bytes()), PAGE.encode())
+
+        Path(index + ".gz").write_bytes(gzip.compress(b"precompressed"))
+        os.utime(index + ".gz", ns=(os.stat(index).st_mtime_ns,) * 2)
+        response, body = self.get("/", {"Accept-Encoding": "gzip"})
+        self.assertEqual(gzip.decompress(body), b"precompressed")
+
+        # A sibling older than its source is stale and ignored
+        os.utime(index, ns=(os.stat(index).st_mtime_ns + 10**9,) * 2)
+        response, body = self.get("/", {"Accept-Encoding": "gzip"})
+        self.assertEqual(gzip.decompress(body), PAGE.encode())
+
+        # So is one newer than its source, e.g. after a copy that kept an older file's mtime
+        os.utime(index + ".gz", ns=(os.stat(index).st_mtime_ns + 10**9,) * 2)
+        response, body = self.get("/", {"Accept-Encoding": "gzip"})
+        self.assertEqual(gzip.decompress(body), PAGE.encode())
+        self.assertEqual(precompress_tree(self.test_dir), len(supported_encodings()))
+        self.assertEqual(gzip.decompress(Path(index + ".gz").read_bytes()), PAGE.encode())
+
+    def test_conditional_requests(self):
+        response, _ = self.get("/index.html")
+        etag = response.getheader("ETag")
+        self.assertEqual(response.getheader("Cache-Control"), "no-cache")
+
+        response, body = self.get("/index.html", {"If-None-Match": etag})
+        self.assertEqual((response.status, body), (304, b""))
+        self.assertEqual(response.getheader("ETag"), etag)
+
+        response, _ = self.get("/index.html", {"If-Modified-Since": response.getheader("Last-Modified")})
+        self.assertEqual(response.status, 304)
+
+        Path(self.test_dir, "index.html").write_text(PAGE + "updated")
+        response, body = self.get("/index.html", {"If-None-Match": etag})
+        self.assertEqual(response.status, 200)
+        self.assertTrue(body.endswith(b"updated"))
+
+    def test_range_requests_on_large_file(self):
+        data = os.urandom(2 * 1024 * 1024)
+        Path(self.test_dir, "export.bin").write_bytes(data)
+
+        response, body = self.get("/export.bin")
+        self.assertEqual((response.status, response.getheader("Accept-Ranges")), (200, "bytes"))
+        self.assertEqual(body, data)
+        etag = response.getheader("ETag")
+
+        response, body = self.get("/export.bin", {"Range": "bytes=100000-"})
+        self.assertEqual(response.status, 206)
+        self.assertEqual(response.getheader("Content-Range"), f"bytes 100000-{len(data) - 1}/{len(data)}")
+        self.assertEqual(body, data[100000:])
+
+        response, body = self.get("/export.bin", {"Range": "bytes=-10", "If-Range": etag})
+        self.assertEqual((response.status, body), (206, data[-10:]))
+
+        response, body = self.get("/export.bin", {"Range": "bytes=0-9", "If-Range": '"stale"'})
+        self.assertEqual((response.status, len(body)), (200, len(data)))
+
+        response, _ = self.get("/export.bin", {"Range": f"bytes={len(data)}-"})
+        self.assertEqual(response.status, 416)
+        self.assertEqual(response.getheader("Content-Range"), f"bytes */{len(data)}")
+
+    def test_range_request_on_cached_file(self):
+        response, body = self.get("/index.html", {"Range": "bytes=4-15"})
+        self.assertEqual((response.status, body), (206, PAGE.encode()[4:16]))
+
+    def test_json_api(self):
+        Path(self.test_dir, "manifest.jsonl").write_text(json.dumps({
+            "file": "debate_1.html", "json": "debate_1.json", "title": "Served", "model": "opus",
+            "turns": 2, "published": 1735689600.0, "start_time": None, "end_time": None,
+        }) + "\n")
+        response, body = self.get("/api/debates?model=opus")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.getheader("Content-Type"), "application/json; charset=utf-8")
+        self.assertEqual([d["title"] for d in json.loads(body)["debates"]], ["Served"])
+
+        response, body = self.get("/api/debates/missing")
+        self.assertEqual((response.status, json.loads(body)["error"]), (404, "No debate 'missing'"))
+
+
+class TestRenderOnDemand(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.source_dir = Path(self.test_dir, "conversations")
+        self.source_dir.mkdir()
+        self.cache_dir = os.path.join(self.test_dir, "cache")
+        with open(self.source_dir / "debate_1.json", "w") as f:
+            json.dump(make_debate("On demand"), f)
+        Path(self.source_dir, "broken.json").write_text("{")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def serve(self):
+        server = create_server(self.source_dir, "127.0.0.1", 0, access_log=False,
+                               render_from=self.source_dir, render_cache_dir=self.cache_dir)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+
+        def stop():
+            server.shutdown()
+            thread.join()
+            server.drain(1.0)
+        self.addCleanup(stop)
+        return server
+
+    def get(self, server, path, headers=None):
+        conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=10)
+        conn.request("GET", path, headers=headers or {})
+        response = conn.getresponse()
+        body = response.read()
+        conn.close()
+        return response, body
+
+    def test_renders_once_and_serves_from_cache(self):
+        server = self.serve()
+        responses = []
+
+        def fetch():
+            responses.append(self.get(server, "/debate_1.html"))
+        threads = [threading.Thread(target=fetch) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual({response.status for response, _ in responses}, {200})
+        self.assertIn(b"On demand", responses[0][1])
+        self.assertEqual(len({body for _, body in responses}), 1)
+        self.assertEqual(server.renderer.renders, 1)
+
+        response, body = self.get(server, "/debate_1.html", {"Accept-Encoding": "gzip"})
+        self.assertEqual(gzip.decompress(body), responses[0][1])
+        response, _ = self.get(server, "/debate_1.html", {"If-None-Match": responses[0][0].getheader("ETag")})
+        self.assertEqual(response.status, 304)
+        self.assertEqual(server.renderer.renders, 1)
+
+    def test_disk_cache_survives_restart_and_source_changes_rerender(self):
+        first = OnDemandRenderer(self.source_dir, self.cache_dir)
+        json_path = first.source_for("/debate_1.html")
+        html = first.page(json_path, os.stat(json_path))
+
+        second = OnDemandRenderer(self.source_dir, self.cache_dir)
+        self.assertEqual(second.page(json_path, os.stat(json_path)), html)
+        self.assertEqual((second.renders, second.disk_hits), (0, 1))
+
+        with open(json_path, "w") as f:
+            json.dump(make_debate("Changed"), f)
+        self.assertIn(b"Changed", second.page(json_path, os.stat(json_path)))
+        self.assertEqual(second.renders, 1)
+
+    def test_source_lookup_and_errors(self):
+        server = self.serve()
+        self.assertIsNone(server.renderer.source_for("/missing.html"))
+        self.assertIsNone(server.renderer.source_for("/../debate_1.html"))
+        self.assertEqual(self.get(server, "/broken.html")[0].status, 500)
+        self.assertEqual(self.get(server, "/debate_1.json")[0].status, 200)
+
+
+class TestFileCache(unittest.TestCase):
+    def test_invalidates_on_validator_change_and_evicts_lru(self):
+        cache = FileCache(max_bytes=10, max_entry_bytes=10)
+        self.assertEqual(cache.get("a", (1, 4), lambda: b"aaaa"), b"aaaa")
+        self.assertEqual(cache.get("a", (1, 4), lambda: b"stale"), b"aaaa")
+        self.assertEqual(cache.get("a", (2, 4), lambda: b"AAAA"), b"AAAA")
+        cache.get("b", (1, 4), lambda: b"bbbb")
+        cache.get("a", (2, 4), lambda: b"")
+        cache.get("c", (1, 4), lambda: b"cccc")
+        self.assertEqual(cache.get("b", (1, 4), lambda: b"reloaded"), b"reloaded")
+        self.assertEqual(cache.get("a", (2, 4), lambda: b"gone"), b"gone")
+        self.assertLessEqual(cache.size, 10)
+        self.assertEqual(cache.hits, 2)
+
+    def test_parse_range(self):
+        self.assertEqual(parse_range("bytes=0-99", 50), (0, 49))
+        self.assertEqual(parse_range("bytes=-20", 50), (30, 49))
+        self.assertEqual(parse_range("bytes=50-", 50), "unsatisfiable")
+        self.assertIsNone(parse_range("bytes=0-1,5-6", 50))
+        self.assertIsNone(parse_range("items=0-1", 50))
+        self.assertIsNone(parse_range("bytes=9-3", 50))
+
+    def test_parse_accept_encoding(self):
+        self.assertEqual(parse_accept_encoding("gzip, br;q=0.5, *;q=0"), {"gzip": 1.0, "br": 0.5, "*": 0.0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from bench_render import compare, run_benchmark
+from bench_server import build_gallery, parse_mix, request_paths, run_load
+from json_to_html import DebateHTMLGenerator
+from serve import create_server
+from synthetic import DebateShape, make_debate
+
+
+class TestSyntheticDebates(unittest.TestCase):
+    def test_deterministic_and_shaped(self):
+        shape = DebateShape(turns=4, message_words=100, code_density=1.0, searches=2, fetches=1)
+        debate = make_debate(7, shape)
+        self.assertEqual(debate, make_debate(7, shape))
+        self.assertNotEqual(debate, make_debate(8, shape))
+        self.assertEqual(debate["metadata"]["total_turns"], 4)
+
+        message = debate["conversation"][0]
+        self.assertEqual(message["content"].count("[Search Results for '"), 2)
+        self.assertEqual(message["content"].count("[Fetched Content:"), 1)
+        self.assertIn("```python", message["content"])
+
+        html = DebateHTMLGenerator().generate_html(debate)
+        self.assertEqual(html.count('class="message '), 4)
+        self.assertEqual(html.count('class="search-results"'), 8)
+        self.assertEqual(html.count('class="fetched-content"'), 4)
+
+
+class TestBenchServer(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_load_run_against_synthetic_gallery(self):
+        published = build_gallery(Path(self.test_dir), debates=3, turns=2)
+        server = create_server(published, "127.0.0.1", 0, access_log=False)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        try:
+            report = run_load(server.server_address[1], request_paths(published),
+                              parse_mix("index=1,page=1,json=1,api=1"), concurrency=2, duration=0.3)
+        finally:
+            server.shutdown()
+            thread.join()
+            server.drain(1.0)
+        self.assertGreater(report["requests"], 0)
+        self.assertEqual(report["error_rate"], 0.0)
+        self.assertLessEqual(report["p50_ms"], report["p99_ms"])
+
+
+class TestBenchRender(unittest.TestCase):
+    def test_benchmark_and_regression_check(self):
+        result = run_benchmark(DebateShape(turns=2, message_words=50, fetches=1), debates=2, repeat=1)
+        self.assertGreater(result["content_kb"], 0)
+        self.assertGreater(result["peak_memory_kb"], 0)
+        self.assertEqual(compare(result, result, tolerance=0.1), [])
+
+        faster = dict(result, generate_us_per_kb=result["generate_us_per_kb"] / 2)
+        regressions = compare(result, faster, tolerance=0.1)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("generate_us_per_kb"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import json
+import os
+import shutil
+import tempfile
+import contextlib
+import io
+import struct
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from test_json_to_html import make_debate
+from watch import Debouncer, InotifyWatcher, PollingWatcher, create_watcher, process_changes, watch
+
+
+class TestDebouncer(unittest.TestCase):
+    def test_releases_paths_once_quiet(self):
+        debouncer = Debouncer(quiet=1.0)
+        debouncer.add(["a.json"], now=0.0)
+        debouncer.add(["a.json", "b.json"], now=0.8)
+        self.assertEqual(debouncer.pop_ready(now=1.5), [])
+        self.assertAlmostEqual(debouncer.next_timeout(now=1.5), 0.3)
+        self.assertEqual(debouncer.pop_ready(now=1.8), ["a.json", "b.json"])
+        self.assertIsNone(debouncer.next_timeout(now=1.8))
+
+
+class TestWatchers(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def check_detects_changes(self, watcher):
+        try:
+            self.assertEqual(watcher.wait(0.05), set())
+            path = os.path.join(self.test_dir, "debate_1.json")
+            Path(path).write_text("{}")
+            Path(self.test_dir, ".render-state.json").write_text("{}")
+            Path(self.test_dir, "debate_1.html").write_text("")
+            self.assertEqual(watcher.wait(2.0), {path})
+
+            Path(path).write_text('{"changed": true}')
+            self.assertEqual(watcher.wait(2.0), {path})
+        finally:
+            watcher.close()
+
+    def test_polling_watcher(self):
+        self.check_detects_changes(PollingWatcher(self.test_dir, interval=0.01))
+
+    def test_inotify_watcher(self):
+        watcher = create_watcher(self.test_dir)
+        if not isinstance(watcher, InotifyWatcher):
+            watcher.close()
+            self.skipTest("inotify is not available")
+        self.check_detects_changes(watcher)
+
+    def test_inotify_overflow_requeues_every_file(self):
+        watcher = create_watcher(self.test_dir)
+        if not isinstance(watcher, InotifyWatcher):
+            watcher.close()
+            self.skipTest("inotify is not available")
+        try:
+            paths = {os.path.join(self.test_dir, f"debate_{n}.json") for n in range(3)}
+            for path in paths:
+                Path(path).write_text("{}")
+            Path(self.test_dir, ".render-state.json").write_text("{}")
+            overflow = struct.pack("iIII", -1, InotifyWatcher.IN_Q_OVERFLOW, 0, 0)
+            self.assertEqual(watcher._parse(overflow), paths)
+        finally:
+            watcher.close()
+
+
+class TestProcessChanges(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.original_dir = os.getcwd()
+        os.chdir(self.test_dir)
+        os.makedirs("conversations")
+
+    def tearDown(self):
+        os.chdir(self.original_dir)
+        shutil.rmtree(self.test_dir)
+
+    def test_renders_and_publishes_only_complete_debates(self):
+        with open("conversations/debate_1.json", "w") as f:
+            json.dump(make_debate("Watched"), f)
+        Path("conversations/debate_2.json").write_text('{"config": {')
+
+        summary = process_changes(
+            ["conversations/debate_1.json", "conversations/debate_2.json"], "conversations", "published"
+        )
+        self.assertEqual((summary["rendered"], summary["published"], summary["incomplete"]), (1, 1, 1))
+        self.assertTrue(Path("published/debate_1.html").exists())
+        self.assertIn("debate_1.html", Path("published/index.html").read_text())
+        self.assertFalse(Path("conversations/debate_2.html").exists())
+
+
+
+class TestWatchLoop(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_failed_batch_is_retried(self):
+        path = os.path.join(self.test_dir, "debate_1.json")
+        Path(path).write_text("{}")
+        failures = [OSError("disk full"), KeyboardInterrupt()]
+        with mock.patch("watch.process_changes", side_effect=failures) as process, \
+                mock.patch("watch.RETRY_SECONDS", 0.0), contextlib.redirect_stdout(io.StringIO()) as out:
+            watch(self.test_dir, os.path.join(self.test_dir, "published"), quiet=0.01, interval=0.01, polling=True)
+        self.assertEqual([call.args[0] for call in process.call_args_list], [[path], [path]])
+        self.assertIn("disk full", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import functools
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+from debate import WebToolkit
+from synthetic import make_page
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.startswith("/down/"):
+            self.send_error(503)
+            return
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestPrefetch(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.sentences = {}
+        for n in range(3):
+            html, sentences = make_page(n, paragraphs=2)
+            Path(self.test_dir, f"page{n}.html").write_text(html, encoding="utf-8")
+            self.sentences[n] = sentences
+        handler = functools.partial(QuietHandler, directory=self.test_dir)
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.toolkit = WebToolkit(prefetch_k=2)
+
+    def tearDown(self):
+        self.toolkit.close()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.test_dir)
+
+    def test_prefetched_page_is_served_from_buffer(self):
+        self.toolkit.prefetch([f"{self.base}/page0.html", f"{self.base}/page1.html"])
+        content = self.toolkit.fetch_url(f"{self.base}/page0.html#section")
+        self.assertTrue(content.startswith(f"Content from {self.base}/page0.html#section:\n"))
+        self.assertIn(self.sentences[0][0], content)
+        self.assertIn(self.sentences[2][0], self.toolkit.fetch_url(f"{self.base}/page2.html"))
+
+        self.toolkit.close(wait=True)
+        stats = self.toolkit.telemetry()["prefetch"]
+        self.assertEqual((stats["prefetched"], stats["hits"], stats["fetches"]), (2, 1, 2))
+        self.assertEqual(stats["hit_rate"], 0.5)
+        self.assertEqual(stats["wasted"], 1)
+        self.assertGreater(stats["wasted_bytes"], 0)
+
+    def test_failed_prefetch_falls_back_to_fetch(self):
+        self.toolkit.prefetch([f"{self.base}/missing.html"])
+        content = self.toolkit.fetch_url(f"{self.base}/missing.html")
+        # The retry really ran: a failed prefetch is not put in the negative cache
+        self.assertTrue(content.startswith("Error fetching"))
+        self.assertIn("404", content)
+        self.assertEqual(self.toolkit.telemetry()["prefetch"]["failed"], 1)
+
+    def test_failed_prefetches_do_not_open_the_breaker(self):
+        self.toolkit.prefetch([f"{self.base}/down/{n}" for n in range(2)])
+        self.toolkit.prefetch([f"{self.base}/down/{n}" for n in range(2, 4)])
+        self.toolkit.close(wait=True)
+        self.assertIn(self.sentences[0][0], self.toolkit.fetch_url(f"{self.base}/page0.html"))
+        fetch = self.toolkit.telemetry()["fetch"]
+        self.assertEqual(fetch["hosts"]["127.0.0.1"]["state"], "closed")
+        self.assertEqual(fetch["negative_cache"]["entries"], 0)
+
+    def test_buffer_is_bounded(self):
+        toolkit = WebToolkit(prefetch_k=3, buffer_entries=2)
+        toolkit.prefetch([f"{self.base}/page{n}.html" for n in range(3)])
+        toolkit.close(wait=True)
+        stats = toolkit.telemetry()["prefetch"]
+        self.assertEqual((stats["prefetched"], stats["wasted"]), (3, 3))
+
+
+    def test_failing_host_is_skipped(self):
+        for n in range(3):
+            self.assertIn("503", self.toolkit.fetch_url(f"{self.base}/down/{n}"))
+        self.assertIn("failed 3 times in a row", self.toolkit.fetch_url(f"{self.base}/down/3"))
+        self.assertIn("failed 3 times in a row", self.toolkit.fetch_url(f"{self.base}/page0.html"))
+        self.toolkit.prefetch([f"{self.base}/page1.html"])
+
+        hosts = self.toolkit.telemetry()["fetch"]["hosts"]
+        self.assertEqual(hosts["127.0.0.1"]["state"], "open")
+        self.assertEqual(hosts["127.0.0.1"]["rejected"], 2)
+        self.assertEqual(self.toolkit.telemetry()["prefetch"]["prefetched"], 0)
+
+    def test_unexpected_error_releases_the_probe(self):
+        health = self.toolkit.host_health
+        url = f"{self.base}/page0.html"
+        host = health._host("127.0.0.1")
+        host.state, host.opened_at = "open", health.clock() - health.open_seconds - 1
+        with mock.patch("requests.get", side_effect=UnicodeError("bad label")):
+            self.assertIn("bad label", self.toolkit.fetch_url(url))
+        self.assertIn(self.sentences[0][0], self.toolkit.fetch_url(url))
+        self.assertEqual(self.toolkit.telemetry()["fetch"]["hosts"]["127.0.0.1"]["state"], "closed")
+
+
+if __name__ == "__main__":
+    unittest.main()
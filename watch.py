@@ -0,0 +1,277 @@
+#!/usr/bin/env uv run
+"""
+Watch conversations/ and render + publish debates as they land
+Uses inotify on Linux and falls back to cheap stat polling elsewhere; bursts
+of changes are debounced so each debate is rendered and published once
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import fnmatch
+import json
+import os
+import select
+import struct
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+DEFAULT_PATTERN = "*.json"
+# A batch that raised is retried after this long rather than dropped
+RETRY_SECONDS = 5.0
+
+
+def _matches(name: str, pattern: str) -> bool:
+    # Hidden files (render state, temp files from atomic writes) are never debates
+    return not name.startswith(".") and fnmatch.fnmatch(name, pattern)
+
+
+def existing_files(directory, pattern: str = DEFAULT_PATTERN) -> Set[str]:
+    """Every matching file currently in directory"""
+    return {str(path) for path in Path(directory).glob(pattern) if _matches(path.name, pattern)}
+
+
+class PollingWatcher:
+    """Detects new or changed files by comparing (mtime, size) snapshots"""
+
+    def __init__(self, directory, pattern: str = DEFAULT_PATTERN, interval: float = 1.0):
+        self.directory = Path(directory)
+        self.pattern = pattern
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if _matches(entry.name, self.pattern) and entry.is_file():
+                        stat = entry.stat()
+                        snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            pass
+        return snapshot
+
+    def wait(self, timeout: Optional[float]) -> Set[str]:
+        """Block for up to timeout seconds (None = until something changes) and return changed paths"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self._scan()
+            changed = {path for path, state in snapshot.items() if self._snapshot.get(path) != state}
+            self._snapshot = snapshot
+            if changed:
+                return changed
+            remaining = self.interval if deadline is None else min(self.interval, deadline - time.monotonic())
+            if remaining <= 0:
+                return set()
+            time.sleep(remaining)
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify watcher; blocks in select() so an idle watch costs no CPU"""
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_Q_OVERFLOW = 0x00004000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self, directory, pattern: str = DEFAULT_PATTERN):
+        libc_name = ctypes.util.find_library("c")
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+
+        self.directory = Path(directory)
+        self.pattern = pattern
+        self._libc = libc
+        self._fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        # Close-after-write and rename-into-place mark a finished file; plain
+        # modify events would fire mid-write
+        mask = self.IN_CLOSE_WRITE | self.IN_MOVED_TO
+        if libc.inotify_add_watch(self._fd, os.fsencode(self.directory), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, f"inotify_add_watch failed for {self.directory}")
+
+    def wait(self, timeout: Optional[float]) -> Set[str]:
+        """Block for up to timeout seconds (None = until something changes) and return changed paths"""
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        changed = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            changed |= self._parse(data)
+        return changed
+
+    def _parse(self, data: bytes) -> Set[str]:
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            _, mask, _, length = self._EVENT.unpack_from(data, offset)
+            offset += self._EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0").decode("utf-8", "replace")
+            offset += length
+            if mask & self.IN_Q_OVERFLOW:
+                # The kernel queue filled up and events were lost; treat every file as changed
+                changed |= existing_files(self.directory, self.pattern)
+            elif _matches(name, self.pattern):
+                changed.add(str(self.directory / name))
+        return changed
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def create_watcher(directory, pattern: str = DEFAULT_PATTERN, interval: float = 1.0, polling: bool = False):
+    """Return an inotify watcher where available, otherwise a polling one"""
+    if not polling:
+        try:
+            return InotifyWatcher(directory, pattern)
+        except (OSError, AttributeError, TypeError):
+            pass
+    return PollingWatcher(directory, pattern, interval)
+
+
+class Debouncer:
+    """Collects changed paths and releases each once it has been quiet for `quiet` seconds"""
+
+    def __init__(self, quiet: float = 0.5):
+        self.quiet = quiet
+        self._last_seen: Dict[str, float] = {}
+
+    def add(self, paths: Iterable[str], now: float) -> None:
+        for path in paths:
+            self._last_seen[path] = now
+
+    def next_timeout(self, now: float) -> Optional[float]:
+        """Seconds until the oldest pending path settles, or None if nothing is pending"""
+        if not self._last_seen:
+            return None
+        return max(0.0, min(self._last_seen.values()) + self.quiet - now)
+
+    def pop_ready(self, now: float) -> List[str]:
+        ready = sorted(path for path, seen in self._last_seen.items() if now - seen >= self.quiet)
+        for path in ready:
+            del self._last_seen[path]
+        return ready
+
+
+def is_complete_debate(json_file: str) -> bool:
+    """True if json_file parses and looks like a finished debate"""
+    from json_to_html import REQUIRED_KEYS
+
+    try:
+        with open(json_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+        return False
+    return isinstance(data, dict) and all(key in data for key in REQUIRED_KEYS)
+
+
+def process_changes(json_files: List[str], output_dir, published_dir, lazy=None, minify: bool = False) -> Dict:
+    """Render and publish the given debate files; returns a summary of what happened"""
+    from json_to_html import render_many
+    from publish import publish_many
+
+    start = time.perf_counter()
+    ready = [path for path in json_files if is_complete_debate(path)]
+    incomplete = len(json_files) - len(ready)
+    if not ready:
+        return {"rendered": 0, "published": 0, "incomplete": incomplete, "elapsed": time.perf_counter() - start}
+
+    render_summary = render_many(ready, str(output_dir), jobs=1, lazy=lazy)
+    failed = {json_file for json_file, _ in render_summary["failures"]}
+    html_files = [
+        Path(output_dir) / f"{Path(json_file).stem}.html"
+        for json_file in ready if json_file not in failed
+    ]
+    publish_summary = publish_many(html_files, published_dir, minify=minify, verbose=False)
+    return {
+        "rendered": render_summary["rendered"],
+        "published": publish_summary["published"],
+        "incomplete": incomplete,
+        "elapsed": time.perf_counter() - start,
+    }
+
+
+def watch(directory, published_dir, quiet: float = 0.5, interval: float = 1.0, polling: bool = False,
+          lazy=None, minify: bool = False, catch_up: bool = True) -> None:
+    """Render and publish debates in directory until interrupted"""
+    directory = Path(directory)
+    directory.mkdir(exist_ok=True)
+    watcher = create_watcher(directory, interval=interval, polling=polling)
+    mode = "inotify" if isinstance(watcher, InotifyWatcher) else f"polling every {interval}s"
+    print(f"👀 Watching {directory}/ for debates ({mode}); publishing to {published_dir}/")
+
+    debouncer = Debouncer(quiet)
+    if catch_up:
+        # Rendering and publishing are incremental, so this only touches what changed while we were away
+        debouncer.add(existing_files(directory), time.monotonic() - quiet)
+
+    try:
+        while True:
+            changed = watcher.wait(debouncer.next_timeout(time.monotonic()))
+            debouncer.add(changed, time.monotonic())
+            ready = debouncer.pop_ready(time.monotonic())
+            if not ready:
+                continue
+            try:
+                summary = process_changes(ready, directory, published_dir, lazy=lazy, minify=minify)
+            except Exception as e:
+                # One bad batch (a failed write, a file deleted mid-render) must not end the watcher
+                print(f"❌ Failed to process {len(ready)} file(s): {e}; retrying in {RETRY_SECONDS:.0f}s")
+                debouncer.add(ready, time.monotonic() + RETRY_SECONDS - quiet)
+                continue
+            if summary["rendered"] or summary["published"]:
+                print(f"🚀 Rendered {summary['rendered']}, published {summary['published']} debate(s) "
+                      f"in {summary['elapsed']:.2f}s")
+            if summary["incomplete"]:
+                print(f"⏳ Skipped {summary['incomplete']} incomplete file(s); will retry when they change")
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+    finally:
+        watcher.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    from json_to_html import DEFAULT_CHUNK_TURNS, DEFAULT_INLINE_TURNS
+
+    parser = argparse.ArgumentParser(description="Render and publish debates as they appear in conversations/")
+    parser.add_argument("--directory", default="conversations", help="Directory to watch (default: conversations)")
+    parser.add_argument("--published-dir", default="published", help="Gallery directory (default: published)")
+    parser.add_argument("--quiet", type=float, default=0.5, help="Seconds a file must be unchanged before it is processed (default: 0.5)")
+    parser.add_argument("--interval", type=float, default=1.0, help="Polling interval when inotify is unavailable (default: 1.0)")
+    parser.add_argument("--poll", action="store_true", help="Use polling even where inotify is available")
+    parser.add_argument("--no-catch-up", action="store_true", help="Ignore debates that already exist at startup")
+    parser.add_argument("--lazy", action="store_true", help="Render pages in lazy mode (see json_to_html.py --lazy)")
+    parser.add_argument("--minify", action="store_true", help="Minify the published HTML")
+    args = parser.parse_args(argv)
+
+    watch(
+        args.directory,
+        args.published_dir,
+        quiet=args.quiet,
+        interval=args.interval,
+        polling=args.poll,
+        lazy=(DEFAULT_INLINE_TURNS, DEFAULT_CHUNK_TURNS) if args.lazy else None,
+        minify=args.minify,
+        catch_up=not args.no_catch_up,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())